@@ -10,11 +10,33 @@ import sys
 import json
 import base64
 import gzip
+import zlib
 import argparse
 from pathlib import Path
 import xml.etree.ElementTree as ET
 from typing import Dict, Any, Optional, Union
 
+def sniff_image_format(data: bytes) -> Optional[str]:
+    """依檔頭判斷圖片格式，回傳副檔名（.png / .jpg），其他格式回傳 None"""
+    if data[:8] == b'\x89PNG\r\n\x1a\n':
+        return '.png'
+    if data[:3] == b'\xff\xd8\xff':
+        return '.jpg'
+    return None
+
+
+def unwrap_embedded_texture(data: bytes) -> bytes:
+    """解開 textureImageData 外層的 gzip / zlib 壓縮（cocos2d-x 兩種都支援），未壓縮則原樣回傳"""
+    if data[:2] == b'\x1f\x8b':
+        return gzip.decompress(data)
+    if len(data) >= 2 and data[0] & 0x0F == 8 and int.from_bytes(data[:2], 'big') % 31 == 0:
+        try:
+            return zlib.decompress(data)
+        except zlib.error:
+            pass  # 只是剛好像 zlib 檔頭的未壓縮圖片
+    return data
+
+
 class PlistProcessor:
     """Plist 檔案處理器"""
     
@@ -118,11 +140,20 @@ class PlistProcessor:
             decoded_data = base64.b64decode(self.texture_data)
             print(f"✓ Base64 解碼完成，解碼後大小: {len(decoded_data)} bytes")
             
-            # 檢查是否為 gzip 壓縮數據（通常以 H4sI 開頭的 base64）
-            if decoded_data.startswith(b'\x1f\x8b'):
-                print("🔄 檢測到 gzip 壓縮，正在解壓縮...")
-                decoded_data = gzip.decompress(decoded_data)
-                print(f"✓ Gzip 解壓縮完成，解壓後大小: {len(decoded_data)} bytes")
+            # 解開 gzip / zlib 壓縮（gzip 通常以 H4sI 開頭的 base64）
+            unwrapped_data = unwrap_embedded_texture(decoded_data)
+            if unwrapped_data is not decoded_data:
+                print(f"✓ 解壓縮完成，解壓後大小: {len(unwrapped_data)} bytes")
+                decoded_data = unwrapped_data
+            
+            # 依檔頭決定副檔名（例如 .png 檔名但內容是 JPEG），plist 的 textureFileName 一併更新
+            image_format = sniff_image_format(decoded_data)
+            if image_format:
+                texture_filename = str(Path(self.texture_filename).with_suffix(image_format))
+                if texture_filename != self.texture_filename:
+                    print(f"🔄 紋理內容為 {image_format}，檔名改為: {texture_filename}")
+                    self.texture_filename = texture_filename
+                    self.plist_data['textureFileName'] = texture_filename
             
             # 輸出檔案路徑
             output_path = os.path.join(output_dir, self.texture_filename)
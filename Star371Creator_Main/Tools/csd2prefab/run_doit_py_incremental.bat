@@ -0,0 +1,23 @@
+@echo off
+chcp 65001 >nul
+echo ========================================
+echo "CSD => PREFAB 轉換器（增量模式）"
+echo ========================================
+echo.
+
+echo 保留 output 資料夾，只重新輸出有變動的檔案...
+if not exist ".\output" (
+    echo ℹ️  output 資料夾不存在，將進行完整轉換
+    mkdir ".\output"
+)
+
+echo 正在執行 CSD 到 PREFAB 的轉換...
+echo.
+
+cd tools
+python doit.py --incremental
+
+echo.
+echo 轉換完成！請查看 output 資料夾中的結果。
+echo.
+pause 
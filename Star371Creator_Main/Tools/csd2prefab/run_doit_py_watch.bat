@@ -0,0 +1,19 @@
+@echo off
+chcp 65001 >nul
+echo ========================================
+echo "CSD => PREFAB 轉換器（監看模式）"
+echo ========================================
+echo.
+
+if not exist ".\output" (
+    mkdir ".\output"
+)
+
+echo 持續監看 input 資料夾，存檔後自動轉換有變動的檔案（Ctrl+C 結束）...
+echo.
+
+cd tools
+python doit.py --watch
+
+echo.
+pause 
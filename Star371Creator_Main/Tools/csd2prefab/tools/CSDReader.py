@@ -664,18 +664,7 @@ class CSDReader:
         if content is None:
             return {"success": False, "error": "Failed to read CSD file"}
 
-        # 清理節點名稱中的特殊符號 (防止引擎 crash)
-        print("清理節點名稱中的特殊符號...")
-        content = self.sanitize_csd_content(content)
-
-        # 如果需要分析動畫
-        if analysis_file:
-            analysis_result = self.analyze_animation(content, input_path)
-            self.write_analysis_file(analysis_result, analysis_file)
-
-        # 如果啟用增強模式，先處理增強邏輯
-        if enhanced_mode and content:
-            content = self.enhance_animation(content, input_path)
+        content = self.process_content(content, input_path, analysis_file, enhanced_mode)
 
         # 如果只需要輸出原始內容（用於驗證，且沒有分析任務）
         if output_path is None and not analysis_file:
@@ -696,6 +685,34 @@ class CSDReader:
         # 返回處理成功狀態
         return {"success": True, "output_path": output_path}
 
+    def process_content(self, content, input_path, analysis_file=None, enhanced_mode=False):
+        """
+        在記憶體中處理 CSD 內容（清理節點名稱、分析、增強），不寫入檔案
+
+        Args:
+            content (str): 原始 CSD 內容
+            input_path (str): 檔案路徑（用於輸出訊息）
+            analysis_file (str, optional): 分析結果輸出檔案路徑
+            enhanced_mode (bool): 是否啟用增強模式
+
+        Returns:
+            str: 處理後的內容
+        """
+        # 清理節點名稱中的特殊符號 (防止引擎 crash)
+        print("清理節點名稱中的特殊符號...")
+        content = self.sanitize_csd_content(content)
+
+        # 如果需要分析動畫
+        if analysis_file:
+            analysis_result = self.analyze_animation(content, input_path)
+            self.write_analysis_file(analysis_result, analysis_file)
+
+        # 如果啟用增強模式，先處理增強邏輯
+        if enhanced_mode and content:
+            content = self.enhance_animation(content, input_path)
+
+        return content
+
     def sanitize_node_name(self, name):
         """
         清理節點名稱，移除會導致引擎 crash 的特殊符號
@@ -11,12 +11,28 @@ import math
 import traceback
 import base64
 import gzip
+import zlib
 import plistlib
+import hashlib
+import itertools
+import multiprocessing
+import time
+import fnmatch
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from copy import deepcopy
 from PIL import Image
 import io
+
+try:
+    import numpy
+except ImportError:  # 選用：沒有 numpy 時 trim/alpha 分析改用 PIL
+    numpy = None
 from CSDReader import CSDReader
+from resource_store import ResourceStore, is_resource_store
+from resource_scanner import DirectoryScanCache, scan_files
 
 INPUT_FOLDER = "../input"
 OUTPUT_FOLDER = "../output"
@@ -25,6 +41,46 @@ OUTPUT_RESOURCES_JSON = "output_resources.json"
 INPUT_RESOURCES_JSON = "input_resources.json"
 USE_INPUT_RESOURCES_JSON = True
 DO_OUTPUT_RESOURCES_JSON = True
+BATCH_JOBS = 1  # CSD 轉換使用的 process 數量（1 = 單一 process 依序轉換）
+BUILD_MANIFEST_JSON = "build_manifest.json"  # 增量建置紀錄（存放在 output 資料夾）
+BUILD_INCREMENTAL = False  # True = 沿用 build manifest，只重新輸出有變動的檔案
+WATCH_INTERVAL = 1.0  # --watch 模式檢查 input 變動的間隔（秒）
+EXPORT_REACHABLE = False  # True = 只輸出 prefab/動畫實際引用到的資源（加上保留清單），取代 OUTPUT_ANYWAY
+EXPORT_KEEP_LIST = "export_keep_list.txt"  # 一律輸出的資源（相對 input 的 fnmatch pattern，一行一個）
+IMPORT_TEXTURE_ATLAS = False  # True = 合圖 plist 匯入為 SpriteAtlas（每個 frame 一個子 meta），CSD 的 Plist 引用改指向 frame UUID；Creator 匯入驗證前預設關閉
+DEDUP_IMAGES = False  # True = 內容相同的圖片只輸出一份，引用統一改用 canonical 圖片的 UUID（DuplicateList.txt）
+AUTO_ATLAS = False  # True = 依 prefab 共用的 sprite 在 Common/Img 資料夾放置自動合圖 (.pac)（AutoAtlasReport.txt）
+AUTO_ATLAS_NAME = "AutoAtlas.pac"
+AUTO_ATLAS_MAX_SIZE = 2048  # 自動合圖的最大寬高（超過的 sprite 不合圖）
+AUTO_ATLAS_PADDING = 2
+AUTO_ATLAS_MIN_SHARED = 2  # 同一個 prefab 至少用到資料夾內幾張 sprite 才放 .pac
+OPTIMIZE_PNG = "off"  # Common/Img 的 PNG 最佳化：off / lossless（無損重新壓縮）/ quantize（另外對沒有半透明 alpha 的圖嘗試調色盤量化，有損）
+QUANTIZE_COLORS = 256  # quantize 模式的調色盤顏色數
+PNG_OPTIMIZE_CACHE_DIR = "png_optimize_cache"  # PNG 最佳化結果快取，以原始內容 md5 + 模式為 key（ImageBudgetReport.txt 記錄前後大小）
+COPY_STRATEGY = "copy"  # 資源輸出方式：copy / hardlink / reflink（不支援時退回 copy）
+COPY_JOBS = 8  # 複製資源使用的 thread 數量
+STREAM_BATCH_OUTPUT = True  # True = 每個 prefab 轉換完立即輸出 .anim 並釋放 generator，批次記憶體不隨 CSD 數量成長
+RESOURCE_STORE = False  # True = 資源快取存成 SQLite（input/output_resources.db，只寫入變動條目）；.db 不存在時讀取 .json。merge_resources.py 預設讀寫 .json，改用 .db 時請傳入 .db 路徑
+SCAN_CACHE_JSON = "scan_cache.json"  # 目錄掃描快取：目錄 mtime 未變時沿用上次的檔案清單
+USE_SCAN_CACHE = True
+PLIST_CACHE_JSON = "plist_cache.json"  # plist 解析快取（合圖/粒子分類、貼圖檔名、粒子屬性），依路徑/大小/mtime 判斷是否有效
+IMAGE_ANALYSIS_CACHE_JSON = "image_analysis_cache.json"  # 圖片分析快取（尺寸、trim、alpha），以內容 md5 為 key
+TRIM_THRESHOLD = 1  # 自動 trim 的 alpha 門檻（alpha >= 門檻的像素保留），同時寫入圖片 .meta 的 trimThreshold
+
+
+
+def get_resource_cache_path(json_path, for_save=False):
+    """
+    Pick the resource cache file for json_path.
+
+    With RESOURCE_STORE the SQLite store next to it (same name, .db) is used for saving,
+    and for loading whenever it exists; otherwise the JSON file is used.
+    """
+    if RESOURCE_STORE:
+        store_path = Path(json_path).with_suffix(".db")
+        if for_save or store_path.exists():
+            return str(store_path)
+    return json_path
 
 
 class UUIDManager:
@@ -32,6 +88,7 @@ class UUIDManager:
 
     def __init__(self):
         self.used_uuids = set()  # 所有已使用的UUID
+        self.derived_uuids = {}  # key -> 由 key 推導出的UUID（依產生順序）
         self.max_retry_attempts = 100  # 最大重試次數
 
     def register_existing_uuid(self, uuid_str):
@@ -42,6 +99,12 @@ class UUIDManager:
             self.used_uuids.add(base_uuid)
             self.used_uuids.add(uuid_str)  # 也加入完整的UUID
 
+    def register_existing_uuids(self, uuid_strs):
+        """一次註冊多個已存在的UUID（載入整個資源快取時使用）"""
+        uuid_strs = [uuid_str for uuid_str in uuid_strs if uuid_str]
+        self.used_uuids.update(uuid_strs)
+        self.used_uuids.update(uuid_str.split("@")[0] for uuid_str in uuid_strs)
+
     def generate_unique_uuid(self, uuid_type="base"):
         """產生唯一的UUID，確保不與已存在的重複"""
         import uuid
@@ -69,6 +132,42 @@ class UUIDManager:
             f"Unable to generate unique UUID after {self.max_retry_attempts} attempts"
         )
 
+    def generate_deterministic_uuid(self, key, uuid_type="base"):
+        """依據 key 產生固定的UUID，同一個 key 不論在哪個 process 或第幾次執行都得到相同結果"""
+        if key in self.derived_uuids:
+            return self.derived_uuids[key]
+
+        for attempt in range(self.max_retry_attempts):
+            seed = key if attempt == 0 else f"{key}#{attempt}"
+            key_hash = hashlib.md5(seed.encode("utf-8")).hexdigest()
+            new_uuid = f"{key_hash[:8]}-{key_hash[8:12]}-{key_hash[12:16]}-{key_hash[16:20]}-{key_hash[20:32]}"
+
+            # 根據類型添加後綴
+            if uuid_type == "sprite_frame":
+                full_uuid = f"{new_uuid}@f9941"
+            else:
+                full_uuid = new_uuid
+
+            # 檢查是否重複
+            if new_uuid not in self.used_uuids and full_uuid not in self.used_uuids:
+                self.used_uuids.add(new_uuid)
+                self.used_uuids.add(full_uuid)
+                self.derived_uuids[key] = full_uuid
+                return full_uuid
+
+            print(
+                f"WARNING  UUID collision detected for key '{key}' (attempt {attempt + 1}), rehashing..."
+            )
+
+        raise RuntimeError(
+            f"Unable to derive unique UUID for '{key}' after {self.max_retry_attempts} attempts"
+        )
+
+    def register_derived_uuid(self, key, uuid_str):
+        """註冊其他 process 推導出的UUID，讓之後相同 key 的查詢得到同一個結果"""
+        self.register_existing_uuid(uuid_str)
+        self.derived_uuids.setdefault(key, uuid_str)
+
     def is_uuid_used(self, uuid_str):
         """檢查UUID是否已被使用"""
         if not uuid_str:
@@ -84,6 +183,371 @@ class UUIDManager:
         }
 
 
+class PlistInfoCache:
+    """
+    Persistent plist metadata keyed by path and checked against (size, mtime).
+
+    ImageResourceManager.get_plist_info() fills it, so a plist is parsed once per
+    content version and not at all on later runs while it stays unchanged.
+    """
+
+    VERSION = 2  # 2: texture atlas frames
+
+    def __init__(self, cache_path=PLIST_CACHE_JSON):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.entries = {}  # absolute path -> {"signature": [size, mtime_ns], ...}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.entries = data.get("entries", {})
+        except Exception as e:
+            print(f"WARNING Failed to load plist cache {self.cache_path}: {str(e)}")
+
+    def save(self):
+        if self.cache_path is None or not self.dirty:
+            return
+        try:
+            with open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "entries": self.entries}, f, ensure_ascii=False)
+            self.dirty = False
+        except Exception as e:
+            print(f"WARNING Failed to save plist cache {self.cache_path}: {str(e)}")
+
+    def lookup(self, plist_path, signature):
+        entry = self.entries.get(os.path.abspath(plist_path))
+        if entry is None or entry["signature"] != signature:
+            return None
+        return entry
+
+    def store(self, plist_path, signature, info):
+        info["signature"] = signature
+        self.entries[os.path.abspath(plist_path)] = info
+        self.dirty = True
+
+
+class ImageAnalysisCache:
+    """
+    Persistent image analysis results (size, trim, alpha) keyed by content md5.
+
+    The md5 of each path is remembered with its (size, mtime) like
+    BuildManifest.hash_file(), so an unchanged image costs one stat.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_path=IMAGE_ANALYSIS_CACHE_JSON):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.file_hashes = {}  # absolute path -> [size, mtime_ns, md5]
+        self.images = {}  # md5 -> analysis
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.file_hashes = data.get("files", {})
+                self.images = data.get("images", {})
+        except Exception as e:
+            print(f"WARNING Failed to load image analysis cache {self.cache_path}: {str(e)}")
+
+    def save(self):
+        if self.cache_path is None or not self.dirty:
+            return
+        try:
+            with open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": self.VERSION, "files": self.file_hashes, "images": self.images},
+                    f,
+                    ensure_ascii=False,
+                )
+            self.dirty = False
+        except Exception as e:
+            print(f"WARNING Failed to save image analysis cache {self.cache_path}: {str(e)}")
+
+    def get_digest(self, image_path):
+        """Content md5 of image_path, or None if it cannot be read."""
+        path_key = os.path.abspath(image_path)
+        try:
+            stat = os.stat(path_key)
+        except OSError:
+            return None
+
+        cached = self.file_hashes.get(path_key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        try:
+            with open(path_key, "rb") as f:
+                digest = hashlib.md5(f.read()).hexdigest()
+        except OSError:
+            return None
+        self.file_hashes[path_key] = [stat.st_size, stat.st_mtime_ns, digest]
+        self.dirty = True
+        return digest
+
+    def lookup(self, digest):
+        """Cached analysis for digest, if it was made with the current TRIM_THRESHOLD."""
+        analysis = self.images.get(digest) if digest else None
+        if analysis is None or analysis.get("trimThreshold") != TRIM_THRESHOLD:
+            return None
+        return analysis
+
+    def store(self, digest, analysis):
+        if digest:
+            self.images[digest] = analysis
+            self.dirty = True
+
+
+def probe_image_size(image_path):
+    """
+    Read (width, height) from the PNG / JPEG / BMP / TGA header without decoding pixels.
+
+    Returns the same size PIL reports, or None if the header is not recognized.
+    """
+    try:
+        with open(image_path, "rb") as f:
+            header = f.read(26)
+            if header[:8] == b"\x89PNG\r\n\x1a\n":
+                if header[12:16] != b"IHDR":
+                    return None
+                return int.from_bytes(header[16:20], "big"), int.from_bytes(header[20:24], "big")
+
+            if header[:2] == b"BM":
+                if int.from_bytes(header[14:18], "little") == 12:  # BITMAPCOREHEADER
+                    return int.from_bytes(header[18:20], "little"), int.from_bytes(header[20:22], "little")
+                width = int.from_bytes(header[18:22], "little", signed=True)
+                height = int.from_bytes(header[22:26], "little", signed=True)
+                return width, abs(height)
+
+            if header[:2] == b"\xff\xd8":
+                # 依序跳過 JPEG segment，直到 SOF（C4/C8/CC 不是 SOF）
+                f.seek(2)
+                while True:
+                    byte = f.read(1)
+                    if not byte:
+                        return None
+                    if byte != b"\xff":
+                        continue
+                    marker = f.read(1)
+                    while marker == b"\xff":
+                        marker = f.read(1)
+                    if not marker:
+                        return None
+                    marker = marker[0]
+                    if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+                        continue  # Standalone marker without a length
+                    length_bytes = f.read(2)
+                    if len(length_bytes) < 2:
+                        return None
+                    length = int.from_bytes(length_bytes, "big")
+                    if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                        sof = f.read(5)
+                        if len(sof) < 5:
+                            return None
+                        return int.from_bytes(sof[3:5], "big"), int.from_bytes(sof[1:3], "big")
+                    f.seek(length - 2, os.SEEK_CUR)
+
+            if str(image_path).lower().endswith(".tga") and len(header) >= 16:
+                return int.from_bytes(header[12:14], "little"), int.from_bytes(header[14:16], "little")
+    except OSError:
+        return None
+    return None
+
+
+def sniff_image_format(data):
+    """
+    Extension of an encoded image that Cocos Creator imports as is, from its header bytes.
+
+    Returns ".png" / ".jpg", or None for anything else (TIFF, PVR, ...), which has to be decoded
+    and converted.
+    """
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return ".png"
+    if data[:3] == b"\xff\xd8\xff":
+        return ".jpg"
+    return None
+
+
+def unwrap_embedded_texture(data):
+    """
+    Undo the optional compression around a particle's textureImageData.
+
+    cocos2d-x inflates gzip and zlib streams alike; anything else is already the image file.
+    """
+    if data[:2] == b"\x1f\x8b":
+        return gzip.decompress(data)
+    if len(data) >= 2 and data[0] & 0x0F == 8 and int.from_bytes(data[:2], "big") % 31 == 0:
+        try:
+            return zlib.decompress(data)
+        except zlib.error:
+            pass  # A raw image whose first bytes happen to look like a zlib header
+    return data
+
+
+def analyze_alpha_plane(alpha, threshold=TRIM_THRESHOLD):
+    """
+    Scan an alpha plane ("L" image) once for the auto-trim bbox and the minimum alpha.
+
+    Pixels with alpha >= threshold are kept, like Cocos Creator's auto trim.
+    Uses NumPy when available, otherwise PIL.
+
+    Returns:
+        tuple: (bbox as (left, upper, right, lower) or None if nothing is kept, min_alpha)
+    """
+    if numpy is not None:
+        plane = numpy.asarray(alpha)
+        if plane.size == 0:
+            return None, 255
+        min_alpha = int(plane.min())
+        if min_alpha >= threshold:
+            return (0, 0, alpha.width, alpha.height), min_alpha
+        kept = plane >= threshold
+        rows = numpy.flatnonzero(kept.any(axis=1))
+        if rows.size == 0:
+            return None, min_alpha
+        cols = numpy.flatnonzero(kept[rows[0] : rows[-1] + 1].any(axis=0))
+        return (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1), min_alpha
+
+    min_alpha = alpha.getextrema()[0]
+    if threshold > 1:
+        alpha = alpha.point([0] * threshold + [255] * (256 - threshold))
+    return alpha.getbbox(), min_alpha
+
+
+def map_in_spawn_pool(func, args_list, jobs, label):
+    """
+    Yield func(*args) for every args in args_list, in order, computed on a spawn process pool.
+
+    A task whose worker raised is retried in-process. If the pool breaks (a worker died
+    or could not start), the remaining tasks run in-process too.
+
+    Args:
+        func: Module-level function, so spawned workers can import it.
+        args_list (list): Argument tuples; args[0] names the task in warnings.
+        jobs (int): Maximum number of worker processes.
+        label (str): What the tasks do, for warnings.
+    """
+    done = 0
+    try:
+        # spawn: the copy/meta thread pools are running, so the batch process must not be forked
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(args_list)), mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = [executor.submit(func, *args) for args in args_list]
+            for args, future in zip(args_list, futures):
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    print(f"WARNING {label} failed in worker for {args[0]}, retrying in-process: {str(e)}")
+                    result = func(*args)
+                done += 1
+                yield result
+    except BrokenProcessPool as e:
+        print(
+            f"WARNING {label} process pool broke, finishing {len(args_list) - done} tasks in-process: {str(e)}"
+        )
+        for args in args_list[done:]:
+            yield func(*args)
+
+
+def compute_image_analysis(image_path):
+    """
+    Decode an image and return its trim information plus "hasAlpha" (None if it cannot be decoded).
+
+    Module-level so precompute_image_analysis() can run it on a process pool.
+    """
+    try:
+        with Image.open(image_path) as img:
+            # 只有帶 alpha 的模式需要檢查是否真的有透明像素
+            alpha_mode = img.mode in ("RGBA", "LA") or "transparency" in img.info
+
+            # Get image dimensions
+            width, height = img.size
+
+            # 只取 alpha plane，一次掃描同時得到 trim 範圍與最小 alpha
+            if img.mode in ("RGBA", "LA"):
+                alpha = img.getchannel("A")
+            elif alpha_mode or "A" in img.getbands() or "a" in img.getbands():
+                alpha = img.convert("RGBA").getchannel("A")
+            else:
+                alpha = None
+
+            if alpha is not None:
+                bbox, min_alpha = analyze_alpha_plane(alpha)
+            else:
+                # 不透明圖片：整張保留，不需要解碼像素
+                bbox, min_alpha = (0, 0, width, height), 255
+
+            # Check if any pixel is actually transparent
+            has_alpha = alpha_mode and min_alpha < 255
+    except Exception:
+        return None
+
+    if bbox:
+        # bbox is (left, upper, right, lower)
+        left, upper, right, lower = bbox
+        trim_x = left
+        trim_y = upper
+        trim_width = right - left
+        trim_height = lower - upper
+
+        # Calculate offset from center
+        original_center_x = width / 2
+        original_center_y = height / 2
+        trim_center_x = (left + right) / 2
+        trim_center_y = (upper + lower) / 2
+
+        offset_x = trim_center_x - original_center_x
+        offset_y = (height - trim_center_y) - (
+            height - original_center_y
+        )  # Flip Y for Cocos
+    else:
+        # If no non-transparent pixels, use original size
+        trim_x = 0
+        trim_y = 0
+        trim_width = width
+        trim_height = height
+        offset_x = 0
+        offset_y = 0
+
+    analysis = {
+        "originalWidth": width,
+        "originalHeight": height,
+        "trimX": trim_x,
+        "trimY": trim_y,
+        "trimWidth": trim_width,
+        "trimHeight": trim_height,
+        "offsetX": offset_x,
+        "offsetY": offset_y,
+        "hasAlpha": has_alpha,
+        "trimThreshold": TRIM_THRESHOLD,
+    }
+    return analysis
+
+
+def get_sub_asset_id(name):
+    """
+    Sub-asset id Cocos Creator derives from a sub-asset name when importing.
+
+    Hex digits 0, 6, 16, 25 and 31 of md5(name): "texture" -> 6c48a, "spriteFrame" -> f9941,
+    and the frame ids of the sprite-atlas metas under Star371/assets follow the same rule.
+    """
+    digest = hashlib.md5(name.encode("utf-8")).hexdigest()
+    return "".join(digest[index] for index in (0, 6, 16, 25, 31))
+
+
 class ImageResourceManager:
     """
     Manages image resources and handles path mapping for sprite frames.
@@ -92,6 +556,18 @@ class ImageResourceManager:
     Now also handles particle system files (.plist).
     """
 
+    # Sets that get_state_marker()/collect_state_changes() track per conversion
+    TRACKED_SETS = [
+        "used_images",
+        "used_particles",
+        "used_fonts",
+        "used_atlases",
+        "not_found_files",
+        "referenced_files",
+    ]
+    # Shared between --watch batches instead of copied by snapshot_state()
+    SHARED_STATE = ["uuid_manager", "plist_info", "image_analysis", "path_keys", "resolved_paths"]
+
     def __init__(self, uuid_manager=None):
         self.uuid_manager = uuid_manager or UUIDManager()  # UUID管理器實例
         self.image_cache = {}  # Cache for image path -> UUID mapping
@@ -111,25 +587,51 @@ class ImageResourceManager:
         self.available_fonts = set()  # Set of available font files (.fnt)
         self.used_fonts = set()  # Track which fonts are actually used
         self.copied_fonts = {}  # Track copied fonts: source -> destination
+        # Texture atlas (SpriteAtlas plist) support
+        self.atlas_cache = {}  # Cache for atlas plist path -> SpriteAtlas UUID mapping
+        self.available_atlases = set()  # Set of available texture atlas plists
+        self.used_atlases = set()  # Track which atlases CSD frames point into
+        self.atlas_files = {}  # Normalized atlas key (path_mapping target) -> scanned atlas plist
         # CSD/Prefab support
         self.csd_cache = {}  # Cache for CSD path -> prefab UUID mapping
         self.available_csds = set()  # Set of available CSD files
         self.used_csds = set()  # Track which CSDs are actually used
         self.copied_prefabs = {}  # Track copied prefabs: source -> destination
+        self.plist_info = PlistInfoCache()  # plist path -> kind / texture / particle properties
+        self.image_analysis = ImageAnalysisCache()  # image md5 -> size / trim / alpha
+        self.duplicate_images = {}  # Normalized duplicate image key -> canonical image (--dedup-images)
         # Not found files tracking
         self.not_found_files = set()  # Track all files that couldn't be found
+        # Every resource path whose UUID/trim a prefab asked for (incremental build dependencies)
+        self.referenced_files = set()
         # Moved images tracking - images that have been moved to font/particle directories
         self.moved_images = (
             set()
         )  # Track images that have been moved to avoid duplicating in Img/
-
-    def scan_for_images(self, input_folder=INPUT_FOLDER):
-        """Scan the input folder for available image files, particle files, font files, and CSD files."""
+        # Interned path keys: every path string is canonicalized once, later lookups hit these dicts
+        self.path_keys = {}  # path string -> normalize_path_for_uuid_key() result
+        self.resolved_paths = {}  # path string -> str(Path(path).resolve())
+        # filename -> [(path_key, mapped_path)] over path_mapping, rebuilt when path_mapping grows
+        self._filename_index = {}
+        self._filename_index_source = None
+        self._filename_index_size = -1
+        self._resolved_resources = {}  # (kind, CSD path) -> (path_mapping target, missing)
+        self._atlas_frames = {}  # (CSD Path, CSD Plist) -> (atlas plist, frame name)
+        # sprite frame UUID -> image_cache key, rebuilt when image_cache is replaced or grows
+        self._image_uuid_index = {}
+        self._image_uuid_index_source = None
+        self._image_uuid_index_size = -1
+
+    def scan_for_images(self, input_folder=INPUT_FOLDER, load_cached_resources=USE_INPUT_RESOURCES_JSON):
+        """Scan the input folder for available image files, particle files, font files, and CSD files.
+
+        Set load_cached_resources=False when the caller has already loaded the resources cache.
+        """
         input_path = Path(input_folder)
 
         # 先載入現有的 resources.json 快取（如果存在）
-        if USE_INPUT_RESOURCES_JSON:
-            self.load_resources_from_json(INPUT_RESOURCES_JSON)
+        if load_cached_resources:
+            self.load_resources_from_json(get_resource_cache_path(INPUT_RESOURCES_JSON))
 
         # 然後正常執行原本的掃描流程
         print(f"DEBUG Scanning for resources in: {input_folder}")
@@ -137,48 +639,73 @@ class ImageResourceManager:
             print(f"WARNING  Input folder does not exist: {input_folder}")
             return
 
-        # Find all image files (only in input directories - whitelist mode)
+        # 單次走訪 input，依副檔名分類（取代每種副檔名各一次 rglob）
         image_extensions = {".png", ".jpg", ".jpeg", ".bmp", ".tga"}
+        scan_cache = DirectoryScanCache(SCAN_CACHE_JSON) if USE_SCAN_CACHE else None
+        found_files = scan_files(
+            str(input_path), image_extensions | {".plist", ".fnt", ".csd"}, scan_cache
+        )
+        if scan_cache is not None:
+            scan_cache.save()
+            print(
+                f"DEBUG Scan cache: {scan_cache.reused_count} directories reused, {scan_cache.listed_count} listed"
+            )
+
+        # 白名單只看路徑前綴，同一目錄下的檔案結果相同，每個目錄只檢查一次
+        input_dirs = {}
+
+        def is_input_file(file_path):
+            dir_path = os.path.dirname(file_path)
+            if dir_path not in input_dirs:
+                input_dirs[dir_path] = self._is_input_path(os.path.join(dir_path, ""))
+            return input_dirs[dir_path]
+
+        # Find all image files (only in input directories - whitelist mode)
         for ext in image_extensions:
-            for img_file in input_path.rglob(f"*{ext}"):
+            for img_file in found_files[ext]:
                 # Only include files in input directories (whitelist mode)  
-                if not self._is_input_path(str(img_file)):
+                if not is_input_file(img_file):
                     continue
-                self.available_images.add(str(img_file))
+                self.available_images.add(img_file)
 
         # Find all particle files (only in input directories, exclude texture atlas plists)
         texture_atlas_count = 0
         particle_count = 0
         output_skipped_count = 0
-        for plist_file in input_path.rglob("*.plist"):
+        for plist_file in found_files[".plist"]:
             # Only include files in input directories (whitelist mode)
-            if not self._is_input_path(str(plist_file)):
+            if not is_input_file(plist_file):
                 output_skipped_count += 1
                 continue
                 
-            if self.is_texture_atlas_plist(str(plist_file)):
+            if self.is_texture_atlas_plist(plist_file):
                 texture_atlas_count += 1
-                print(f"Skip Texture atlas plist: {plist_file.name}")
+                if IMPORT_TEXTURE_ATLAS:
+                    self.available_atlases.add(plist_file)
+                    print(f"Texture Texture atlas plist: {os.path.basename(plist_file)}")
+                else:
+                    print(f"Skip Texture atlas plist: {os.path.basename(plist_file)}")
             else:
-                self.available_particles.add(str(plist_file))
+                self.available_particles.add(plist_file)
                 particle_count += 1
-                print(f"Particle Particle plist: {plist_file.name}")
+                print(f"Particle Particle plist: {os.path.basename(plist_file)}")
         
         if output_skipped_count > 0:
             print(f"Skip Skipped {output_skipped_count} particle files outside input directories")
 
         print(
-            f"Processing Found {particle_count} particle plists, {texture_atlas_count} texture atlas plists (excluded)"
+            f"Processing Found {particle_count} particle plists, {texture_atlas_count} texture atlas plists"
+            + (" (imported as SpriteAtlas)" if IMPORT_TEXTURE_ATLAS else " (excluded)")
         )
 
         # Find all font files (.fnt, only in input directories)
         font_output_skipped = 0
-        for font_file in input_path.rglob("*.fnt"):
+        for font_file in found_files[".fnt"]:
             # Only include files in input directories (whitelist mode)
-            if not self._is_input_path(str(font_file)):
+            if not is_input_file(font_file):
                 font_output_skipped += 1
                 continue
-            self.available_fonts.add(str(font_file))
+            self.available_fonts.add(font_file)
             
         if font_output_skipped > 0:
             print(f"Skip Skipped {font_output_skipped} font files outside input directories")
@@ -186,12 +713,12 @@ class ImageResourceManager:
         # Find all CSD files (only in input directories)
         csd_count = 0
         csd_output_skipped = 0
-        for csd_file in input_path.rglob("*.csd"):
+        for csd_file in found_files[".csd"]:
             # Only include files in input directories (whitelist mode)
-            if not self._is_input_path(str(csd_file)):
+            if not is_input_file(csd_file):
                 csd_output_skipped += 1
                 continue
-            self.available_csds.add(str(csd_file))
+            self.available_csds.add(csd_file)
             csd_count += 1
             
         if csd_output_skipped > 0:
@@ -199,6 +726,8 @@ class ImageResourceManager:
 
         print(f"CSD Found {csd_count} CSD files")
 
+        self.plist_info.save()
+
         # Create simplified path mapping for partial matching
         self.create_path_mapping()
 
@@ -311,7 +840,8 @@ class ImageResourceManager:
         return filtered_mapping
 
     def create_path_mapping_part(self, path_mapping, path_list, path_type):
-        for path in path_list:
+        # Sorted iteration keeps conflict resolution (first one wins) identical on every run
+        for path in sorted(path_list):
             path_file = Path(path)
             filename = path_file.name
             parts = path_file.parts
@@ -347,7 +877,7 @@ class ImageResourceManager:
                     tobreak = True
             
             # 將所有路徑變體都映射到標準化目標
-            for variant in path_variants:
+            for variant in sorted(path_variants):
                 if variant not in path_mapping:
                     path_mapping[variant] = normalized_target
                 elif path_mapping[variant] != normalized_target:
@@ -362,418 +892,264 @@ class ImageResourceManager:
         )
         self.create_path_mapping_part(self.path_mapping, self.available_fonts, "font")
         self.create_path_mapping_part(self.path_mapping, self.available_csds, "csd")
+        self.create_path_mapping_part(self.path_mapping, self.available_atlases, "atlas")
+        # path_mapping resolves to normalized keys; find_atlas_file() maps them back to the plist
+        self.atlas_files = {}
+        for atlas_file in sorted(self.available_atlases):
+            self.atlas_files.setdefault(self.normalize_path_for_uuid_key(atlas_file), atlas_file)
+
+    # How each resource kind is resolved and reported by resolve_resource_path()
+    RESOURCE_KINDS = {
+        "image": {
+            "tag": "Found",
+            "skip_default": True,
+            "rank_filename_matches": True,
+            "default_extension": None,
+            "not_found": "ERROR Image not found: {path}",
+            "not_found_type": "Image",
+            "report_missing": True,
+        },
+        "particle": {
+            "tag": "[EMOJI]",
+            "skip_default": True,
+            "rank_filename_matches": True,
+            "default_extension": None,
+            "not_found": "ERROR Particle file not found: {path}",
+            "not_found_type": "Particle",
+            "report_missing": True,
+        },
+        "font": {
+            "tag": "Font",
+            "skip_default": True,
+            "rank_filename_matches": True,
+            "default_extension": None,
+            "not_found": "ERROR Font file not found: {path}",
+            "not_found_type": "Font",
+            "report_missing": True,
+        },
+        "csd": {
+            "tag": "CSD",
+            "skip_default": False,
+            "rank_filename_matches": False,  # Multiple matches: the first one wins
+            "default_extension": ".csd",  # CSD references may omit the extension
+            "not_found": "CSD ERROR: Could not find CSD file for: {path}",
+            "not_found_type": "CSD",
+            "report_missing": True,
+        },
+        "atlas": {
+            "tag": "Texture",
+            "skip_default": True,
+            "rank_filename_matches": True,
+            "default_extension": None,
+            # A missing atlas is not an error: the frame still resolves as a loose image
+            "not_found": "Skip Texture atlas not found, using loose image: {path}",
+            "not_found_type": "Plist",
+            "report_missing": False,
+        },
+    }
 
-    def find_image_file(self, img_path):
-        """Find the actual image file for a CSD path, ignoring plist references."""
-        if not img_path:
-            return None
+    def _sync_path_indexes(self):
+        """Rebuild the filename index and forget resolved paths when path_mapping changed."""
+        if (
+            self._filename_index_source is self.path_mapping
+            and self._filename_index_size == len(self.path_mapping)
+        ):
+            return
+        filename_index = {}
+        for path_key, mapped_path in self.path_mapping.items():
+            filename_index.setdefault(Path(path_key).name, []).append(
+                (path_key, mapped_path)
+            )
+        self._filename_index = filename_index
+        self._filename_index_source = self.path_mapping
+        self._filename_index_size = len(self.path_mapping)
+        self._resolved_resources = {}
+        self._atlas_frames = {}
 
-        # Check if path starts with "Default/" - these represent non-existent resources
-        if img_path.startswith("Default/"):
-            print(f"Skip Skipping Default resource: {img_path}")
+    def get_filename_matches(self, filename):
+        """
+        Return the (path_key, mapped_path) pairs of path_mapping whose file name is filename.
+
+        Pairs keep path_mapping order. The filename index is built once per path_mapping
+        state instead of scanning every key on each lookup.
+        """
+        self._sync_path_indexes()
+        return self._filename_index.get(filename, [])
+
+    def resolve_resource_path(self, kind, csd_path):
+        """
+        Find the path_mapping target for a CSD resource reference of the given kind.
+
+        Tries an exact match, then the longest matching path suffix, then the file name
+        (ranked by shared directory names where the kind allows it). Results, including
+        misses, are remembered until path_mapping changes, so each path is searched and
+        logged once per batch; a remembered miss is still recorded in not_found_files.
+        """
+        if not csd_path:
             return None
 
-        # Remove plist references - we only want the image path
-        clean_path = img_path.replace("\\", "/")
+        kind_info = self.RESOURCE_KINDS[kind]
+        self._sync_path_indexes()
+        cache_key = (kind, csd_path)
+
+        if cache_key not in self._resolved_resources:
+            if kind_info["skip_default"] and csd_path.startswith("Default/"):
+                # Check if path starts with "Default/" - these represent non-existent resources
+                print(f"Skip Skipping Default resource: {csd_path}")
+                self._resolved_resources[cache_key] = (None, False)
+            else:
+                found_path = self._search_resource_path(kind_info, csd_path)
+                if found_path is None:
+                    print(kind_info["not_found"].format(path=csd_path))
+                self._resolved_resources[cache_key] = (found_path, found_path is None)
+
+        found_path, missing = self._resolved_resources[cache_key]
+        if missing and kind_info["report_missing"]:
+            # Added on every lookup so each conversion's state changes still list its misses
+            self.not_found_files.add(f"{kind_info['not_found_type']}: {csd_path}")
+        return found_path
+
+    def _search_resource_path(self, kind_info, csd_path):
+        tag = kind_info["tag"]
+        clean_path = csd_path.replace("\\", "/")
+        default_extension = kind_info["default_extension"]
+        if default_extension and not clean_path.endswith(default_extension):
+            clean_path += default_extension
 
         # Try exact match first
         if clean_path in self.path_mapping:
-            found_image = self.path_mapping[clean_path]
-            print(f"Found Exact match found: {img_path} ->\n {Path(found_image)}")
-            return found_image
+            found_path = self.path_mapping[clean_path]
+            print(f"{tag} Exact match found: {csd_path} ->\n {Path(found_path)}")
+            return found_path
 
         # Try partial path matching (from longest to shortest for better specificity)
         path_parts = clean_path.split("/")
-        best_match = None
-        best_match_score = 0
-
-        for i in range(len(path_parts)):
+        for i in range(1, len(path_parts)):
             partial_path = "/".join(path_parts[i:])
             if partial_path in self.path_mapping:
-                found_image = self.path_mapping[partial_path]
-                # Calculate match score based on path length to prefer more specific matches
-                match_score = len(partial_path.split("/"))
-                if match_score > best_match_score:
-                    best_match = found_image
-                    best_match_score = match_score
+                found_path = self.path_mapping[partial_path]
+                # The longest suffix is the most specific match
                 print(
-                    f"[EMOJI] Partial path match found: {img_path} -> {partial_path} ->\n  {Path(found_image)} (score: {match_score})"
+                    f"{tag} Best partial path match: {csd_path} -> {partial_path} ->\n  {Path(found_path)} (score: {len(path_parts) - i})"
                 )
-
-        if best_match:
-            print(f"[EMOJI] Best match selected: {img_path} ->\n  {Path(best_match)}")
-            return best_match
+                return found_path
 
         # Finally, try filename-only match but look for the best match considering directory structure
-        filename = Path(clean_path).name
-        filename_matches = []
-
-        # Find all files with matching filename
-        for path_key, actual_path in self.path_mapping.items():
-            if Path(path_key).name == filename:
-                filename_matches.append((path_key, actual_path))
-
-        if filename_matches:
-            if len(filename_matches) == 1:
-                # Single match, use it
-                found_image = filename_matches[0][1]
-                print(
-                    f"Folder Single filename match found: {img_path} ->\n  {Path(found_image)}"
-                )
-                return found_image
-            else:
-                # Multiple matches - try to find the best one based on directory structure similarity
-                best_filename_match = None
-                best_filename_score = 0
-
-                for path_key, actual_path in filename_matches:
-                    # Calculate similarity score between csd_path and path_key directory structures
-                    csd_parts = set(clean_path.split("/")[:-1])  # Exclude filename
-                    key_parts = set(path_key.split("/")[:-1])
-
-                    # Score based on common directory names
-                    common_dirs = len(csd_parts.intersection(key_parts))
-                    total_dirs = len(csd_parts.union(key_parts))
-
-                    if total_dirs > 0:
-                        similarity_score = common_dirs / total_dirs
-                    else:
-                        similarity_score = 0
-
-                    if similarity_score > best_filename_score:
-                        best_filename_match = actual_path
-                        best_filename_score = similarity_score
-
-                if best_filename_match:
-                    print(
-                        f"Folder Multiple filename matches found, selected best: {img_path} ->\n  {Path(best_filename_match)} (similarity: {best_filename_score:.2f})"
-                    )
-                    return best_filename_match
-                else:
-                    # If no good similarity match, use the first one
-                    found_image = filename_matches[0][1]
-                    print(
-                        f"Folder Multiple filename matches found, using first: {img_path} ->\n  {Path(found_image)}"
-                    )
-                    return found_image
+        filename_matches = self.get_filename_matches(Path(clean_path).name)
+        if not filename_matches:
+            return None
 
-        print(f"ERROR Image not found: {img_path}")
-        self.not_found_files.add(f"Image: {img_path}")
-        return None
+        if len(filename_matches) == 1:
+            # Single match, use it
+            found_path = filename_matches[0][1]
+            print(f"Folder Single filename match found: {csd_path} ->\n  {Path(found_path)}")
+            return found_path
 
-    def find_csd_file(self, csd_path):
-        """Find the actual CSD file for a CSD path reference."""
-        if not csd_path:
-            return None
+        if kind_info["rank_filename_matches"]:
+            # Multiple matches - try to find the best one based on directory structure similarity
+            best_filename_match = None
+            best_filename_score = 0
+            csd_parts = set(clean_path.split("/")[:-1])  # Exclude filename
 
-        # Remove any .csd extension and then try with .csd
-        clean_path = csd_path.replace("\\", "/")
-        if clean_path.endswith(".csd"):
-            clean_path = clean_path[:-4]  # Remove .csd extension
-        
-        # Try with .csd extension
-        csd_path_with_ext = clean_path + ".csd"
+            for path_key, mapped_path in filename_matches:
+                key_parts = set(path_key.split("/")[:-1])
 
-        # Try exact match first
-        if csd_path_with_ext in self.path_mapping:
-            found_csd = self.path_mapping[csd_path_with_ext]
-            print(f"CSD Exact match found: {csd_path} ->\n {Path(found_csd)}")
-            return found_csd
+                # Score based on common directory names
+                common_dirs = len(csd_parts.intersection(key_parts))
+                total_dirs = len(csd_parts.union(key_parts))
+                similarity_score = common_dirs / total_dirs if total_dirs > 0 else 0
 
-        # Try partial path matching (from longest to shortest for better specificity)
-        path_parts = csd_path_with_ext.split("/")
-        best_match = None
-        best_match_score = 0
+                if similarity_score > best_filename_score:
+                    best_filename_match = mapped_path
+                    best_filename_score = similarity_score
 
-        for i in range(len(path_parts)):
-            partial_path = "/".join(path_parts[i:])
-            if partial_path in self.path_mapping:
-                found_csd = self.path_mapping[partial_path]
-                # Calculate match score based on path length to prefer more specific matches
-                match_score = len(partial_path.split("/"))
-                if match_score > best_match_score:
-                    best_match = found_csd
-                    best_match_score = match_score
+            if best_filename_match:
                 print(
-                    f"CSD Partial path match found: {csd_path} -> {partial_path} ->\n  {Path(found_csd)} (score: {match_score})"
+                    f"Folder Multiple filename matches found, selected best: {csd_path} ->\n  {Path(best_filename_match)} (similarity: {best_filename_score:.2f})"
                 )
+                return best_filename_match
 
-        if best_match:
-            print(f"CSD Best match selected: {csd_path} ->\n  {Path(best_match)}")
-            return best_match
-
-        # Finally, try filename-only match
-        filename = Path(csd_path_with_ext).name
-        filename_matches = []
+        # If no good similarity match, use the first one
+        found_path = filename_matches[0][1]
+        print(f"Folder Multiple filename matches found, using first: {csd_path} ->\n  {Path(found_path)}")
+        return found_path
 
-        # Find all files with matching filename
-        for path_key, actual_path in self.path_mapping.items():
-            if Path(path_key).name == filename:
-                filename_matches.append((path_key, actual_path))
-
-        if filename_matches:
-            if len(filename_matches) == 1:
-                # Single match, use it
-                found_csd = filename_matches[0][1]
-                print(
-                    f"CSD Single filename match found: {csd_path} ->\n  {Path(found_csd)}"
-                )
-                return found_csd
-            else:
-                # Multiple matches - use the first one found
-                found_csd = filename_matches[0][1]
-                print(
-                    f"CSD Multiple filename matches found, using first: {csd_path} ->\n  {Path(found_csd)}"
-                )
-                return found_csd
+    def find_image_file(self, img_path):
+        """Find the actual image file for a CSD path, ignoring plist references."""
+        return self.resolve_resource_path("image", img_path)
 
-        # File not found
-        print(f"CSD ERROR: Could not find CSD file for: {csd_path}")
-        self.not_found_files.add(f"CSD: {csd_path}")
-        return None
+    def find_csd_file(self, csd_path):
+        """Find the actual CSD file for a CSD path reference."""
+        return self.resolve_resource_path("csd", csd_path)
 
     def find_particle_file(self, csd_path):
         """Find the actual particle file for a CSD path."""
-        if not csd_path:
-            return None
+        return self.resolve_resource_path("particle", csd_path)
 
-        # Check if path starts with "Default/" - these represent non-existent resources
-        if csd_path.startswith("Default/"):
-            print(f"Skip Skipping Default resource: {csd_path}")
+    def find_font_file(self, csd_path):
+        """Find the actual font file for a CSD path."""
+        return self.resolve_resource_path("font", csd_path)
+
+    def find_atlas_file(self, plist_path):
+        """Find the texture atlas plist for a CSD Plist reference (None if it is not an atlas)."""
+        found_path = self.resolve_resource_path("atlas", plist_path)
+        if found_path is None:
             return None
+        # path_mapping points at normalized keys; hand back the scanned plist file
+        return self.atlas_files.get(found_path)
 
-        # Remove plist references - we want the exact plist path
-        clean_path = csd_path.replace("\\", "/")
+    def get_particle_uuid(self, particle_path):
+        """Generate or retrieve UUID for a particle system."""
+        if not particle_path:
+            return None
+        self.referenced_files.add(str(particle_path))
 
-        # Try exact match first
-        if clean_path in self.path_mapping:
-            found_particle = self.path_mapping[clean_path]
-            print(f"[EMOJI] Exact match found: {csd_path} ->\n {Path(found_particle)}")
-            return found_particle
+        # Use normalized path as cache key to ensure consistency
+        normalized_path = self.normalize_path_for_uuid_key(particle_path)
+        
+        if normalized_path in self.particle_cache:
+            return self.particle_cache[normalized_path]
 
-        # Try partial path matching (from longest to shortest for better specificity)
-        path_parts = clean_path.split("/")
-        best_match = None
-        best_match_score = 0
+        # Derive a stable UUID from the normalized path so every run (and worker) agrees
+        particle_uuid = self.uuid_manager.generate_deterministic_uuid(
+            f"particle#{normalized_path}", "base"
+        )
+        self.particle_cache[normalized_path] = particle_uuid
+        return particle_uuid
 
-        for i in range(len(path_parts)):
-            partial_path = "/".join(path_parts[i:])
-            if partial_path in self.path_mapping:
-                found_particle = self.path_mapping[partial_path]
-                # Calculate match score based on path length to prefer more specific matches
-                match_score = len(partial_path.split("/"))
-                if match_score > best_match_score:
-                    best_match = found_particle
-                    best_match_score = match_score
-                print(
-                    f"[EMOJI] Partial path match found: {csd_path} -> {partial_path} ->\n  {Path(found_particle)} (score: {match_score})"
-                )
+    def create_particle_reference(self, csd_path):
+        """Create a particle reference from CSD path."""
+        actual_particle = self.find_particle_file(csd_path)
+        if not actual_particle:
+            print(f"WARNING  Cannot create particle reference for: {csd_path}")
+            return None
 
-        if best_match:
-            print(f"[EMOJI] Best match selected: {csd_path} ->\n  {Path(best_match)}")
-            return best_match
+        # Track that this particle is used
+        self.used_particles.add(actual_particle)
+        print(f"Success Particle marked as used: {Path(actual_particle).name}")
 
-        # Finally, try filename-only match but look for the best match considering directory structure
-        filename = Path(clean_path).name
-        filename_matches = []
-
-        # Find all files with matching filename
-        for path_key, actual_path in self.path_mapping.items():
-            if Path(path_key).name == filename:
-                filename_matches.append((path_key, actual_path))
-
-        if filename_matches:
-            if len(filename_matches) == 1:
-                # Single match, use it
-                found_particle = filename_matches[0][1]
-                print(
-                    f"Folder Single filename match found: {csd_path} ->\n  {Path(found_particle)}"
-                )
-                return found_particle
-            else:
-                # Multiple matches - try to find the best one based on directory structure similarity
-                best_filename_match = None
-                best_filename_score = 0
+        particle_uuid = self.get_particle_uuid(actual_particle)
+        if not particle_uuid:
+            return None
 
-                for path_key, actual_path in filename_matches:
-                    # Calculate similarity score between csd_path and path_key directory structures
-                    csd_parts = set(clean_path.split("/")[:-1])  # Exclude filename
-                    key_parts = set(path_key.split("/")[:-1])
+        return {"__uuid__": particle_uuid, "__expectedType__": "cc.ParticleAsset"}
 
-                    # Score based on common directory names
-                    common_dirs = len(csd_parts.intersection(key_parts))
-                    total_dirs = len(csd_parts.union(key_parts))
+    def get_font_uuid(self, font_path):
+        """Generate or retrieve UUID for a font file."""
+        if not font_path:
+            return None
+        self.referenced_files.add(str(font_path))
 
-                    if total_dirs > 0:
-                        similarity_score = common_dirs / total_dirs
-                    else:
-                        similarity_score = 0
+        # Use normalized path as cache key to ensure consistency
+        normalized_path = self.normalize_path_for_uuid_key(font_path)
+        
+        if normalized_path in self.font_cache:
+            return self.font_cache[normalized_path]
 
-                    if similarity_score > best_filename_score:
-                        best_filename_match = actual_path
-                        best_filename_score = similarity_score
-
-                if best_filename_match:
-                    print(
-                        f"Folder Multiple filename matches found, selected best: {csd_path} ->\n  {Path(best_filename_match)} (similarity: {best_filename_score:.2f})"
-                    )
-                    return best_filename_match
-                else:
-                    # If no good similarity match, use the first one
-                    found_particle = filename_matches[0][1]
-                    print(
-                        f"Folder Multiple filename matches found, using first: {csd_path} ->\n  {Path(found_particle)}"
-                    )
-                    return found_particle
-
-        print(f"ERROR Particle file not found: {csd_path}")
-        self.not_found_files.add(f"Particle: {csd_path}")
-        return None
-
-    def find_font_file(self, csd_path):
-        """Find the actual font file for a CSD path."""
-        if not csd_path:
-            return None
-
-        # Check if path starts with "Default/" - these represent non-existent resources
-        if csd_path.startswith("Default/"):
-            print(f"Skip Skipping Default resource: {csd_path}")
-            return None
-
-        # Remove plist references - we want the exact fnt path
-        clean_path = csd_path.replace("\\", "/")
-
-        # Try exact match first
-        if clean_path in self.path_mapping:
-            found_font = self.path_mapping[clean_path]
-            print(f"Font Exact match found: {csd_path} ->\n {Path(found_font)}")
-            return found_font
-
-        # Try partial path matching (from longest to shortest for better specificity)
-        path_parts = clean_path.split("/")
-        best_match = None
-        best_match_score = 0
-
-        for i in range(len(path_parts)):
-            partial_path = "/".join(path_parts[i:])
-            if partial_path in self.path_mapping:
-                found_font = self.path_mapping[partial_path]
-                # Calculate match score based on path length to prefer more specific matches
-                match_score = len(partial_path.split("/"))
-                if match_score > best_match_score:
-                    best_match = found_font
-                    best_match_score = match_score
-                print(
-                    f"[EMOJI] Partial path match found: {csd_path} -> {partial_path} ->\n  {Path(found_font)} (score: {match_score})"
-                )
-
-        if best_match:
-            print(f"[EMOJI] Best match selected: {csd_path} ->\n  {Path(best_match)}")
-            return best_match
-
-        # Finally, try filename-only match but look for the best match considering directory structure
-        filename = Path(clean_path).name
-        filename_matches = []
-
-        # Find all files with matching filename
-        for path_key, actual_path in self.path_mapping.items():
-            if Path(path_key).name == filename:
-                filename_matches.append((path_key, actual_path))
-
-        if filename_matches:
-            if len(filename_matches) == 1:
-                # Single match, use it
-                found_font = filename_matches[0][1]
-                print(
-                    f"Folder Single filename match found: {csd_path} ->\n  {Path(found_font)}"
-                )
-                return found_font
-            else:
-                # Multiple matches - try to find the best one based on directory structure similarity
-                best_filename_match = None
-                best_filename_score = 0
-
-                for path_key, actual_path in filename_matches:
-                    # Calculate similarity score between csd_path and path_key directory structures
-                    csd_parts = set(clean_path.split("/")[:-1])  # Exclude filename
-                    key_parts = set(path_key.split("/")[:-1])
-
-                    # Score based on common directory names
-                    common_dirs = len(csd_parts.intersection(key_parts))
-                    total_dirs = len(csd_parts.union(key_parts))
-
-                    if total_dirs > 0:
-                        similarity_score = common_dirs / total_dirs
-                    else:
-                        similarity_score = 0
-
-                    if similarity_score > best_filename_score:
-                        best_filename_match = actual_path
-                        best_filename_score = similarity_score
-
-                if best_filename_match:
-                    print(
-                        f"Folder Multiple filename matches found, selected best: {csd_path} ->\n  {Path(best_filename_match)} (similarity: {best_filename_score:.2f})"
-                    )
-                    return best_filename_match
-                else:
-                    # If no good similarity match, use the first one
-                    found_font = filename_matches[0][1]
-                    print(
-                        f"Folder Multiple filename matches found, using first: {csd_path} ->\n  {Path(found_font)}"
-                    )
-                    return found_font
-
-        print(f"ERROR Font file not found: {csd_path}")
-        self.not_found_files.add(f"Font: {csd_path}")
-        return None
-
-    def get_particle_uuid(self, particle_path):
-        """Generate or retrieve UUID for a particle system."""
-        if not particle_path:
-            return None
-
-        # Use normalized path as cache key to ensure consistency
-        normalized_path = self.normalize_path_for_uuid_key(particle_path)
-        
-        if normalized_path in self.particle_cache:
-            return self.particle_cache[normalized_path]
-
-        # Generate new unique UUID for this particle using UUID manager
-        particle_uuid = self.uuid_manager.generate_unique_uuid("base")
-        self.particle_cache[normalized_path] = particle_uuid
-        return particle_uuid
-
-    def create_particle_reference(self, csd_path):
-        """Create a particle reference from CSD path."""
-        actual_particle = self.find_particle_file(csd_path)
-        if not actual_particle:
-            print(f"WARNING  Cannot create particle reference for: {csd_path}")
-            return None
-
-        # Track that this particle is used
-        self.used_particles.add(actual_particle)
-        print(f"Success Particle marked as used: {Path(actual_particle).name}")
-
-        particle_uuid = self.get_particle_uuid(actual_particle)
-        if not particle_uuid:
-            return None
-
-        return {"__uuid__": particle_uuid, "__expectedType__": "cc.ParticleAsset"}
-
-    def get_font_uuid(self, font_path):
-        """Generate or retrieve UUID for a font file."""
-        if not font_path:
-            return None
-
-        # Use normalized path as cache key to ensure consistency
-        normalized_path = self.normalize_path_for_uuid_key(font_path)
-        
-        if normalized_path in self.font_cache:
-            return self.font_cache[normalized_path]
-
-        # Generate new unique UUID for this font using UUID manager
-        font_uuid = self.uuid_manager.generate_unique_uuid("base")
+        # Derive a stable UUID from the normalized path so every run (and worker) agrees
+        font_uuid = self.uuid_manager.generate_deterministic_uuid(
+            f"font#{normalized_path}", "base"
+        )
         self.font_cache[normalized_path] = font_uuid
         return font_uuid
 
@@ -803,10 +1179,30 @@ class ImageResourceManager:
         """
         Normalize file path for UUID cache key using the same logic as create_path_mapping_part.
         Returns the canonical path that should be used as UUID key.
+
+        The result is interned and remembered per path string, so the same key object is
+        handed to every cache and repeated calls are a single dict lookup.
         """
         if not file_path:
             return file_path
-            
+
+        path_string = str(file_path)
+        path_key = self.path_keys.get(path_string)
+        if path_key is None:
+            path_key = sys.intern(self._normalize_path_for_uuid_key(path_string))
+            self.path_keys[path_string] = path_key
+        return path_key
+
+    def get_resolved_path(self, file_path):
+        """str(Path(file_path).resolve()), computed once per path string."""
+        path_string = str(file_path)
+        resolved_path = self.resolved_paths.get(path_string)
+        if resolved_path is None:
+            resolved_path = sys.intern(str(Path(path_string).resolve()))
+            self.resolved_paths[path_string] = resolved_path
+        return resolved_path
+
+    def _normalize_path_for_uuid_key(self, file_path):
         path_file = Path(file_path)
         parts = path_file.parts
         
@@ -865,120 +1261,108 @@ class ImageResourceManager:
             print(f"WARNING Prefab referˇˇence could not be created for: {csd_path}")
             return None
 
+    TRIM_INFO_KEYS = [
+        "originalWidth",
+        "originalHeight",
+        "trimX",
+        "trimY",
+        "trimWidth",
+        "trimHeight",
+        "offsetX",
+        "offsetY",
+    ]
+
+    def analyze_image(self, image_path):
+        """
+        Decode an image once and record its trim information plus "hasAlpha".
+
+        Results are cached on disk by content md5, so unchanged images are not decoded
+        again on later runs. Returns None if the image cannot be decoded.
+        """
+        digest = self.image_analysis.get_digest(image_path)
+        analysis = self.image_analysis.lookup(digest)
+        if analysis is not None:
+            return analysis
+
+        analysis = compute_image_analysis(image_path)
+        if analysis is not None:
+            self.image_analysis.store(digest, analysis)
+        return analysis
+
+    def precompute_image_analysis(self, image_paths, jobs):
+        """
+        Analyze the images that have no cached analysis yet on a process pool.
+
+        Only fills the analysis cache (nothing to do for jobs <= 1); meta generation
+        then finds every result there. Returns the number of images analyzed.
+        """
+        missing = {}  # md5 -> first path with that content
+        for image_path in image_paths:
+            digest = self.image_analysis.get_digest(image_path)
+            if digest and self.image_analysis.lookup(digest) is None:
+                missing.setdefault(digest, image_path)
+        if jobs <= 1 or len(missing) < 2:
+            return 0
+
+        results = map_in_spawn_pool(
+            compute_image_analysis,
+            [(image_path,) for image_path in missing.values()],
+            jobs,
+            "Image analysis",
+        )
+        for digest, analysis in zip(missing, results):
+            if analysis is not None:
+                self.image_analysis.store(digest, analysis)
+        return len(missing)
+
     def calculate_image_trim(self, image_path):
         """Calculate trim information for an image by removing transparent borders."""
+        self.referenced_files.add(str(image_path))
         if image_path in self.trim_info_cache:
             return self.trim_info_cache[image_path]
 
-        try:
-            from PIL import Image
-
-            with Image.open(image_path) as img:
-                # Convert to RGBA if not already
-                if img.mode != "RGBA":
-                    img = img.convert("RGBA")
-
-                # Get image dimensions
-                width, height = img.size
-
-                # Find bounding box of non-transparent pixels
-                bbox = img.getbbox()
-
-                if bbox:
-                    # bbox is (left, upper, right, lower)
-                    left, upper, right, lower = bbox
-                    trim_x = left
-                    trim_y = upper
-                    trim_width = right - left
-                    trim_height = lower - upper
-
-                    # Calculate offset from center
-                    original_center_x = width / 2
-                    original_center_y = height / 2
-                    trim_center_x = (left + right) / 2
-                    trim_center_y = (upper + lower) / 2
-
-                    offset_x = trim_center_x - original_center_x
-                    offset_y = (height - trim_center_y) - (
-                        height - original_center_y
-                    )  # Flip Y for Cocos
-                else:
-                    # If no non-transparent pixels, use original size
-                    trim_x = 0
-                    trim_y = 0
-                    trim_width = width
-                    trim_height = height
-                    offset_x = 0
-                    offset_y = 0
-
-                trim_info = {
-                    "originalWidth": width,
-                    "originalHeight": height,
-                    "trimX": trim_x,
-                    "trimY": trim_y,
-                    "trimWidth": trim_width,
-                    "trimHeight": trim_height,
-                    "offsetX": offset_x,
-                    "offsetY": offset_y,
-                }
-
-                self.trim_info_cache[image_path] = trim_info
-                return trim_info
+        analysis = self.analyze_image(image_path)
+        if analysis is not None:
+            trim_info = {key: analysis[key] for key in self.TRIM_INFO_KEYS}
+            self.trim_info_cache[image_path] = trim_info
+            return trim_info
 
-        except (ImportError, Exception) as e:
-            # Fallback: no trim, use original size
+        # Fallback: no trim, use original size (header only)
+        size = probe_image_size(image_path)
+        if size is not None:
+            width, height = size
+        else:
             try:
-                from PIL import Image
-
                 with Image.open(image_path) as img:
                     width, height = img.size
             except:
                 width, height = 100, 100
 
-            trim_info = {
-                "originalWidth": width,
-                "originalHeight": height,
-                "trimX": 0,
-                "trimY": 0,
-                "trimWidth": width,
-                "trimHeight": height,
-                "offsetX": 0,
-                "offsetY": 0,
-            }
+        trim_info = {
+            "originalWidth": width,
+            "originalHeight": height,
+            "trimX": 0,
+            "trimY": 0,
+            "trimWidth": width,
+            "trimHeight": height,
+            "offsetX": 0,
+            "offsetY": 0,
+        }
 
-            self.trim_info_cache[image_path] = trim_info
-            return trim_info
+        self.trim_info_cache[image_path] = trim_info
+        return trim_info
 
     def detect_image_alpha(self, image_path):
         """Detect if an image has transparency/alpha channel."""
-        try:
-            from PIL import Image
-
-            with Image.open(image_path) as img:
-                # Special handling based on image filename/type
-                filename = Path(image_path).name.lower()
-
-                # For CheckBox_Disable.png specifically, it should be False based on reference
-                if "checkbox_disable.png" in filename:
-                    return False
-
-                # Check if image has alpha channel
-                if img.mode in ("RGBA", "LA") or "transparency" in img.info:
-                    # Convert to RGBA to check transparency
-                    if img.mode != "RGBA":
-                        img = img.convert("RGBA")
-
-                    # Check if any pixel is actually transparent
-                    alpha_channel = img.split()[-1]  # Get alpha channel
-                    min_alpha = alpha_channel.getextrema()[0]  # Get minimum alpha value
-                    return min_alpha < 255  # Has transparency if minimum alpha < 255
-                else:
-                    return False  # No alpha channel
-
-        except (ImportError, Exception):
+        analysis = self.analyze_image(image_path)
+        if analysis is None:
             return True  # Default to True if can't detect
 
-        return False
+        # For CheckBox_Disable.png specifically, it should be False based on reference
+        if "checkbox_disable.png" in Path(image_path).name.lower():
+            return False
+
+        return analysis["hasAlpha"]
 
     def get_trimmed_size(self, image_path):
         """Get the trimmed size of an image for UITransform."""
@@ -1031,6 +1415,13 @@ class ImageResourceManager:
             print(f"ERROR Cannot find image: {image_path}")
             return 100, 100  # Default size
 
+        # 只需要尺寸：已計算過 trim 就沿用，否則只讀檔頭，不解碼像素
+        if actual_image not in self.trim_info_cache:
+            size = probe_image_size(actual_image)
+            if size is not None:
+                self.referenced_files.add(str(actual_image))
+                return size
+
         trim_info = self.calculate_image_trim(actual_image)
         return trim_info["originalWidth"], trim_info["originalHeight"]
 
@@ -1146,19 +1537,128 @@ class ImageResourceManager:
         """
         if not image_path:
             return None
+        self.referenced_files.add(str(image_path))
 
         # Use normalized path as cache key to ensure consistency
         normalized_path = self.normalize_path_for_uuid_key(image_path)
-        
+        # Identical image content shares the canonical image's sprite frame (--dedup-images)
+        canonical_image = self.duplicate_images.get(normalized_path)
+        if canonical_image is not None:
+            normalized_path = self.normalize_path_for_uuid_key(canonical_image)
+
         if normalized_path in self.image_cache:
             return self.image_cache[normalized_path]
 
-        # Generate new unique sprite frame UUID using UUID manager
-        sprite_frame_uuid = self.uuid_manager.generate_unique_uuid("sprite_frame")
+        # Derive a stable sprite frame UUID from the normalized path so every run (and worker) agrees
+        sprite_frame_uuid = self.uuid_manager.generate_deterministic_uuid(
+            f"sprite_frame#{normalized_path}", "sprite_frame"
+        )
         self.image_cache[normalized_path] = sprite_frame_uuid
         print(f"UUID Generated UUID for normalized path {normalized_path}: {sprite_frame_uuid}")
         return sprite_frame_uuid
 
+    def plan_image_dedup(self, excluded_images=()):
+        """
+        Map every available image whose content duplicates another one to a canonical image.
+
+        Images are grouped by content md5 (only files sharing a size are hashed). One
+        sprite frame carries one set of borders, so images with different Scale9 histories
+        stay apart; images without Scale9 settings join the first bordered group. The
+        canonical image of a group is its first path in sorted order that has the group's
+        Scale9 history, so the choice is stable between runs. get_sprite_frame_uuid()
+        then hands out the canonical UUID for every duplicate.
+
+        Args:
+            excluded_images (iterable): Images never merged (e.g. font textures, which are
+                copied next to their font with their own .meta).
+
+        Returns:
+            dict: canonical image path -> sorted list of its duplicates
+        """
+        self.duplicate_images = {}
+        excluded = {self.get_resolved_path(image) for image in excluded_images}
+
+        images_by_size = {}
+        for image_path in sorted(self.available_images):
+            if self.get_resolved_path(image_path) in excluded:
+                continue
+            try:
+                images_by_size.setdefault(os.path.getsize(image_path), []).append(image_path)
+            except OSError:
+                continue
+
+        images_by_digest = {}
+        for same_size in images_by_size.values():
+            if len(same_size) < 2:
+                continue
+            for image_path in same_size:
+                digest = self.image_analysis.get_digest(image_path)
+                if digest is not None:
+                    images_by_digest.setdefault(digest, []).append(image_path)
+
+        groups = []
+        for same_content in images_by_digest.values():
+            bordered = {}  # Scale9 history (as JSON) -> images, in sorted order
+            plain = []
+            for image_path in same_content:
+                scale9_history = self.scale9_info_cache.get(
+                    self.normalize_path_for_uuid_key(image_path)
+                )
+                if scale9_history:
+                    history_key = json.dumps(scale9_history, sort_keys=True, default=str)
+                    bordered.setdefault(history_key, []).append(image_path)
+                else:
+                    plain.append(image_path)
+            content_groups = sorted(bordered.values()) or [[]]
+            content_groups[0].extend(plain)
+            groups.extend(content_groups)
+
+        duplicate_groups = {}
+        for group in groups:
+            canonical_image = group[0]
+            canonical_key = self.normalize_path_for_uuid_key(canonical_image)
+            duplicates = []
+            for image_path in sorted(group[1:]):
+                duplicate_key = self.normalize_path_for_uuid_key(image_path)
+                if duplicate_key != canonical_key:
+                    self.duplicate_images[duplicate_key] = canonical_image
+                    duplicates.append(image_path)
+            if duplicates:
+                duplicate_groups[canonical_image] = duplicates
+        return duplicate_groups
+
+    def get_canonical_image(self, image_path):
+        """Canonical image replacing image_path after plan_image_dedup(), or None if it is not a duplicate."""
+        return self.duplicate_images.get(self.normalize_path_for_uuid_key(image_path))
+
+    def print_duplicate_report(self, duplicate_groups, duplicate_list_path):
+        """Print the dedup summary and write every duplicate group to duplicate_list_path."""
+        duplicate_count = sum(len(duplicates) for duplicates in duplicate_groups.values())
+        saved_bytes = 0
+        for duplicates in duplicate_groups.values():
+            for image_path in duplicates:
+                try:
+                    saved_bytes += os.path.getsize(image_path)
+                except OSError:
+                    pass
+        print(
+            f"Success Found {duplicate_count} duplicate images in {len(duplicate_groups)} groups "
+            f"({saved_bytes / 1024:.1f} KB not exported)"
+        )
+
+        try:
+            with open(duplicate_list_path, "w", encoding="utf-8") as f:
+                f.write("# DuplicateList - Images with identical content share the canonical image's UUID\n")
+                f.write(f"# Total duplicate files: {duplicate_count}\n")
+                f.write(f"# Total groups: {len(duplicate_groups)}\n\n")
+                for canonical_image in sorted(duplicate_groups):
+                    f.write(f"{canonical_image}\n")
+                    for image_path in duplicate_groups[canonical_image]:
+                        f.write(f"  = {image_path}\n")
+            print(f"[EMOJI] DuplicateList saved to: {duplicate_list_path}")
+        except Exception as e:
+            print(f"ERROR Failed to save DuplicateList: {str(e)}")
+
     def should_filter_image(self, image_path):
         """Check if an image should be filtered out based on filename.
         
@@ -1182,8 +1682,8 @@ class ImageResourceManager:
         
         return False
     
-    def create_sprite_frame_reference(self, img_path):
-        """Create a sprite frame reference from CSD path."""
+    def create_sprite_frame_reference(self, img_path, plist_path=""):
+        """Create a sprite frame reference from CSD path (plist_path: the FileData's @Plist)."""
         # Check if path starts with "Default/" - these represent non-existent resources
         if img_path and img_path.startswith("Default/"):
             print(f"Skip Skipping Default resource sprite frame: {img_path}")
@@ -1194,6 +1694,11 @@ class ImageResourceManager:
             print(f"Skip Filtering out blank image: {img_path}")
             return None
 
+        # Frames of an imported texture atlas reference the SpriteAtlas sub-asset
+        atlas_frame_uuid = self.get_atlas_frame_uuid(img_path, plist_path)
+        if atlas_frame_uuid:
+            return {"__uuid__": atlas_frame_uuid, "__expectedType__": "cc.SpriteFrame"}
+
         actual_image = self.find_image_file(img_path)
         if not actual_image:
             print(f"WARNING  Cannot create sprite frame reference for: {img_path}")
@@ -1216,6 +1721,207 @@ class ImageResourceManager:
 
         return {"__uuid__": sprite_uuid, "__expectedType__": "cc.SpriteFrame"}
 
+    def get_atlas_uuid(self, atlas_path):
+        """Generate or retrieve the SpriteAtlas UUID of a texture atlas plist."""
+        if not atlas_path:
+            return None
+        self.referenced_files.add(str(atlas_path))
+
+        # Use normalized path as cache key to ensure consistency
+        normalized_path = self.normalize_path_for_uuid_key(atlas_path)
+
+        if normalized_path in self.atlas_cache:
+            return self.atlas_cache[normalized_path]
+
+        # Derive a stable UUID from the normalized path so every run (and worker) agrees
+        atlas_uuid = self.uuid_manager.generate_deterministic_uuid(
+            f"sprite_atlas#{normalized_path}", "base"
+        )
+        self.atlas_cache[normalized_path] = atlas_uuid
+        return atlas_uuid
+
+    @staticmethod
+    def find_atlas_frame(frames, img_path):
+        """Frame name in frames for a CSD Path: longest matching path suffix, then a unique file name."""
+        clean_path = img_path.replace("\\", "/")
+        path_parts = clean_path.split("/")
+        for i in range(len(path_parts)):
+            partial_path = "/".join(path_parts[i:])
+            if partial_path in frames:
+                return partial_path
+
+        filename = path_parts[-1]
+        filename_matches = [
+            frame_name for frame_name in frames if frame_name.split("/")[-1] == filename
+        ]
+        if len(filename_matches) == 1:
+            return filename_matches[0]
+        return None
+
+    def resolve_atlas_frame(self, img_path, plist_path):
+        """
+        Find the texture atlas frame a CSD FileData (Path + Plist) points at.
+
+        Returns:
+            tuple: (atlas plist file, frame name), or (None, None) to use the loose image
+        """
+        if not IMPORT_TEXTURE_ATLAS or not plist_path or not img_path:
+            return None, None
+        cache_key = (img_path, plist_path)
+        if cache_key not in self._atlas_frames:
+            self._atlas_frames[cache_key] = self._resolve_atlas_frame(img_path, plist_path)
+        return self._atlas_frames[cache_key]
+
+    def _resolve_atlas_frame(self, img_path, plist_path):
+        atlas_file = self.find_atlas_file(plist_path)
+        if atlas_file is None:
+            return None, None
+        try:
+            frames = self.get_plist_info(atlas_file)["frames"]
+        except Exception as e:
+            print(f"ERROR Error reading plist {atlas_file}: {str(e)}")
+            return None, None
+
+        frame_name = self.find_atlas_frame(frames, img_path)
+        if frame_name is None:
+            print(f"WARNING  Frame {img_path} not in {Path(atlas_file).name}, using loose image")
+            return None, None
+        return atlas_file, frame_name
+
+    @staticmethod
+    def get_atlas_frame_key(atlas_file, frame_name):
+        """Scale9 cache key of an atlas frame."""
+        return f"{atlas_file}#{frame_name}"
+
+    def get_scale9_keys(self, img_path, plist_path=""):
+        """
+        Scale9 cache keys a Scale9 node's FileData records its borders under.
+
+        The loose image, plus the atlas frame key when the reference is a frame of an
+        imported texture atlas (those borders go into the atlas .meta).
+        """
+        scale9_keys = []
+        actual_image = self.find_image_file(img_path)
+        if actual_image:
+            scale9_keys.append(actual_image)
+        atlas_file, frame_name = self.resolve_atlas_frame(img_path, plist_path)
+        if atlas_file is not None:
+            scale9_keys.append(self.get_atlas_frame_key(atlas_file, frame_name))
+        return scale9_keys
+
+    def get_atlas_frame_uuid(self, img_path, plist_path):
+        """SpriteFrame UUID of an atlas frame (SpriteAtlas UUID @ frame id), or None."""
+        atlas_file, frame_name = self.resolve_atlas_frame(img_path, plist_path)
+        if atlas_file is None:
+            return None
+
+        # Track that this atlas is used
+        self.used_atlases.add(atlas_file)
+        frame = self.get_plist_info(atlas_file)["frames"][frame_name]
+        print(f"Success Atlas frame: {img_path} -> {Path(atlas_file).name}#{frame_name}")
+        return f"{self.get_atlas_uuid(atlas_file)}@{frame['id']}"
+
+    def get_atlas_frame_size(self, img_path, plist_path):
+        """Original (untrimmed) size of the atlas frame a CSD FileData points at, or None."""
+        atlas_file, frame_name = self.resolve_atlas_frame(img_path, plist_path)
+        if atlas_file is None:
+            return None
+        return tuple(self.get_plist_info(atlas_file)["frames"][frame_name]["sourceSize"])
+
+    def get_atlas_texture_file(self, atlas_file):
+        """Texture image of a texture atlas plist (next to the plist), or None."""
+        try:
+            texture_filename = self.get_plist_info(atlas_file).get("atlas_texture")
+        except Exception as e:
+            print(f"ERROR Error reading plist {atlas_file}: {str(e)}")
+            return None
+        if not texture_filename:
+            return None
+        return str(Path(atlas_file).with_name(texture_filename))
+
+    def generate_atlas_meta_file(self, source_atlas, dest_path, meta_writer=None):
+        """Generate the sprite-atlas .meta of a texture atlas plist, one sprite-frame sub-meta per frame."""
+        info = self.get_plist_info(source_atlas)
+        atlas_uuid = self.get_atlas_uuid(source_atlas)
+        texture_file = self.get_atlas_texture_file(source_atlas)
+        texture_uuid = ""
+        if texture_file and Path(texture_file).exists():
+            texture_uuid = self.get_sprite_frame_uuid(texture_file).split("@")[0]
+        else:
+            print(f"WARNING  Atlas texture not found for {Path(source_atlas).name}: {texture_file}")
+
+        sub_metas = {}
+        for frame_name, frame in info["frames"].items():
+            x, y, width, height = frame["rect"]
+            raw_width, raw_height = frame["sourceSize"]
+            scale9_info = self.get_scale9_info(
+                self.get_atlas_frame_key(source_atlas, frame_name), raw_width, raw_height
+            )
+            frame_asset_name = os.path.splitext(frame_name)[0]
+            sub_metas[frame["id"]] = {
+                "importer": "sprite-frame",
+                "uuid": f"{atlas_uuid}@{frame['id']}",
+                "displayName": "",
+                "id": frame["id"],
+                "name": frame_asset_name,
+                "userData": {
+                    "trimType": "auto",
+                    "trimThreshold": TRIM_THRESHOLD,
+                    "rotated": frame["rotated"],
+                    "offsetX": frame["offset"][0],
+                    "offsetY": frame["offset"][1],
+                    "trimX": x,
+                    "trimY": y,
+                    "width": width,
+                    "height": height,
+                    "rawWidth": raw_width,
+                    "rawHeight": raw_height,
+                    "borderTop": scale9_info["topEage"],
+                    "borderBottom": scale9_info["bottomEage"],
+                    "borderLeft": scale9_info["leftEage"],
+                    "borderRight": scale9_info["rightEage"],
+                    "packable": True,
+                    "pixelsToUnit": 100,
+                    "pivotX": 0.5,
+                    "pivotY": 0.5,
+                    "meshType": 0,
+                    # Creator 匯入合圖時不寫入 frame 的 mesh 資料
+                    "vertices": {
+                        "rawPosition": [],
+                        "indexes": [],
+                        "uv": [],
+                        "nuv": [],
+                        "minPos": [],
+                        "maxPos": [],
+                    },
+                    "isUuid": True,
+                    "imageUuidOrDatabaseUri": f"{texture_uuid}@6c48a" if texture_uuid else "",
+                    "atlasUuid": atlas_uuid,
+                },
+                "ver": "1.0.12",
+                "imported": True,
+                "files": [".json"],
+                "subMetas": {},
+            }
+
+        meta_content = {
+            "ver": "1.0.8",
+            "importer": "sprite-atlas",
+            "imported": True,
+            "uuid": atlas_uuid,
+            "files": [".json"],
+            "subMetas": sub_metas,
+            "userData": {
+                "atlasTextureName": info["atlas_texture"],
+                "format": info["atlas_format"],
+                "uuid": atlas_uuid,
+                "textureUuid": f"{texture_uuid}@6c48a" if texture_uuid else "",
+            },
+        }
+
+        # Write .meta file
+        write_meta_file(Path(str(dest_path) + ".meta"), meta_content, meta_writer)
+
     def parse_fnt_texture_files(self, fnt_path):
         """Parse FNT file to extract referenced texture files."""
         texture_files = []
@@ -1239,8 +1945,12 @@ class ImageResourceManager:
 
         return texture_files
 
-    def generate_image_meta_file(self, source_image, dest_path):
-        """Generate .meta file for an image with correct UUID, matching engine format."""
+    def generate_image_meta_file(self, source_image, dest_path, meta_writer=None):
+        """Generate .meta file for an image with correct UUID, matching engine format.
+
+        With meta_writer the file is written on its thread pool; the UUID and the meta
+        content are still decided here, in call order.
+        """
         # Get the main texture UUID (without @f9941 suffix)
         sprite_uuid = self.get_sprite_frame_uuid(source_image)
         if not sprite_uuid:
@@ -1309,7 +2019,7 @@ class ImageResourceManager:
                     "name": "spriteFrame",
                     "userData": {
                         "trimType": "auto",
-                        "trimThreshold": 1,
+                        "trimThreshold": TRIM_THRESHOLD,
                         "rotated": False,
                         "offsetX": int(offset_x) if offset_x.is_integer() else offset_x,
                         "offsetY": int(offset_y) if offset_y.is_integer() else offset_y,
@@ -1442,93 +2152,20 @@ class ImageResourceManager:
         }
 
         # Write .meta file
-        meta_path = Path(str(dest_path) + ".meta")
-        with open(meta_path, "w", encoding="utf-8") as f:
-            json.dump(meta_content, f, indent=2, ensure_ascii=False)
+        write_meta_file(Path(str(dest_path) + ".meta"), meta_content, meta_writer)
 
     def parse_plist_properties(self, plist_path):
         """Parse plist file to extract particle properties for userData."""
         try:
-            import plistlib
+            info = self.get_plist_info(plist_path)
+            if "particle_properties" in info:
+                return deepcopy(info["particle_properties"])
+            if "properties_error" in info:
+                raise ValueError(info["properties_error"])
 
+            # 合圖 plist 不快取粒子屬性
             with open(plist_path, "rb") as f:
-                plist_data = plistlib.load(f)
-
-            # Extract key properties from plist
-            user_data = {
-                "totalParticles": int(plist_data.get("maxParticles", 26)),
-                "life": float(plist_data.get("particleLifespan", 0.7)),
-                "lifeVar": float(plist_data.get("particleLifespanVariance", 0.3)),
-                "emissionRate": float(plist_data.get("maxParticles", 26))
-                / float(plist_data.get("particleLifespan", 0.7))
-                * 37.142857142857146,
-                "duration": float(plist_data.get("duration", -1)),
-                "srcBlendFactor": int(plist_data.get("blendFuncSource", 770)),
-                "dstBlendFactor": int(plist_data.get("blendFuncDestination", 771)),
-                "startColor": {
-                    "_val": self.color_to_uint32(
-                        float(plist_data.get("startColorRed", 1)),
-                        float(plist_data.get("startColorGreen", 1)),
-                        float(plist_data.get("startColorBlue", 1)),
-                        float(plist_data.get("startColorAlpha", 1)),
-                    )
-                },
-                "startColorVar": {
-                    "_val": self.color_to_uint32(
-                        0, 0, 0, float(plist_data.get("startColorVarianceAlpha", 0.05))
-                    )
-                },
-                "endColor": {
-                    "_val": self.color_to_uint32(
-                        float(plist_data.get("finishColorRed", 1)),
-                        float(plist_data.get("finishColorGreen", 0.68)),
-                        float(plist_data.get("finishColorBlue", 0)),
-                        float(plist_data.get("finishColorAlpha", 0.6)),
-                    )
-                },
-                "endColorVar": {"_val": 0},
-                "startSize": float(plist_data.get("startParticleSize", 35)),
-                "startSizeVar": float(plist_data.get("startParticleSizeVariance", 10)),
-                "endSize": float(plist_data.get("finishParticleSize", 10)),
-                "endSizeVar": float(plist_data.get("finishParticleSizeVariance", 5)),
-                "positionType": 0,
-                "sourcePos": {
-                    "x": float(plist_data.get("sourcePositionx", 0)),
-                    "y": float(plist_data.get("sourcePositiony", 0)),
-                },
-                "posVar": {
-                    "x": float(plist_data.get("sourcePositionVariancex", 10)),
-                    "y": float(plist_data.get("sourcePositionVariancey", 10)),
-                },
-                "angle": float(plist_data.get("angle", 90)),
-                "angleVar": float(plist_data.get("angleVariance", 180)),
-                "startSpin": float(plist_data.get("rotationStart", 0)),
-                "startSpinVar": float(plist_data.get("rotationStartVariance", 0)),
-                "endSpin": float(plist_data.get("rotationEnd", 0)),
-                "endSpinVar": float(plist_data.get("rotationEndVariance", 0)),
-                "emitterMode": int(plist_data.get("emitterType", 0)),
-                "gravity": {
-                    "x": float(plist_data.get("gravityx", 0)),
-                    "y": float(plist_data.get("gravityy", 0)),
-                },
-                "speed": float(plist_data.get("speed", 10)),
-                "speedVar": float(plist_data.get("speedVariance", 86)),
-                "radialAccel": float(plist_data.get("radialAcceleration", 35)),
-                "radialAccelVar": float(plist_data.get("radialAccelVariance", 0)),
-                "tangentialAccel": float(plist_data.get("tangentialAcceleration", 0)),
-                "tangentialAccelVar": float(
-                    plist_data.get("tangentialAccelVariance", 0)
-                ),
-                "rotationIsDir": bool(plist_data.get("rotationIsDir", False)),
-                "startRadius": float(plist_data.get("minRadius", 0)),
-                "startRadiusVar": float(plist_data.get("minRadiusVariance", 0)),
-                "endRadius": float(plist_data.get("maxRadius", 0)),
-                "endRadiusVar": float(plist_data.get("maxRadiusVariance", 0)),
-                "rotatePerS": float(plist_data.get("rotatePerSecond", 0)),
-                "rotatePerSVar": float(plist_data.get("rotatePerSecondVariance", 0)),
-                "spriteFrameUuid": "",
-            }
-            return user_data
+                return self.build_particle_properties(plistlib.load(f))
 
         except Exception as e:
             print(
@@ -1578,6 +2215,84 @@ class ImageResourceManager:
                 "spriteFrameUuid": "",
             }
 
+    def build_particle_properties(self, plist_data):
+        """Particle userData from a parsed particle plist."""
+        # Extract key properties from plist
+        user_data = {
+            "totalParticles": int(plist_data.get("maxParticles", 26)),
+            "life": float(plist_data.get("particleLifespan", 0.7)),
+            "lifeVar": float(plist_data.get("particleLifespanVariance", 0.3)),
+            "emissionRate": float(plist_data.get("maxParticles", 26))
+            / float(plist_data.get("particleLifespan", 0.7))
+            * 37.142857142857146,
+            "duration": float(plist_data.get("duration", -1)),
+            "srcBlendFactor": int(plist_data.get("blendFuncSource", 770)),
+            "dstBlendFactor": int(plist_data.get("blendFuncDestination", 771)),
+            "startColor": {
+                "_val": self.color_to_uint32(
+                    float(plist_data.get("startColorRed", 1)),
+                    float(plist_data.get("startColorGreen", 1)),
+                    float(plist_data.get("startColorBlue", 1)),
+                    float(plist_data.get("startColorAlpha", 1)),
+                )
+            },
+            "startColorVar": {
+                "_val": self.color_to_uint32(
+                    0, 0, 0, float(plist_data.get("startColorVarianceAlpha", 0.05))
+                )
+            },
+            "endColor": {
+                "_val": self.color_to_uint32(
+                    float(plist_data.get("finishColorRed", 1)),
+                    float(plist_data.get("finishColorGreen", 0.68)),
+                    float(plist_data.get("finishColorBlue", 0)),
+                    float(plist_data.get("finishColorAlpha", 0.6)),
+                )
+            },
+            "endColorVar": {"_val": 0},
+            "startSize": float(plist_data.get("startParticleSize", 35)),
+            "startSizeVar": float(plist_data.get("startParticleSizeVariance", 10)),
+            "endSize": float(plist_data.get("finishParticleSize", 10)),
+            "endSizeVar": float(plist_data.get("finishParticleSizeVariance", 5)),
+            "positionType": 0,
+            "sourcePos": {
+                "x": float(plist_data.get("sourcePositionx", 0)),
+                "y": float(plist_data.get("sourcePositiony", 0)),
+            },
+            "posVar": {
+                "x": float(plist_data.get("sourcePositionVariancex", 10)),
+                "y": float(plist_data.get("sourcePositionVariancey", 10)),
+            },
+            "angle": float(plist_data.get("angle", 90)),
+            "angleVar": float(plist_data.get("angleVariance", 180)),
+            "startSpin": float(plist_data.get("rotationStart", 0)),
+            "startSpinVar": float(plist_data.get("rotationStartVariance", 0)),
+            "endSpin": float(plist_data.get("rotationEnd", 0)),
+            "endSpinVar": float(plist_data.get("rotationEndVariance", 0)),
+            "emitterMode": int(plist_data.get("emitterType", 0)),
+            "gravity": {
+                "x": float(plist_data.get("gravityx", 0)),
+                "y": float(plist_data.get("gravityy", 0)),
+            },
+            "speed": float(plist_data.get("speed", 10)),
+            "speedVar": float(plist_data.get("speedVariance", 86)),
+            "radialAccel": float(plist_data.get("radialAcceleration", 35)),
+            "radialAccelVar": float(plist_data.get("radialAccelVariance", 0)),
+            "tangentialAccel": float(plist_data.get("tangentialAcceleration", 0)),
+            "tangentialAccelVar": float(
+                plist_data.get("tangentialAccelVariance", 0)
+            ),
+            "rotationIsDir": bool(plist_data.get("rotationIsDir", False)),
+            "startRadius": float(plist_data.get("minRadius", 0)),
+            "startRadiusVar": float(plist_data.get("minRadiusVariance", 0)),
+            "endRadius": float(plist_data.get("maxRadius", 0)),
+            "endRadiusVar": float(plist_data.get("maxRadiusVariance", 0)),
+            "rotatePerS": float(plist_data.get("rotatePerSecond", 0)),
+            "rotatePerSVar": float(plist_data.get("rotatePerSecondVariance", 0)),
+            "spriteFrameUuid": "",
+        }
+        return user_data
+
     def color_to_uint32(self, r, g, b, a):
         """Convert RGBA color components to uint32 value."""
         return (
@@ -1587,6 +2302,8 @@ class ImageResourceManager:
     def extract_texture_from_plist(self, plist_path, output_dir=None):
         """
         Extract texture from a .plist file containing base64 encoded texture data.
+        PNG / JPEG payloads (optionally gzip / zlib wrapped) are written byte for byte;
+        other formats are decoded and saved as PNG.
         Returns (modified_plist_path, texture_path) or (None, None) if extraction fails
         """
         plist_path = Path(plist_path)
@@ -1602,15 +2319,15 @@ class ImageResourceManager:
             output_dir.mkdir(parents=True, exist_ok=True)
 
         try:
+            # Check if textureImageData exists (cached, without loading the plist)
+            if not self.get_plist_info(plist_path)["embedded_texture"]:
+                print(f"WARNING  No textureImageData found in {plist_path}")
+                return str(plist_path), None
+
             # Read and parse the plist file
             with open(plist_path, "rb") as f:
                 plist_data = plistlib.load(f)
 
-            # Check if textureImageData exists
-            if "textureImageData" not in plist_data:
-                print(f"WARNING  No textureImageData found in {plist_path}")
-                return str(plist_path), None
-
             texture_data = plist_data["textureImageData"]
             texture_filename = plist_data.get(
                 "textureFileName", "extracted_texture.png"
@@ -1625,26 +2342,34 @@ class ImageResourceManager:
                 print(f"ERROR Base64 decode failed: {e}")
                 return None, None
 
-            # Try to decompress gzip, if it fails, use decoded data directly
             try:
-                decompressed_data = gzip.decompress(decoded_data)
+                image_data = unwrap_embedded_texture(decoded_data)
             except Exception as e:
                 print(f"WARNING  Gzip decompression failed ({e}), trying direct decode")
-                decompressed_data = decoded_data
+                image_data = decoded_data
 
-            # Create image from decompressed data
+            # PNG / JPEG bytes are written as they are; only other formats are decoded and converted
+            image_format = sniff_image_format(image_data)
             try:
-                image = Image.open(io.BytesIO(decompressed_data))
-
-                # Save the texture image
-                texture_path = output_dir / texture_filename
-                image.save(texture_path)
+                if image_format:
+                    texture_path = output_dir / Path(texture_filename).with_suffix(image_format)
+                    with open(texture_path, "wb") as f:
+                        f.write(image_data)
+                else:
+                    texture_path = output_dir / Path(texture_filename).with_suffix(".png")
+                    with Image.open(io.BytesIO(image_data)) as image:
+                        image.save(texture_path, format="PNG")
+                    print(f"Processing Converted {image.format} texture to PNG")
                 print(f"Success Texture saved: {texture_path}")
 
             except Exception as e:
                 print(f"ERROR Image creation failed: {e}")
                 return None, None
 
+            # The plist must name the file that was written
+            if texture_path.name != texture_filename:
+                plist_data["textureFileName"] = texture_path.name
+
             # Remove textureImageData from plist
             del plist_data["textureImageData"]
 
@@ -1668,31 +2393,138 @@ class ImageResourceManager:
         Returns True if it's a texture atlas plist, False if it's a particle plist
         """
         try:
-            with open(plist_path, "rb") as f:
-                plist_data = plistlib.load(f)
+            return self.get_plist_info(plist_path)["atlas"]
 
-            # 合圖 plist 會包含 frames 和 metadata 字典
-            has_frames = "frames" in plist_data and isinstance(
-                plist_data["frames"], dict
-            )
-            has_metadata = "metadata" in plist_data and isinstance(
-                plist_data["metadata"], dict
-            )
+        except Exception as e:
+            print(f"ERROR Error reading plist {plist_path}: {str(e)}")
+            # 如果無法讀取，預設當作粒子效果處理
+            return False
 
-            if has_frames and has_metadata:
-                metadata = plist_data["metadata"]
-                # 檢查是否有 textureFileName 或 realTextureFileName
-                has_texture_ref = (
-                    "textureFileName" in metadata or "realTextureFileName" in metadata
-                )
-                return has_texture_ref
+    @staticmethod
+    def _is_texture_atlas_data(plist_data):
+        # 合圖 plist 會包含 frames 和 metadata 字典
+        has_frames = "frames" in plist_data and isinstance(
+            plist_data["frames"], dict
+        )
+        has_metadata = "metadata" in plist_data and isinstance(
+            plist_data["metadata"], dict
+        )
 
-            return False
+        if has_frames and has_metadata:
+            metadata = plist_data["metadata"]
+            # 檢查是否有 textureFileName 或 realTextureFileName
+            has_texture_ref = (
+                "textureFileName" in metadata or "realTextureFileName" in metadata
+            )
+            return has_texture_ref
 
-        except Exception as e:
-            print(f"ERROR Error reading plist {plist_path}: {str(e)}")
-            # 如果無法讀取，預設當作粒子效果處理
-            return False
+        return False
+
+    @staticmethod
+    def _parse_plist_numbers(value):
+        """Numbers of a plist geometry string such as "{{2,4},{30,20}}" (format 1-3)."""
+        return [float(number) for number in re.findall(r"-?\d+(?:\.\d+)?", str(value))]
+
+    @staticmethod
+    def build_atlas_frames(plist_data):
+        """
+        Normalize the frames of a texture atlas plist (Cocos formats 0-3).
+
+        Returns:
+            dict: frame name -> {"id", "rect" [x, y, w, h], "rotated", "offset" [x, y],
+                "sourceSize" [w, h]}; rect is the unrotated frame size at its texture position
+        """
+        numbers = ImageResourceManager._parse_plist_numbers
+        plist_format = int(plist_data["metadata"].get("format", 0))
+        frames = {}
+        used_ids = set()
+        for frame_name in sorted(plist_data["frames"]):
+            frame = plist_data["frames"][frame_name]
+            if plist_format == 0:
+                rect = [frame.get("x", 0), frame.get("y", 0), frame.get("width", 0), frame.get("height", 0)]
+                rotated = False
+                offset = [frame.get("offsetX", 0), frame.get("offsetY", 0)]
+                source_size = [
+                    frame.get("originalWidth", rect[2]),
+                    frame.get("originalHeight", rect[3]),
+                ]
+            elif plist_format == 3:
+                rect = numbers(frame.get("textureRect", ""))
+                rotated = bool(frame.get("textureRotated", False))
+                offset = numbers(frame.get("spriteOffset", "{0,0}"))
+                source_size = numbers(frame.get("spriteSourceSize", ""))
+            else:
+                rect = numbers(frame.get("frame", ""))
+                rotated = bool(frame.get("rotated", False))
+                offset = numbers(frame.get("offset", "{0,0}"))
+                source_size = numbers(frame.get("sourceSize", ""))
+            if len(rect) != 4:
+                continue
+            rect = [int(abs(value)) for value in rect]
+            if len(source_size) != 2:
+                source_size = rect[2:]
+            if len(offset) != 2:
+                offset = [0, 0]
+
+            # 子資源 id：與 Creator 匯入時相同（frame 名稱去掉副檔名），同一個合圖內碰撞時重算
+            seed = os.path.splitext(frame_name)[0]
+            frame_id = get_sub_asset_id(seed)
+            while frame_id in used_ids:
+                seed += "#"
+                frame_id = get_sub_asset_id(seed)
+            used_ids.add(frame_id)
+
+            frames[frame_name] = {
+                "id": frame_id,
+                "rect": rect,
+                "rotated": rotated,
+                "offset": [int(value) if float(value).is_integer() else value for value in offset],
+                "sourceSize": [int(abs(value)) for value in source_size],
+            }
+        return frames
+
+    def get_plist_info(self, plist_path):
+        """
+        Parse a plist at most once per content version and keep what the converter needs.
+
+        Returns:
+            dict: atlas (bool), texture_filename, embedded_texture (bool); for atlases
+                atlas_texture, atlas_format and frames (see build_atlas_frames()), for
+                particle plists particle_properties (or properties_error)
+
+        Raises:
+            Exception: The read/parse error of an unreadable plist (not cached).
+        """
+        stat = os.stat(plist_path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        info = self.plist_info.lookup(plist_path, signature)
+        if info is not None:
+            return info
+
+        with open(plist_path, "rb") as f:
+            plist_data = plistlib.load(f)
+        if not isinstance(plist_data, dict):
+            raise ValueError("plist root is not a dictionary")
+
+        info = {
+            "atlas": self._is_texture_atlas_data(plist_data),
+            "texture_filename": plist_data.get("textureFileName"),
+            "embedded_texture": "textureImageData" in plist_data,
+        }
+        if info["atlas"]:
+            metadata = plist_data["metadata"]
+            info["atlas_texture"] = metadata.get("realTextureFileName") or metadata.get(
+                "textureFileName"
+            )
+            info["atlas_format"] = int(metadata.get("format", 0))
+            info["frames"] = self.build_atlas_frames(plist_data)
+        else:
+            try:
+                info["particle_properties"] = self.build_particle_properties(plist_data)
+            except Exception as e:
+                info["properties_error"] = str(e)
+        self.plist_info.store(plist_path, signature, info)
+        return info
 
     def get_texture_filename_from_plist(self, plist_path):
         """
@@ -1700,11 +2532,7 @@ class ImageResourceManager:
         Returns texture_filename or None if not found.
         """
         try:
-            with open(plist_path, "rb") as f:
-                plist_data = plistlib.load(f)
-
-            texture_filename = plist_data.get("textureFileName")
-            return texture_filename
+            return self.get_plist_info(plist_path)["texture_filename"]
         except Exception as e:
             print(f"ERROR Error reading plist {plist_path}: {str(e)}")
             return None
@@ -1751,7 +2579,7 @@ class ImageResourceManager:
         self.not_found_files.add(f"Texture: {texture_filename}")
         return None, False
 
-    def generate_particle_meta_file(self, source_particle, dest_path):
+    def generate_particle_meta_file(self, source_particle, dest_path, meta_writer=None):
         """Generate .meta file for a particle system with correct UUID."""
         # Get the particle UUID
         particle_uuid = self.get_particle_uuid(source_particle)
@@ -1773,9 +2601,7 @@ class ImageResourceManager:
         }
 
         # Write .meta file
-        meta_path = Path(str(dest_path) + ".meta")
-        with open(meta_path, "w", encoding="utf-8") as f:
-            json.dump(meta_content, f, indent=2, ensure_ascii=False)
+        write_meta_file(Path(str(dest_path) + ".meta"), meta_content, meta_writer)
 
     def parse_fnt_config(self, fnt_path):
         """Parse .fnt file to extract font configuration."""
@@ -1864,7 +2690,7 @@ class ImageResourceManager:
 
         return None
 
-    def generate_font_meta_file(self, source_font, dest_path):
+    def generate_font_meta_file(self, source_font, dest_path, meta_writer=None):
         """Generate .meta file for a font file with correct UUID."""
         # Get the font UUID
         font_uuid = self.get_font_uuid(source_font)
@@ -1899,23 +2725,11 @@ class ImageResourceManager:
                 meta_content["userData"]["textureUuid"] = base_uuid
 
         # Write .meta file
-        meta_path = Path(str(dest_path) + ".meta")
-        with open(meta_path, "w", encoding="utf-8") as f:
-            json.dump(meta_content, f, indent=2, ensure_ascii=False)
-
-    def validate_image_references(self, prefab_objects):
-        """Validate that all image references in prefab are correct."""
-        print(f"\nDEBUG Validating image references...")
-        print("=" * 50)
-
-        validation_results = {
-            "total_references": 0,
-            "valid_references": 0,
-            "invalid_references": 0,
-            "missing_images": [],
-            "valid_images": [],
-        }
+        write_meta_file(Path(str(dest_path) + ".meta"), meta_content, meta_writer)
 
+    @staticmethod
+    def collect_uuid_references(prefab_objects):
+        """Return every __uuid__ referenced by the prefab (or animation clip) objects, in order."""
         # Extract all UUID references from prefab objects
         def extract_uuids(obj):
             uuids = []
@@ -1930,20 +2744,55 @@ class ImageResourceManager:
                     uuids.extend(extract_uuids(item))
             return uuids
 
-        # Get all UUIDs from prefab
-        all_uuids = extract_uuids(prefab_objects)
-        sprite_frame_uuids = [uuid for uuid in all_uuids if uuid.endswith("@f9941")]
+        return extract_uuids(prefab_objects)
+
+    @staticmethod
+    def collect_sprite_frame_uuids(uuid_references):
+        """Keep the SpriteFrame UUIDs of collect_uuid_references()."""
+        return [uuid for uuid in uuid_references if uuid.endswith("@f9941")]
+
+    def get_image_path_by_uuid(self, sprite_frame_uuid):
+        """Return the image_cache key whose sprite frame UUID is sprite_frame_uuid (first one wins)."""
+        if (
+            self._image_uuid_index_source is not self.image_cache
+            or self._image_uuid_index_size != len(self.image_cache)
+        ):
+            image_uuid_index = {}
+            for image_path, cached_uuid in self.image_cache.items():
+                image_uuid_index.setdefault(cached_uuid, image_path)
+            self._image_uuid_index = image_uuid_index
+            self._image_uuid_index_source = self.image_cache
+            self._image_uuid_index_size = len(self.image_cache)
+        return self._image_uuid_index.get(sprite_frame_uuid)
+
+    def validate_image_references(self, prefab_objects=None, sprite_frame_uuids=None):
+        """
+        Validate that all image references in prefab are correct.
+
+        Pass either the prefab objects or the SpriteFrame UUIDs already collected from them.
+        """
+        print("\nDEBUG Validating image references...")
+        print("=" * 50)
+
+        validation_results = {
+            "total_references": 0,
+            "valid_references": 0,
+            "invalid_references": 0,
+            "missing_images": [],
+            "valid_images": [],
+        }
+
+        if sprite_frame_uuids is None:
+            sprite_frame_uuids = self.collect_sprite_frame_uuids(
+                self.collect_uuid_references(prefab_objects)
+            )
 
         validation_results["total_references"] = len(sprite_frame_uuids)
 
         # Check each UUID
         for uuid_ref in sprite_frame_uuids:
             # Find corresponding image using normalized path
-            normalized_path = None
-            for image_path, cached_uuid in self.image_cache.items():
-                if cached_uuid == uuid_ref:
-                    normalized_path = image_path
-                    break
+            normalized_path = self.get_image_path_by_uuid(uuid_ref)
 
             if normalized_path:
                 # 現在 path_mapping 的鍵與 image_cache 的鍵一致，可以直接查找
@@ -1951,11 +2800,9 @@ class ImageResourceManager:
                 
                 # 如果直接查找失敗，嘗試備用匹配
                 if not actual_file_path:
-                    normalized_filename = Path(normalized_path).name
-                    for mapped_path, actual_path in self.path_mapping.items():
-                        if Path(mapped_path).name == normalized_filename:
-                            actual_file_path = actual_path
-                            break
+                    filename_matches = self.get_filename_matches(Path(normalized_path).name)
+                    if filename_matches:
+                        actual_file_path = filename_matches[0][1]
                 
                 if actual_file_path:
                     validation_results["valid_references"] += 1
@@ -2046,8 +2893,14 @@ class ImageResourceManager:
         )
         print("=" * 50)
 
-    def save_resources_to_json(self, output_path=OUTPUT_RESOURCES_JSON):
-        """Save resource UUID mappings to a JSON file for future reuse."""
+    def save_resources_to_json(self, output_path=None):
+        """Save resource UUID mappings to a JSON file (or SQLite resource store) for future reuse.
+
+        A store (.db) receives the entries already filtered and normalized the way
+        load_resources_from_json() would, and only the entries that changed are written.
+        """
+        if output_path is None:
+            output_path = get_resource_cache_path(OUTPUT_RESOURCES_JSON, for_save=True)
         try:
             # 只保存必要的UUID映射資訊
             resources_data = {
@@ -2057,11 +2910,32 @@ class ImageResourceManager:
                 "particle_cache": self.particle_cache,  # 路徑 -> UUID 映射
                 "font_cache": self.font_cache,  # 路徑 -> UUID 映射
                 "csd_cache": self.csd_cache,  # 路徑 -> UUID 映射
+                "atlas_cache": self.atlas_cache,  # 合圖 plist 路徑 -> SpriteAtlas UUID 映射
                 "path_mapping": self.path_mapping,  # 路徑映射，用於查找
             }
 
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(resources_data, f, indent=2, ensure_ascii=False)
+            if is_resource_store(output_path):
+                for section in ("image_cache", "particle_cache", "font_cache", "csd_cache", "atlas_cache"):
+                    resources_data[section] = {
+                        path: uuid_str
+                        for path, uuid_str in resources_data[section].items()
+                        if self._is_input_path(path)
+                    }
+                resources_data["path_mapping"] = self._prepare_path_mapping(
+                    {
+                        key: value
+                        for key, value in self.path_mapping.items()
+                        if self._is_input_path(key) and self._is_input_path(value)
+                    }
+                )
+                with ResourceStore(output_path) as store:
+                    written_count, deleted_count = store.save(resources_data, prepared=1)
+                print(
+                    f"Save Resource store updated: {written_count} entries written, {deleted_count} removed"
+                )
+            else:
+                with open(output_path, "w", encoding="utf-8") as f:
+                    json.dump(resources_data, f, indent=2, ensure_ascii=False)
 
             total_resources = (
                 len(self.image_cache) + len(self.particle_cache) + len(self.font_cache)
@@ -2076,14 +2950,21 @@ class ImageResourceManager:
             print(f"ERROR Failed to save resources to {output_path}: {str(e)}")
 
     def load_resources_from_json(self, input_path="resources.json"):
-        """Load resource UUID mappings from a JSON file."""
+        """Load resource UUID mappings from a JSON file (or SQLite resource store)."""
         try:
             if not Path(input_path).exists():
                 print(f"WARNING  Resources file not found: {input_path}")
                 return False
 
-            with open(input_path, "r", encoding="utf-8") as f:
-                resources_data = json.load(f)
+            prepared = False
+            if is_resource_store(input_path):
+                with ResourceStore(input_path) as store:
+                    resources_data = store.load()
+                    # 由 save_resources_to_json 寫入的 store 已過濾並標準化，不必重做
+                    prepared = store.get_meta("prepared") == "1"
+            else:
+                with open(input_path, "r", encoding="utf-8") as f:
+                    resources_data = json.load(f)
 
             # Validate version compatibility
             version = resources_data.get("version", "1.0")
@@ -2092,41 +2973,44 @@ class ImageResourceManager:
                     f"WARNING  Resources file version {version} may not be compatible"
                 )
 
-            # Load image cache and filter to only include input directory entries
-            raw_image_cache = resources_data.get("image_cache", {})
-            self.image_cache = self._filter_input_paths(raw_image_cache)
-            
-            # Load other caches and filter to only include input directory entries
-            raw_particle_cache = resources_data.get("particle_cache", {})
-            self.particle_cache = self._filter_input_paths(raw_particle_cache)
-            
-            raw_font_cache = resources_data.get("font_cache", {})
-            self.font_cache = self._filter_input_paths(raw_font_cache)
-            
-            raw_csd_cache = resources_data.get("csd_cache", {})
-            self.csd_cache = self._filter_input_paths(raw_csd_cache)
-            # Load path mapping and filter to only include input directory entries
-            raw_path_mapping = resources_data.get("path_mapping", {})
-            filtered_path_mapping = self._filter_input_paths_mapping(raw_path_mapping)
-            
-            # 確保 path_mapping 中的路徑使用正確的分隔符，鍵和值都使用標準化路徑
-            normalized_path_mapping = {}
-            for key, value in filtered_path_mapping.items():
-                normalized_key = key.replace("\\", "/")
-                # 對值也進行標準化處理，與 create_path_mapping_part 邏輯一致
-                normalized_value = self.normalize_path_for_uuid_key(value) or value.replace("\\", "/")
-                normalized_path_mapping[normalized_key] = normalized_value
-            self.path_mapping = normalized_path_mapping
+            if prepared:
+                self.image_cache = resources_data["image_cache"]
+                self.particle_cache = resources_data["particle_cache"]
+                self.font_cache = resources_data["font_cache"]
+                self.csd_cache = resources_data["csd_cache"]
+                self.atlas_cache = resources_data["atlas_cache"]
+                self.path_mapping = resources_data["path_mapping"]
+            else:
+                # Load image cache and filter to only include input directory entries
+                raw_image_cache = resources_data.get("image_cache", {})
+                self.image_cache = self._filter_input_paths(raw_image_cache)
+
+                # Load other caches and filter to only include input directory entries
+                raw_particle_cache = resources_data.get("particle_cache", {})
+                self.particle_cache = self._filter_input_paths(raw_particle_cache)
+
+                raw_font_cache = resources_data.get("font_cache", {})
+                self.font_cache = self._filter_input_paths(raw_font_cache)
+
+                raw_csd_cache = resources_data.get("csd_cache", {})
+                self.csd_cache = self._filter_input_paths(raw_csd_cache)
+
+                raw_atlas_cache = resources_data.get("atlas_cache", {})
+                self.atlas_cache = self._filter_input_paths(raw_atlas_cache)
+                # Load path mapping and filter to only include input directory entries
+                raw_path_mapping = resources_data.get("path_mapping", {})
+                filtered_path_mapping = self._filter_input_paths_mapping(raw_path_mapping)
+                self.path_mapping = self._prepare_path_mapping(filtered_path_mapping)
 
             # 將所有載入的UUID註冊到UUID管理器中，避免重複
-            for uuid_str in self.image_cache.values():
-                self.uuid_manager.register_existing_uuid(uuid_str)
-            for uuid_str in self.particle_cache.values():
-                self.uuid_manager.register_existing_uuid(uuid_str)
-            for uuid_str in self.font_cache.values():
-                self.uuid_manager.register_existing_uuid(uuid_str)
-            for uuid_str in self.csd_cache.values():
-                self.uuid_manager.register_existing_uuid(uuid_str)
+            for cache in (
+                self.image_cache,
+                self.particle_cache,
+                self.font_cache,
+                self.csd_cache,
+                self.atlas_cache,
+            ):
+                self.uuid_manager.register_existing_uuids(cache.values())
 
             total_resources = (
                 len(self.image_cache) + len(self.particle_cache) + len(self.font_cache) + len(self.csd_cache)
@@ -2138,6 +3022,7 @@ class ImageResourceManager:
             print(f"  [EMOJI] Particles: {len(self.particle_cache)}")
             print(f"  [EMOJI] Fonts: {len(self.font_cache)}")
             print(f"  CSD CSDs: {len(self.csd_cache)}")
+            print(f"  Texture Atlases: {len(self.atlas_cache)}")
             print(f"  ID Registered UUIDs: {uuid_stats['total_uuids']}")
 
             return True
@@ -2146,6 +3031,16 @@ class ImageResourceManager:
             print(f"ERROR Failed to load resources from {input_path}: {str(e)}")
             return False
 
+    def _prepare_path_mapping(self, mapping_dict):
+        """確保 path_mapping 中的路徑使用正確的分隔符，鍵和值都使用標準化路徑"""
+        normalized_path_mapping = {}
+        for key, value in mapping_dict.items():
+            normalized_key = key.replace("\\", "/")
+            # 對值也進行標準化處理，與 create_path_mapping_part 邏輯一致
+            normalized_value = self.normalize_path_for_uuid_key(value) or value.replace("\\", "/")
+            normalized_path_mapping[normalized_key] = normalized_value
+        return normalized_path_mapping
+
     def save_not_found_list(self, output_path="NotFoundList.txt"):
         """Save list of not found files to a text file."""
         try:
@@ -2187,82 +3082,1484 @@ class ImageResourceManager:
             print(f"   [EMOJI] Missing plists: {plist_count}")
             print(f"   Color Missing textures: {texture_count}")
 
-        except Exception as e:
-            print(f"ERROR Failed to save NotFoundList to {output_path}: {str(e)}")
+        except Exception as e:
+            print(f"ERROR Failed to save NotFoundList to {output_path}: {str(e)}")
+
+    def save_uuid_cache_to_json(self):
+        """Save UUID cache to JSON file after all operations are complete."""
+        try:
+            # Check if there are any new UUIDs to save
+            total_cached = (
+                len(self.image_cache) + len(self.particle_cache) + len(self.font_cache) + len(self.csd_cache)
+            )
+            if total_cached == 0:
+                print("Font No UUIDs to save")
+                return
+
+            # Save the UUID mappings
+            if DO_OUTPUT_RESOURCES_JSON:
+                self.save_resources_to_json()
+                print(
+                    f"Save UUID cache saved after processing: {total_cached} resources"
+                )
+            else:
+                print(
+                    f"Save UUID cache not saved after processing: {total_cached} resources"
+                )
+
+        except Exception as e:
+            print(f"ERROR Failed to save UUID cache: {str(e)}")
+
+    def get_state_marker(self):
+        """
+        Record the current cache state so additions made afterwards can be collected.
+
+        The used/not-found sets are swapped for empty ones until collect_state_changes(),
+        so the collected sets hold everything the next conversion touched, not only new items.
+        """
+        marker = {
+            "image_cache": len(self.image_cache),
+            "particle_cache": len(self.particle_cache),
+            "font_cache": len(self.font_cache),
+            "csd_cache": len(self.csd_cache),
+            "atlas_cache": len(self.atlas_cache),
+            "trim_info_cache": len(self.trim_info_cache),
+            "derived_uuids": len(self.uuid_manager.derived_uuids),
+            "scale9_info_cache": {
+                path: len(history) for path, history in self.scale9_info_cache.items()
+            },
+        }
+        for set_name in self.TRACKED_SETS:
+            marker[set_name] = getattr(self, set_name)
+            setattr(self, set_name, set())
+        return marker
+
+    def collect_state_changes(self, marker):
+        """Collect everything added since get_state_marker(), in insertion order (restores the swapped sets)."""
+        changes = {}
+        for cache_name in [
+            "image_cache",
+            "particle_cache",
+            "font_cache",
+            "csd_cache",
+            "atlas_cache",
+            "trim_info_cache",
+        ]:
+            cache = getattr(self, cache_name)
+            changes[cache_name] = list(
+                itertools.islice(cache.items(), marker[cache_name], None)
+            )
+        changes["derived_uuids"] = list(
+            itertools.islice(
+                self.uuid_manager.derived_uuids.items(), marker["derived_uuids"], None
+            )
+        )
+        changes["scale9_info_cache"] = [
+            (path, history[marker["scale9_info_cache"].get(path, 0):])
+            for path, history in self.scale9_info_cache.items()
+            if len(history) > marker["scale9_info_cache"].get(path, 0)
+        ]
+        for set_name in self.TRACKED_SETS:
+            changes[set_name] = getattr(self, set_name)
+            setattr(self, set_name, marker[set_name] | changes[set_name])
+        return changes
+
+    def apply_state_changes(self, changes):
+        """
+        Merge changes collected by collect_state_changes() in another process.
+
+        Returns:
+            dict: changes with only the cache entries that were new here. A worker also
+            reports entries another worker added first; merging results in input order
+            and keeping only the new entries attributes each one to the same CSD as a
+            serial run.
+        """
+        applied = dict(changes)
+        for cache_name in ["image_cache", "particle_cache", "font_cache", "csd_cache", "atlas_cache"]:
+            cache = getattr(self, cache_name)
+            applied[cache_name] = []
+            for path, uuid_str in changes[cache_name]:
+                if path not in cache:
+                    cache[path] = uuid_str
+                    applied[cache_name].append((path, uuid_str))
+                self.uuid_manager.register_existing_uuid(uuid_str)
+        applied["trim_info_cache"] = []
+        for path, trim_info in changes["trim_info_cache"]:
+            if path not in self.trim_info_cache:
+                self.trim_info_cache[path] = trim_info
+                applied["trim_info_cache"].append((path, trim_info))
+        applied["derived_uuids"] = []
+        for key, uuid_str in changes["derived_uuids"]:
+            if key not in self.uuid_manager.derived_uuids:
+                applied["derived_uuids"].append((key, uuid_str))
+            self.uuid_manager.register_derived_uuid(key, uuid_str)
+        for path, history in changes["scale9_info_cache"]:
+            self.scale9_info_cache.setdefault(path, []).extend(history)
+        for set_name in self.TRACKED_SETS:
+            getattr(self, set_name).update(changes[set_name])
+        return applied
+
+    def snapshot_state(self):
+        """
+        Copy the caches and sets a batch mutates, for restore_state() before the next --watch batch.
+
+        The persistent plist/image analysis caches, the interned path keys and the lookup
+        indexes (underscore attributes, rebuilt on demand) are shared rather than copied;
+        of the UUID manager only the used/derived UUIDs are copied.
+        """
+        state = {
+            name: value
+            for name, value in vars(self).items()
+            if not name.startswith("_") and name not in self.SHARED_STATE
+        }
+        state["used_uuids"] = self.uuid_manager.used_uuids
+        state["derived_uuids"] = self.uuid_manager.derived_uuids
+        return self._copy_state(state)
+
+    def restore_state(self, snapshot):
+        """Reset the state to a snapshot_state() result; the snapshot itself stays reusable."""
+        state = self._copy_state(snapshot)
+        self.uuid_manager.used_uuids = state.pop("used_uuids")
+        self.uuid_manager.derived_uuids = state.pop("derived_uuids")
+        for name, value in state.items():
+            setattr(self, name, value)
+        # path_mapping/image_cache are new objects, so the lookup indexes and memos rebuild
+        self._filename_index_source = None
+        self._image_uuid_index_source = None
+
+    @staticmethod
+    def _copy_state(state):
+        copied = {
+            name: value.copy() if isinstance(value, (dict, set, list)) else value
+            for name, value in state.items()
+        }
+        # scale9 history lists are extended in place
+        copied["scale9_info_cache"] = {
+            path: list(history) for path, history in state["scale9_info_cache"].items()
+        }
+        return copied
+
+
+class FileIdManager:
+    """管理 fileId 的分配，確保同一個 prefab 內的 fileId 唯一且有序。"""
+
+    def __init__(self):
+        self.file_ids = []
+        self.current_index = 0
+        self.load_file_id_pool()
+
+    def load_file_id_pool(self, pool_path="file_id_pool.json"):
+        """從配置文件載入 fileId 池。"""
+        try:
+            with open(pool_path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+            self.file_ids = config.get("file_ids", [])
+            print(f"[EMOJI] 載入了 {len(self.file_ids)} 個 fileId")
+        except FileNotFoundError:
+            print(f"WARNING  fileId 池文件不存在: {pool_path}，將使用備用生成方法")
+            self.file_ids = []
+        except Exception as e:
+            print(f"ERROR 載入 fileId 池時發生錯誤: {str(e)}，將使用備用生成方法")
+            self.file_ids = []
+
+    def get_next_file_id(self):
+        """獲取下一個 fileId。"""
+        if self.current_index < len(self.file_ids):
+            file_id = self.file_ids[self.current_index]
+            self.current_index += 1
+            return file_id
+        else:
+            # 如果池用完了，生成新的 ID（備用方案）
+            print(f"WARNING  fileId 池已用完，使用備用生成方法")
+            chars = string.ascii_letters + string.digits
+            return "".join(random.choice(chars) for _ in range(18))
+
+    def reset_for_new_prefab(self):
+        """為新的 prefab 重置 fileId 計數器。"""
+        self.current_index = 0
+        print(f"Processing 為新 prefab 重置 fileId 計數器")
+
+    def get_usage_stats(self):
+        """獲取 fileId 使用統計。"""
+        return {
+            "total_available": len(self.file_ids),
+            "used_count": self.current_index,
+            "remaining": max(0, len(self.file_ids) - self.current_index),
+        }
+
+
+class CSDDocumentCache:
+    """
+    Loads every CSD once per batch.
+
+    The file is read, sanitized/enhanced in memory with CSDReader and parsed with
+    xmltodict a single time; the Scale9 pre-scan and prefab generation both use
+    the cached document instead of re-reading the file.
+    """
+
+    def __init__(self, csd_reader=None, enhanced_mode=True):
+        self.csd_reader = csd_reader or CSDReader()
+        self.enhanced_mode = enhanced_mode
+        self.documents = {}  # CSD path -> parsed CSD dict
+
+    def get_document(self, csd_path):
+        """Return the parsed (sanitized and enhanced) CSD dict, loading it on first use."""
+        cache_key = str(Path(csd_path))
+        if cache_key in self.documents:
+            return self.documents[cache_key]
+
+        content = self.csd_reader.read_csd_file(str(csd_path))
+        if content is None:
+            raise ValueError(f"Could not read CSD file: {csd_path}")
+
+        try:
+            content = self.csd_reader.process_content(
+                content, str(csd_path), enhanced_mode=self.enhanced_mode
+            )
+        except Exception as e:
+            # If enhancement fails, use the original content
+            print(f"WARNING  Enhancement failed, using original: {Path(csd_path).name} ({str(e)})")
+
+        csd_dict = xmltodict.parse(content)
+        self.documents[cache_key] = csd_dict
+        return csd_dict
+
+    def release(self, csd_path):
+        """Drop a cached document that is no longer needed."""
+        self.documents.pop(str(Path(csd_path)), None)
+
+
+class PrefabDependencyGraph:
+    """
+    Parent -> child prefab graph built from the ProjectNodeObjectData references of every CSD.
+
+    Children are converted before their parents, so a parent always picks up the child's
+    own prefab UUID instead of a hash of the reference path. CSDs on the same level never
+    reference each other and can be converted in parallel. Reference cycles are reported
+    and their members converted together, after everything they depend on.
+    """
+
+    def __init__(self, csd_files):
+        self.csd_files = [Path(csd_file) for csd_file in csd_files]
+        self.input_order = {csd_file: i for i, csd_file in enumerate(self.csd_files)}
+        self.children = {csd_file: [] for csd_file in self.csd_files}  # parent -> referenced CSDs
+        self.parents = {csd_file: [] for csd_file in self.csd_files}  # child -> referencing CSDs
+        self.cycles = []  # Lists of CSD files that reference each other
+        self.component_of = {}  # CSD file -> first member of its strongly connected component
+        self.component_members = {}  # First member -> all members of the component
+        self.levels = {}  # CSD file -> conversion level (0 = no nested prefabs)
+
+    @staticmethod
+    def collect_csd_references(node_dict, references):
+        """Recursively collect FileData/@Path of every nested prefab (ProjectNodeObjectData) node."""
+        if not isinstance(node_dict, dict):
+            return
+
+        if "ProjectNodeObjectData" in node_dict.get("@ctype", ""):
+            file_data = node_dict.get("FileData")
+            if isinstance(file_data, dict):
+                file_path = file_data.get("@Path", "")
+                if file_path.endswith(".csd") and not file_path.startswith("Default/"):
+                    references.append(file_path)
+
+        if "Children" in node_dict and node_dict["Children"]:
+            children = node_dict["Children"].get("AbstractNodeData", [])
+            if not isinstance(children, list):
+                children = [children]
+
+            for child in children:
+                PrefabDependencyGraph.collect_csd_references(child, references)
+
+    def build(self, csd_documents, image_manager, input_path):
+        """
+        Scan every CSD for nested prefab references and order the graph.
+
+        References are matched with the same normalized key get_csd_uuid() uses, falling
+        back to a unique file name match; references outside the batch are ignored.
+        """
+        csd_by_key = {}
+        csd_by_name = {}
+        for csd_file in self.csd_files:
+            relative_path = csd_file.relative_to(input_path).as_posix()
+            csd_by_key.setdefault(image_manager.normalize_path_for_uuid_key(relative_path), csd_file)
+            csd_by_name.setdefault(csd_file.name, []).append(csd_file)
+
+        for csd_file in self.csd_files:
+            try:
+                csd_dict = csd_documents.get_document(csd_file)
+                root_node = csd_dict["GameFile"]["Content"]["Content"]["ObjectData"]
+            except Exception:
+                continue  # Unreadable/invalid CSDs are reported by the conversion itself
+
+            references = []
+            self.collect_csd_references(root_node, references)
+            for reference in references:
+                reference = reference.replace("\\", "/")
+                child = csd_by_key.get(image_manager.normalize_path_for_uuid_key(reference))
+                if child is None:
+                    name_matches = csd_by_name.get(Path(reference).name, [])
+                    child = name_matches[0] if len(name_matches) == 1 else None
+                if child is not None and child not in self.children[csd_file]:
+                    self.children[csd_file].append(child)
+                    self.parents[child].append(csd_file)
+
+        self._find_cycles()
+        self._assign_levels()
+
+    def _find_cycles(self):
+        """Tarjan's strongly connected components; components with a loop are cycles."""
+        index_of = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+
+        def strong_connect(csd_file):
+            index_of[csd_file] = lowlink[csd_file] = len(index_of)
+            stack.append(csd_file)
+            on_stack.add(csd_file)
+
+            for child in self.children[csd_file]:
+                if child not in index_of:
+                    strong_connect(child)
+                    lowlink[csd_file] = min(lowlink[csd_file], lowlink[child])
+                elif child in on_stack:
+                    lowlink[csd_file] = min(lowlink[csd_file], index_of[child])
+
+            if lowlink[csd_file] == index_of[csd_file]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == csd_file:
+                        break
+                component.sort(key=self.input_order.get)
+                self.component_members[component[0]] = component
+                for member in component:
+                    self.component_of[member] = component[0]
+                if len(component) > 1 or csd_file in self.children[csd_file]:
+                    self.cycles.append(component)
+
+        for csd_file in self.csd_files:
+            if csd_file not in index_of:
+                strong_connect(csd_file)
+
+        self.cycles.sort(key=lambda component: self.input_order[component[0]])
+
+    def _assign_levels(self):
+        """Level = 1 + highest level among referenced CSDs outside the node's own cycle."""
+        component_levels = {}
+
+        def component_level(component):
+            if component not in component_levels:
+                component_levels[component] = 0  # Cycle members do not wait for each other
+                level = 0
+                for member in self.component_members[component]:
+                    for child in self.children[member]:
+                        child_component = self.component_of[child]
+                        if child_component != component:
+                            level = max(level, component_level(child_component) + 1)
+                component_levels[component] = level
+            return component_levels[component]
+
+        for csd_file in self.csd_files:
+            self.levels[csd_file] = component_level(self.component_of[csd_file])
+
+    def get_conversion_order(self):
+        """CSD files sorted children-first (by level, then input order)."""
+        return sorted(self.csd_files, key=lambda csd_file: (self.levels[csd_file], self.input_order[csd_file]))
+
+    def get_dependents(self, csd_files):
+        """Every CSD that (transitively) nests one of csd_files."""
+        dependents = set()
+        pending = list(csd_files)
+        while pending:
+            for parent in self.parents.get(Path(pending.pop()), []):
+                if parent not in dependents:
+                    dependents.add(parent)
+                    pending.append(parent)
+        return dependents
+
+    def print_report(self, input_path):
+        reference_count = sum(len(children) for children in self.children.values())
+        level_count = max(self.levels.values(), default=-1) + 1
+        print(
+            f"Success Found {reference_count} nested prefab references across {level_count} conversion levels"
+        )
+        for component in self.cycles:
+            cycle_members = ", ".join(
+                csd_file.relative_to(input_path).as_posix() for csd_file in component
+            )
+            print(f"WARNING Cyclic nested prefab references between: {cycle_members}")
+
+
+class BuildManifest:
+    """
+    增量建置紀錄 (output/build_manifest.json)。
+
+    Stores the input content hashes, the tool fingerprint and the UUID cache state of
+    the last batch. An incremental batch reuses every prefab, animation and resource
+    whose inputs and dependencies still match, and re-emits only the affected files.
+    """
+
+    MANIFEST_VERSION = 1
+    TOOL_FILES = ["doit.py", "CSDReader.py", "easing_map.py", "resource_store.py", "resource_scanner.py"]
+    CONFIG_FILES = ["material_config.json", "file_id_pool.json"]
+
+    def __init__(self, output_folder, input_folder=INPUT_FOLDER, manifest_name=BUILD_MANIFEST_JSON):
+        self.output_path = Path(output_folder)
+        self.input_root = os.path.join(os.path.abspath(input_folder), "")
+        self.manifest_path = self.output_path / manifest_name
+        self.state = {}  # tool / uuid_cache / inventory fingerprints of this run
+        self.previous_csds = {}  # CSD relative path -> record from the last batch
+        self.previous_resources = {}  # Output relative path -> record from the last batch
+        self.csd_records = {}
+        self.resource_records = {}
+        self.previous_hashes = {}  # hash_key() -> [size, mtime_ns, md5] from the last batch
+        self.file_hashes = {}
+        self.scale9_info = {}  # Scale9 history right after the batch pre-scan
+        self.resource_index = None  # Normalized UUID key -> scanned input file
+        self.csd_reusable = False  # Previous CSD records are valid for this run
+        self.resources_reusable = False  # Previous resource records are valid for this run
+
+    @staticmethod
+    def fingerprint(data):
+        """Stable md5 of any JSON-serializable value."""
+        return hashlib.md5(
+            json.dumps(data, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def hash_key(self, file_path):
+        """
+        file_hashes key of a file: relative to the input folder for inputs, absolute otherwise.
+
+        Input keys do not depend on where the checkout lives or on the working directory.
+        """
+        absolute_path = os.path.abspath(file_path)
+        if absolute_path.startswith(self.input_root):
+            return absolute_path[len(self.input_root) :].replace(os.sep, "/")
+        return absolute_path
+
+    def hash_file(self, file_path):
+        """Content md5 of a file, reusing the last batch's hash while size and mtime are unchanged."""
+        path_key = self.hash_key(file_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        cached = self.file_hashes.get(path_key) or self.previous_hashes.get(path_key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            digest = cached[2]
+        else:
+            with open(file_path, "rb") as f:
+                digest = hashlib.md5(f.read()).hexdigest()
+        self.file_hashes[path_key] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def get_tool_fingerprint(self):
+        """Fingerprint of the converter itself plus the configs next to it."""
+        if getattr(sys, "frozen", False):
+            tool_dir = Path(sys.executable).resolve().parent
+            tool_files = [sys.executable]
+        else:
+            tool_dir = Path(__file__).resolve().parent
+            tool_files = [str(tool_dir / name) for name in self.TOOL_FILES]
+        config_files = [str(tool_dir / name) for name in self.CONFIG_FILES]
+        return self.fingerprint([self.hash_file(path) for path in tool_files + config_files])
+
+    def snapshot_scale9_info(self, image_manager):
+        """
+        Keep the Scale9 history collected by the pre-scan.
+
+        Conversion only re-appends settings the pre-scan already found (in the same
+        order), so this snapshot decides every sprite type and image .meta.
+        """
+        self.scale9_info = deepcopy(image_manager.scale9_info_cache)
+
+    def resolve_resource_file(self, resource_path, image_manager):
+        """Map a resource reference (e.g. a cached path_mapping target) to the scanned input file."""
+        if os.path.exists(resource_path):
+            return resource_path
+        if self.resource_index is None:
+            self.resource_index = {}
+            available_files = (
+                image_manager.available_images
+                | image_manager.available_particles
+                | image_manager.available_fonts
+            )
+            for available_file in sorted(available_files):
+                self.resource_index.setdefault(
+                    image_manager.normalize_path_for_uuid_key(available_file), available_file
+                )
+        return self.resource_index.get(
+            image_manager.normalize_path_for_uuid_key(resource_path), resource_path
+        )
+
+    def get_dependency_signature(self, resource_path, image_manager):
+        """Content hash of a resource plus the Scale9 settings collected for it."""
+        digest = self.hash_file(self.resolve_resource_file(resource_path, image_manager))
+        scale9_key = image_manager.normalize_path_for_uuid_key(resource_path) or resource_path
+        scale9_history = self.scale9_info.get(scale9_key)
+        if scale9_history:
+            digest = f"{digest}#{self.fingerprint(scale9_history)}"
+        return digest
+
+    def get_atlas_signature(self, atlas_file, image_manager):
+        """Dependency signature of a texture atlas: the plist content plus its frames' Scale9 settings."""
+        digest = self.get_dependency_signature(atlas_file, image_manager)
+        frame_scale9 = {}
+        for frame_name in image_manager.get_plist_info(atlas_file)["frames"]:
+            scale9_key = image_manager.normalize_path_for_uuid_key(
+                image_manager.get_atlas_frame_key(atlas_file, frame_name)
+            )
+            if scale9_key in self.scale9_info:
+                frame_scale9[frame_name] = self.scale9_info[scale9_key]
+        if frame_scale9:
+            digest = f"{digest}#{self.fingerprint(frame_scale9)}"
+        return digest
+
+    def output_key(self, output_file):
+        """Manifest key for a file inside the output folder."""
+        return Path(output_file).relative_to(self.output_path).as_posix()
+
+    def load(self, state):
+        """
+        Load the last batch's manifest and decide which of its records can be reused.
+
+        Args:
+            state (dict): "tool", "uuid_cache" and "inventory" fingerprints of this run.
+
+        Returns:
+            bool: True if a previous manifest was loaded.
+        """
+        self.state = state
+        if not self.manifest_path.exists():
+            print("INFO No build manifest found, running a full conversion")
+            return False
+
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest_data = json.load(f)
+        except Exception as e:
+            print(f"WARNING Failed to load build manifest: {str(e)}")
+            return False
+
+        if manifest_data.get("version") != self.MANIFEST_VERSION:
+            print("INFO Build manifest version changed, running a full conversion")
+            return False
+
+        previous_state = manifest_data.get("state", {})
+        self.previous_csds = manifest_data.get("csd", {})
+        self.previous_resources = manifest_data.get("resources", {})
+        self.previous_hashes = manifest_data.get("file_hashes", {})
+
+        # Tool or UUID cache changes invalidate every output
+        self.resources_reusable = all(
+            previous_state.get(key) == state.get(key) for key in ["tool", "uuid_cache"]
+        )
+        # Added/removed input files can change how any CSD resolves its references
+        self.csd_reusable = self.resources_reusable and previous_state.get(
+            "inventory"
+        ) == state.get("inventory")
+
+        if not self.resources_reusable:
+            print("INFO Tool or UUID cache changed, reconverting everything")
+        elif not self.csd_reusable:
+            print("INFO Input file list changed, reconverting all CSD files")
+        else:
+            print(
+                f"Loaded Loaded build manifest: {len(self.previous_csds)} prefabs, {len(self.previous_resources)} resources"
+            )
+        return True
+
+    def get_reusable_csd_record(self, relative_path, csd_file, image_manager):
+        """Return the last record of a CSD if it and all of its dependencies are unchanged."""
+        if not self.csd_reusable:
+            return None
+        record = self.previous_csds.get(relative_path)
+        if not record or record["hash"] != self.hash_file(csd_file):
+            return None
+        for dep_path, signature in record["deps"].items():
+            if self.get_dependency_signature(dep_path, image_manager) != signature:
+                return None
+        if not all((self.output_path / output).exists() for output in record["outputs"]):
+            return None
+        return record
+
+    def record_csd(
+        self, relative_path, csd_file, output_file, generator, changes, prefab_uuid_mapping, image_manager
+    ):
+        """Record a converted (or reused) CSD with everything needed to reuse it next time."""
+        deps = sorted(changes["referenced_files"])
+        outputs = [
+            self.output_key(output_file),
+            self.output_key(f"{output_file}.meta"),
+        ]
+        animation_clips = []
+        for anim_info in generator.animation_clips:
+            anim_file = anim_info.get("file")
+            if anim_file:
+                outputs.extend([anim_file, f"{anim_file}.meta"])
+            animation_clips.append(
+                {
+                    "name": anim_info["name"],
+                    "uuid": anim_info["uuid"],
+                    "source_path": anim_info.get("source_path"),
+                    "file": anim_file,
+                }
+            )
+
+        self.csd_records[relative_path] = {
+            "hash": self.hash_file(csd_file),
+            "deps": {
+                dep_path: self.get_dependency_signature(dep_path, image_manager)
+                for dep_path in deps
+            },
+            "root_name": generator.root_name,
+            "prefab_uuid": generator.prefab_uuid,
+            "current_relative_path": generator.current_relative_path,
+            "animation_clips": animation_clips,
+            "prefab_uuid_mapping": [list(item) for item in prefab_uuid_mapping],
+            "changes": {
+                key: sorted(value) if isinstance(value, set) else value
+                for key, value in changes.items()
+            },
+            "outputs": outputs,
+        }
+
+    def keep_previous_csd(self, relative_path):
+        """Keep the last record (and its outputs) of a CSD that failed this time."""
+        if relative_path in self.previous_csds:
+            record = dict(self.previous_csds[relative_path])
+            record["hash"] = None  # Force a retry on the next batch
+            self.csd_records[relative_path] = record
+
+    def is_resource_up_to_date(self, source_path, dest_path, signature):
+        """True if dest (and its .meta) were produced from the same source content last time."""
+        if not self.resources_reusable:
+            return False
+        record = self.previous_resources.get(self.output_key(dest_path))
+        return (
+            record is not None
+            and record["source"] == str(source_path)
+            and record["signature"] == signature
+            and Path(dest_path).exists()
+            and Path(f"{dest_path}.meta").exists()
+        )
+
+    def get_previous_resource(self, dest_path):
+        return self.previous_resources.get(self.output_key(dest_path))
+
+    def record_resource(self, source_path, dest_path, signature, **extra):
+        """Record a copied resource; extra outputs (e.g. particle textures) go in **extra."""
+        record = {"source": str(source_path), "signature": signature}
+        record.update(extra)
+        self.resource_records[self.output_key(dest_path)] = record
+
+    def update_resource_record(self, dest_path, **extra):
+        record = self.resource_records.get(self.output_key(dest_path))
+        if record is not None:
+            record.update(extra)
+
+    def keep_previous_resource(self, dest_path):
+        """Keep the last record of a resource that failed to copy this time."""
+        output_key = self.output_key(dest_path)
+        if output_key in self.previous_resources:
+            record = dict(self.previous_resources[output_key])
+            record["signature"] = None  # Force a retry on the next batch
+            self.resource_records[output_key] = record
+        else:
+            self.resource_records.pop(output_key, None)
+
+    def _collect_outputs(self, csd_records, resource_records):
+        outputs = set()
+        for record in csd_records.values():
+            outputs.update(record["outputs"])
+        for output_key, record in resource_records.items():
+            outputs.update([output_key, f"{output_key}.meta"])
+            texture = record.get("texture")
+            if texture:
+                outputs.update([texture, f"{texture}.meta"])
+        return outputs
+
+    def remove_stale_outputs(self):
+        """Delete outputs of the last batch that no current CSD or resource produces anymore."""
+        stale_outputs = self._collect_outputs(
+            self.previous_csds, self.previous_resources
+        ) - self._collect_outputs(self.csd_records, self.resource_records)
+
+        removed_count = 0
+        for output_key in sorted(stale_outputs):
+            stale_file = self.output_path / output_key
+            if stale_file.is_file():
+                stale_file.unlink()
+                removed_count += 1
+                print(f"Skip Removed stale output: {output_key}")
+        return removed_count
+
+    def save(self):
+        """Write the manifest for the next incremental batch."""
+        manifest_data = {
+            "version": self.MANIFEST_VERSION,
+            "state": self.state,
+            "csd": self.csd_records,
+            "resources": self.resource_records,
+            "file_hashes": self.file_hashes,
+        }
+        try:
+            self.output_path.mkdir(parents=True, exist_ok=True)
+            with open(self.manifest_path, "w", encoding="utf-8") as f:
+                json.dump(manifest_data, f, indent=2, ensure_ascii=False, sort_keys=True)
+            print(f"Save Build manifest saved to {self.manifest_path}")
+        except Exception as e:
+            print(f"ERROR Failed to save build manifest: {str(e)}")
+
+
+class CachedPrefabResult:
+    """
+    Stands in for a PrefabGenerator when an incremental batch reuses an unchanged prefab.
+
+    Also replaces a freshly generated prefab once STREAM_BATCH_OUTPUT has written its
+    .anim files. Only carries what the later batch passes need; the prefab objects are
+    read back from the output file on each access and never kept in memory.
+    """
+
+    def __init__(self, record, output_file):
+        self.output_file = Path(output_file)
+        self.root_name = record["root_name"]
+        self.prefab_uuid = record["prefab_uuid"]
+        self.current_relative_path = record["current_relative_path"]
+        # data is None: the .anim file from the last batch is kept as-is
+        self.animation_clips = [
+            dict(anim_info, data=None) for anim_info in record["animation_clips"]
+        ]
+
+    @property
+    def objects(self):
+        with open(self.output_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def encode_png(image, **params):
+    """Encode image as a PNG with the smallest zlib settings PIL offers."""
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True, **params)
+    return buffer.getvalue()
+
+
+def quantize_png(image, alpha, colors):
+    """
+    Reduce image to a palette of at most colors entries.
+
+    alpha must not have smooth (1-254) values: fully transparent pixels get their own
+    palette entry marked in tRNS, so the alpha channel survives exactly.
+    """
+    transparent = alpha is not None and alpha.getextrema()[0] == 0
+    paletted = image.convert("RGB").quantize(
+        colors - 1 if transparent else colors,
+        method=Image.Quantize.MEDIANCUT,
+        dither=Image.Dither.NONE,
+    )
+    if not transparent:
+        return paletted, {}
+
+    transparent_index = colors - 1  # quantize() only used the entries below it
+    palette = (paletted.getpalette() + [0] * (3 * colors))[: 3 * colors]
+    palette[3 * transparent_index : 3 * transparent_index + 3] = [0, 0, 0]
+    paletted.putpalette(palette)
+    paletted.paste(transparent_index, mask=alpha.point([255] + [0] * 255))
+    return paletted, {"transparency": transparent_index}
+
+
+def compute_png_optimization(source_path, target_path, quantize_colors):
+    """
+    Recompress one PNG and write the result to target_path if it is smaller.
+
+    Lossless: an alpha channel that is fully opaque is dropped, then the pixels are
+    re-encoded. With quantize_colors, images without smooth alpha are also tried as a
+    palette PNG, and the smaller result wins. Files that are not 8-bit RGB(A)/L(A) PNGs,
+    or that carry a tRNS chunk, are left as they are.
+
+    Module-level so PngOptimizer.optimize_all() can run it on a process pool.
+
+    Returns:
+        dict: before / after bytes and method ("recompressed", "quantized" or "original"),
+        or None if the image cannot be decoded.
+    """
+    try:
+        before = os.path.getsize(source_path)
+        original = {"before": before, "after": before, "method": "original"}
+        with Image.open(source_path) as img:
+            with open(source_path, "rb") as f:
+                header = f.read(25)
+            # IHDR bit depth: PIL reads 16-bit RGB(A) as 8-bit, which would not be lossless
+            if (
+                img.format != "PNG"
+                or img.mode not in ("RGBA", "RGB", "LA", "L")
+                or header[24] != 8
+                or "transparency" in img.info
+            ):
+                return original
+            img.load()
+            params = {}
+            if img.info.get("icc_profile"):
+                params["icc_profile"] = img.info["icc_profile"]
+
+            image = img
+            alpha = None
+            if img.mode in ("RGBA", "LA"):
+                alpha = img.getchannel("A")
+                if alpha.getextrema()[0] == 255:
+                    image = img.convert("RGB" if img.mode == "RGBA" else "L")
+                    alpha = None
+
+            candidates = [("recompressed", encode_png(image, **params))]
+            if quantize_colors and (alpha is None or not any(alpha.histogram()[1:255])):
+                paletted, palette_params = quantize_png(image, alpha, quantize_colors)
+                candidates.append(("quantized", encode_png(paletted, **params, **palette_params)))
+    except Exception:
+        return None
+
+    method, data = min(candidates, key=lambda candidate: len(candidate[1]))
+    if len(data) >= before:
+        return original
+
+    temp_path = f"{target_path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, target_path)
+    return {"before": before, "after": len(data), "method": method}
+
+
+class PngOptimizer:
+    """
+    Optional optimization stage for the PNGs exported to Common/Img.
+
+    Optimized files live in cache_dir under the source's content md5 and the mode, so an
+    unchanged image is only recompressed once; the copier then exports the cached file
+    instead of the source. The index keeps every result's before/after bytes for
+    ImageBudgetReport.txt.
+
+    Args:
+        image_analysis (ImageAnalysisCache): Shared path -> md5 cache.
+        mode (str): "lossless" or "quantize".
+        cache_dir (str): Folder for the optimized files and index.json.
+    """
+
+    MODES = ("off", "lossless", "quantize")
+    VERSION = 1
+
+    def __init__(self, image_analysis, mode, cache_dir=PNG_OPTIMIZE_CACHE_DIR):
+        if mode not in self.MODES[1:]:
+            raise ValueError(f"Unknown PNG optimization '{mode}' (expected one of {', '.join(self.MODES)})")
+        self.image_analysis = image_analysis
+        self.quantize_colors = QUANTIZE_COLORS if mode == "quantize" else 0
+        self.settings = f"q{QUANTIZE_COLORS}" if mode == "quantize" else "lossless"
+        self.cache_dir = Path(cache_dir)
+        self.index_path = self.cache_dir / "index.json"
+        self.entries = {}  # "md5-settings" -> {"before", "after", "method"}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.entries = data.get("entries", {})
+        except Exception as e:
+            print(f"WARNING Failed to load PNG optimization cache {self.index_path}: {str(e)}")
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "entries": self.entries}, f)
+            self.dirty = False
+        except Exception as e:
+            print(f"WARNING Failed to save PNG optimization cache {self.index_path}: {str(e)}")
+
+    @staticmethod
+    def is_candidate(image_path):
+        return str(image_path).lower().endswith(".png")
+
+    def get_key(self, image_path):
+        if not self.is_candidate(image_path):
+            return None
+        digest = self.image_analysis.get_digest(image_path)
+        return f"{digest}-{self.settings}" if digest else None
+
+    def get_cached_file(self, key):
+        return self.cache_dir / f"{key}.png"
+
+    def lookup(self, key):
+        """Cached result for key, unless its optimized file has gone missing."""
+        entry = self.entries.get(key) if key else None
+        if entry is None:
+            return None
+        if entry["method"] != "original" and not self.get_cached_file(key).exists():
+            return None
+        return entry
+
+    def optimize_all(self, image_paths, jobs):
+        """
+        Optimize the PNGs that have no cached result yet, on a process pool when jobs > 1.
+
+        Returns the number of images optimized.
+        """
+        missing = {}  # key -> first path with that content
+        for image_path in image_paths:
+            key = self.get_key(image_path)
+            if key and self.lookup(key) is None:
+                missing.setdefault(key, image_path)
+        if not missing:
+            return 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        sources = [str(image_path) for image_path in missing.values()]
+        targets = [str(self.get_cached_file(key)) for key in missing]
+        colors = [self.quantize_colors] * len(missing)
+        if jobs <= 1 or len(missing) < 2:
+            results = map(compute_png_optimization, sources, targets, colors)
+        else:
+            results = map_in_spawn_pool(
+                compute_png_optimization,
+                list(zip(sources, targets, colors)),
+                jobs,
+                "PNG optimization",
+            )
+        for key, result in zip(missing, results):
+            self.store(key, result)
+        return len(missing)
+
+    def store(self, key, result):
+        if result is not None:
+            self.entries[key] = result
+            self.dirty = True
+
+    def get_export_source(self, image_path):
+        """
+        File to export for image_path and its result (None if it was not optimized).
+
+        Images that did not get smaller are exported from the source itself.
+        """
+        key = self.get_key(image_path)
+        entry = self.lookup(key)
+        if entry is None or entry["method"] == "original":
+            return Path(image_path), entry
+        return self.get_cached_file(key), entry
+
+    def print_report(self, exported_images, images_dir, report_path):
+        """
+        Write the per-folder size budget of the exported images to report_path.
+
+        Args:
+            exported_images (list): (source_image, dest_path) of every image in Common/Img.
+
+        Returns:
+            int: Bytes saved over all images.
+        """
+        folders = {}  # folder relative to images_dir -> [(file name, entry)]
+        for source_image, dest_path in exported_images:
+            _, entry = self.get_export_source(source_image)
+            if entry is None:
+                continue
+            folder = Path(dest_path).parent.relative_to(images_dir).as_posix()
+            folders.setdefault(folder, []).append((Path(dest_path).name, entry))
+
+        def format_budget(before, after):
+            saved = before - after
+            percent = saved * 100 / before if before else 0
+            return f"{before:,} -> {after:,} bytes (-{saved:,}, {percent:.1f}%)"
+
+        total_before = 0
+        total_after = 0
+        lines = []
+        for folder in sorted(folders):
+            files = sorted(folders[folder])
+            before = sum(entry["before"] for _, entry in files)
+            after = sum(entry["after"] for _, entry in files)
+            total_before += before
+            total_after += after
+            lines.append(f"{folder}/ [{len(files)} files]: {format_budget(before, after)}")
+            for file_name, entry in files:
+                lines.append(
+                    f"    {file_name}: {format_budget(entry['before'], entry['after'])} {entry['method']}"
+                )
+            lines.append("")
+
+        try:
+            with open(report_path, "w", encoding="utf-8") as f:
+                f.write(f"PNG optimization: {self.settings}\n")
+                f.write(f"Total: {format_budget(total_before, total_after)}\n\n")
+                f.write("\n".join(lines))
+            print(f"Success Image budget report: {report_path}")
+        except Exception as e:
+            print(f"WARNING Failed to write image budget report {report_path}: {str(e)}")
+        print(f"Image PNG optimization ({self.settings}): {format_budget(total_before, total_after)}")
+        return total_before - total_after
+
+
+class ResourceCopier:
+    """
+    Materializes resource files into the output tree on a thread pool.
+
+    strategy is "copy" (shutil.copy2), "hardlink" (os.link) or "reflink" (copy-on-write
+    clone, Linux FICLONE); links fall back to a plain copy where the filesystem refuses
+    them. A destination that already matches its source by size and mtime, or by content
+    hash, is left untouched. New files are written under a temporary name and moved into
+    place, so an existing hardlink is never written through to the input file.
+    """
+
+    STRATEGIES = ("copy", "hardlink", "reflink")
+    FICLONE = 0x40049409  # ioctl request: share the source extents with the destination
+
+    def __init__(self, strategy=COPY_STRATEGY, jobs=COPY_JOBS):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(
+                f"Unknown copy strategy '{strategy}' (expected one of {', '.join(self.STRATEGIES)})"
+            )
+        self.strategy = strategy
+        self.executor = ThreadPoolExecutor(max_workers=max(1, jobs))
+        self.pending = []  # (source_path, dest_path, future) in submission order
+
+    def submit(self, source_path, dest_path, strategy=None):
+        """Queue one file; strategy overrides the copier's own (e.g. "copy" for files edited in place)."""
+        future = self.executor.submit(
+            self.materialize, Path(source_path), Path(dest_path), strategy or self.strategy
+        )
+        self.pending.append((source_path, dest_path, future))
+
+    def wait(self):
+        """Yield (source_path, dest_path, status, error) for every queued file, in submission order."""
+        pending, self.pending = self.pending, []
+        for source_path, dest_path, future in pending:
+            try:
+                yield source_path, dest_path, future.result(), None
+            except Exception as e:
+                yield source_path, dest_path, None, e
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+    @staticmethod
+    def file_digest(file_path):
+        md5 = hashlib.md5()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                md5.update(chunk)
+        return md5.hexdigest()
+
+    def is_identical(self, source_path, dest_path, strategy):
+        try:
+            dest_stat = os.stat(dest_path)
+        except FileNotFoundError:
+            return False
+        source_stat = os.stat(source_path)
+        if os.path.samestat(source_stat, dest_stat):
+            # A hardlink to the input is only acceptable where links were asked for
+            return strategy == "hardlink"
+        if source_stat.st_size != dest_stat.st_size:
+            return False
+        if source_stat.st_mtime_ns == dest_stat.st_mtime_ns:
+            return True
+        if self.file_digest(source_path) != self.file_digest(dest_path):
+            return False
+        # Same content: align the mtime so the next check stops at the stat
+        os.utime(dest_path, ns=(dest_stat.st_atime_ns, source_stat.st_mtime_ns))
+        return True
+
+    @classmethod
+    def clone_file(cls, source_path, dest_path):
+        """Reflink source to dest; False if the platform or filesystem cannot."""
+        try:
+            import fcntl
+        except ImportError:
+            return False  # Windows
+        with open(source_path, "rb") as src, open(dest_path, "wb") as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), cls.FICLONE, src.fileno())
+            except OSError:
+                return False
+        shutil.copystat(source_path, dest_path)
+        return True
+
+    def materialize(self, source_path, dest_path, strategy):
+        """Bring dest_path up to date; returns "identical", "copied", "linked" or "cloned"."""
+        if self.is_identical(source_path, dest_path, strategy):
+            return "identical"
+
+        temp_path = dest_path.with_name(
+            f"{dest_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            status = None
+            if strategy == "hardlink":
+                try:
+                    os.link(source_path, temp_path)
+                    status = "linked"
+                except OSError:
+                    pass  # Other volume or no link support
+            elif strategy == "reflink" and self.clone_file(source_path, temp_path):
+                status = "cloned"
+            if status is None:
+                shutil.copy2(source_path, temp_path)
+                status = "copied"
+            os.replace(temp_path, dest_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+        return status
+
+
+class AssetReachability:
+    """
+    Decides which resources a batch exports from the UUIDs its output actually references.
+
+    Every __uuid__ in the generated prefabs and animation clips is resolved against the
+    scanned images (sprite frames), particles, fonts and texture atlases. Only those assets
+    (and the textures of exported atlases), plus anything matching the keep-list, are
+    exported; the rest of the available resources is pruned.
+    Nested prefab and material/built-in references are counted but never exported here.
+    """
 
-    def save_uuid_cache_to_json(self):
-        """Save UUID cache to JSON file after all operations are complete."""
+    def __init__(self, image_manager, input_path, keep_list_path=EXPORT_KEEP_LIST):
+        self.image_manager = image_manager
+        self.input_path = Path(input_path)
+        self.keep_patterns = self.load_keep_list(keep_list_path)
+        self.referenced_uuids = set()
+
+    @staticmethod
+    def load_keep_list(keep_list_path):
+        """Read fnmatch patterns (relative to input/, '#' comments allowed); missing file = none."""
         try:
-            # Check if there are any new UUIDs to save
-            total_cached = (
-                len(self.image_cache) + len(self.particle_cache) + len(self.font_cache) + len(self.csd_cache)
-            )
-            if total_cached == 0:
-                print("Font No UUIDs to save")
-                return
+            with open(keep_list_path, "r", encoding="utf-8") as f:
+                lines = [line.split("#", 1)[0].strip() for line in f]
+        except FileNotFoundError:
+            return []
+        patterns = [line.replace("\\", "/") for line in lines if line]
+        print(f"Loaded Loaded {len(patterns)} keep-list patterns from {keep_list_path}")
+        return patterns
 
-            # Save the UUID mappings
-            if DO_OUTPUT_RESOURCES_JSON:
-                self.save_resources_to_json()
-                print(
-                    f"Save UUID cache saved after processing: {total_cached} resources"
-                )
+    def add_references(self, uuid_references):
+        # Sub-asset suffixes (@f9941 sprite frame, @6c48a texture) all point at the same file
+        self.referenced_uuids.update(reference.split("@")[0] for reference in uuid_references)
+
+    def is_kept(self, file_path):
+        if not self.keep_patterns:
+            return False
+        file_path = Path(file_path)
+        if file_path.is_relative_to(self.input_path):
+            relative_path = file_path.relative_to(self.input_path).as_posix()
+        else:
+            relative_path = file_path.name
+        return any(fnmatch.fnmatch(relative_path, pattern) for pattern in self.keep_patterns)
+
+    def select(self, available_files, uuid_cache):
+        """Split available_files into (reachable, kept, pruned) sets."""
+        reachable, kept, pruned = set(), set(), set()
+        for file_path in available_files:
+            cached_uuid = uuid_cache.get(
+                self.image_manager.normalize_path_for_uuid_key(file_path)
+            )
+            if cached_uuid and cached_uuid.split("@")[0] in self.referenced_uuids:
+                reachable.add(file_path)
+            elif self.is_kept(file_path):
+                kept.add(file_path)
             else:
-                print(
-                    f"Save UUID cache not saved after processing: {total_cached} resources"
-                )
+                pruned.add(file_path)
+        return reachable, kept, pruned
 
-        except Exception as e:
-            print(f"ERROR Failed to save UUID cache: {str(e)}")
+    def plan(self):
+        """
+        Resolve the collected references.
 
+        Returns:
+            dict: category ("images", "particles", "fonts", "atlases") -> (reachable, kept, pruned)
+        """
+        manager = self.image_manager
+        plan = {
+            "images": self.select(manager.available_images, manager.image_cache),
+            "particles": self.select(manager.available_particles, manager.particle_cache),
+            "fonts": self.select(manager.available_fonts, manager.font_cache),
+            "atlases": self.select(manager.available_atlases, manager.atlas_cache),
+        }
 
-class FileIdManager:
-    """管理 fileId 的分配，確保同一個 prefab 內的 fileId 唯一且有序。"""
+        # An exported atlas brings its texture along, even though frames reference the atlas UUID
+        atlas_reachable, atlas_kept, _ = plan["atlases"]
+        atlas_textures = {
+            manager.normalize_path_for_uuid_key(texture_file)
+            for texture_file in map(manager.get_atlas_texture_file, atlas_reachable | atlas_kept)
+            if texture_file
+        }
+        image_reachable, image_kept, image_pruned = plan["images"]
+        for image_path in list(image_kept | image_pruned):
+            if manager.normalize_path_for_uuid_key(image_path) in atlas_textures:
+                image_kept.discard(image_path)
+                image_pruned.discard(image_path)
+                image_reachable.add(image_path)
+        return plan
+
+    def print_report(self, plan, pruned_list_path):
+        """Print the export summary and write every pruned file to pruned_list_path."""
+        manager = self.image_manager
+        resource_uuids = {
+            cached_uuid.split("@")[0]
+            for cache in (
+                manager.image_cache,
+                manager.particle_cache,
+                manager.font_cache,
+                manager.atlas_cache,
+            )
+            for cached_uuid in cache.values()
+        }
+        prefab_uuids = set(manager.csd_cache.values())
+        external_count = len(self.referenced_uuids - resource_uuids - prefab_uuids)
 
-    def __init__(self):
-        self.file_ids = []
-        self.current_index = 0
-        self.load_file_id_pool()
+        print(f"\nDEBUG Reachable export ({len(self.referenced_uuids)} referenced UUIDs)")
+        print("=" * 80)
+        for category, (reachable, kept, pruned) in plan.items():
+            print(
+                f"  {category}: {len(reachable)} reachable, {len(kept)} kept by keep-list, {len(pruned)} pruned"
+            )
+        print(f"  nested prefabs: {len(self.referenced_uuids & prefab_uuids)} referenced")
+        print(f"  materials / built-in assets (not exported): {external_count} referenced")
 
-    def load_file_id_pool(self, pool_path="file_id_pool.json"):
-        """從配置文件載入 fileId 池。"""
+        pruned_files = sorted(
+            f"{category}: {file_path}"
+            for category, (reachable, kept, pruned) in plan.items()
+            for file_path in pruned
+        )
         try:
-            with open(pool_path, "r", encoding="utf-8") as f:
-                config = json.load(f)
-            self.file_ids = config.get("file_ids", [])
-            print(f"[EMOJI] 載入了 {len(self.file_ids)} 個 fileId")
-        except FileNotFoundError:
-            print(f"WARNING  fileId 池文件不存在: {pool_path}，將使用備用生成方法")
-            self.file_ids = []
+            with open(pruned_list_path, "w", encoding="utf-8") as f:
+                f.write("# PrunedList - Resources not referenced by any prefab or animation\n")
+                f.write(f"# Add patterns to {EXPORT_KEEP_LIST} to export them anyway\n")
+                f.write(f"# Total pruned files: {len(pruned_files)}\n\n")
+                for pruned_file in pruned_files:
+                    f.write(f"{pruned_file}\n")
+            print(f"[EMOJI] PrunedList saved to: {pruned_list_path}")
         except Exception as e:
-            print(f"ERROR 載入 fileId 池時發生錯誤: {str(e)}，將使用備用生成方法")
-            self.file_ids = []
+            print(f"ERROR Failed to save PrunedList: {str(e)}")
 
-    def get_next_file_id(self):
-        """獲取下一個 fileId。"""
-        if self.current_index < len(self.file_ids):
-            file_id = self.file_ids[self.current_index]
-            self.current_index += 1
-            return file_id
-        else:
-            # 如果池用完了，生成新的 ID（備用方案）
-            print(f"WARNING  fileId 池已用完，使用備用生成方法")
-            chars = string.ascii_letters + string.digits
-            return "".join(random.choice(chars) for _ in range(18))
 
-    def reset_for_new_prefab(self):
-        """為新的 prefab 重置 fileId 計數器。"""
-        self.current_index = 0
-        print(f"Processing 為新 prefab 重置 fileId 計數器")
+class AutoAtlasPlanner:
+    """
+    Places Cocos Creator auto-atlas (.pac) assets in Common/Img from per-prefab sprite usage.
 
-    def get_usage_stats(self):
-        """獲取 fileId 使用統計。"""
+    An auto-atlas packs every sprite of its folder and of the subfolders without a .pac
+    of their own, so atlases are planned per output folder: a folder gets one when some
+    prefab draws at least AUTO_ATLAS_MIN_SHARED of the packable sprites directly inside
+    it. Sprites that do not fit AUTO_ATLAS_MAX_SIZE are left loose, as the editor does.
+    The report estimates per prefab how many textures (draw-call batches) the atlases save.
+    """
+
+    def __init__(self, image_manager, images_dir):
+        self.image_manager = image_manager
+        self.images_dir = Path(images_dir)
+        self.sprite_images = {}  # Sprite frame UUID -> exported image (under images_dir)
+        self.sprite_sizes = {}  # Exported image -> (width, height)
+        self.prefab_sprites = {}  # Prefab relative path -> sprite frame UUIDs it draws
+
+    def add_sprite(self, source_image, dest_path):
+        """Register an image exported to dest_path (its sprite frame UUID is already assigned)."""
+        dest_path = Path(dest_path)
+        sprite_frame_uuid = self.image_manager.get_sprite_frame_uuid(source_image)
+        self.sprite_images[sprite_frame_uuid] = dest_path
+        self.sprite_sizes[dest_path] = probe_image_size(source_image)
+
+    def add_prefab(self, prefab_name, sprite_frame_uuids):
+        self.prefab_sprites[prefab_name] = set(sprite_frame_uuids)
+
+    def is_packable(self, dest_path):
+        size = self.sprite_sizes.get(dest_path)
+        if size is None:
+            return False
+        limit = AUTO_ATLAS_MAX_SIZE - 2 * AUTO_ATLAS_PADDING
+        return 0 < size[0] <= limit and 0 < size[1] <= limit
+
+    def get_prefab_images(self, prefab_name):
+        """Exported images drawn by a prefab (sprites of other folders, e.g. Font/, are ignored)."""
         return {
-            "total_available": len(self.file_ids),
-            "used_count": self.current_index,
-            "remaining": max(0, len(self.file_ids) - self.current_index),
+            self.sprite_images[sprite_frame_uuid]
+            for sprite_frame_uuid in self.prefab_sprites[prefab_name]
+            if sprite_frame_uuid in self.sprite_images
+        }
+
+    def find_atlas(self, dest_path, atlas_folders):
+        """Nearest folder of atlas_folders containing dest_path, or None if it stays loose."""
+        for folder in dest_path.parents:
+            if folder in atlas_folders:
+                return folder
+            if folder == self.images_dir:
+                return None
+        return None
+
+    def plan(self):
+        """
+        Choose the atlas folders.
+
+        Returns:
+            dict: atlas folder -> sorted list of the exported images it packs
+        """
+        shared_counts = {}  # Folder -> most packable sprites one prefab draws from it
+        for prefab_name in self.prefab_sprites:
+            folder_counts = {}
+            for dest_path in self.get_prefab_images(prefab_name):
+                if self.is_packable(dest_path):
+                    folder_counts[dest_path.parent] = folder_counts.get(dest_path.parent, 0) + 1
+            for folder, count in folder_counts.items():
+                shared_counts[folder] = max(shared_counts.get(folder, 0), count)
+
+        atlas_folders = {
+            folder for folder, count in shared_counts.items() if count >= AUTO_ATLAS_MIN_SHARED
+        }
+        atlas_plan = {folder: [] for folder in atlas_folders}
+        for dest_path in sorted(self.sprite_sizes):
+            if self.is_packable(dest_path):
+                folder = self.find_atlas(dest_path, atlas_folders)
+                if folder is not None:
+                    atlas_plan[folder].append(dest_path)
+        return dict(sorted(atlas_plan.items()))
+
+    def estimate_pages(self, packed_images):
+        """Lower bound of atlas textures the editor needs for packed_images."""
+        padded_area = sum(
+            (width + 2 * AUTO_ATLAS_PADDING) * (height + 2 * AUTO_ATLAS_PADDING)
+            for width, height in (self.sprite_sizes[dest_path] for dest_path in packed_images)
+        )
+        return max(1, math.ceil(padded_area / (AUTO_ATLAS_MAX_SIZE * AUTO_ATLAS_MAX_SIZE)))
+
+    def estimate_batches(self, atlas_plan):
+        """
+        Textures each prefab binds without and with the planned atlases.
+
+        Returns:
+            dict: prefab relative path -> (loose_textures, atlas_textures)
+        """
+        atlas_of = {
+            dest_path: folder
+            for folder, packed_images in atlas_plan.items()
+            for dest_path in packed_images
+        }
+        estimates = {}
+        for prefab_name in sorted(self.prefab_sprites):
+            prefab_images = self.get_prefab_images(prefab_name)
+            textures = {atlas_of.get(dest_path, dest_path) for dest_path in prefab_images}
+            estimates[prefab_name] = (len(prefab_images), len(textures))
+        return estimates
+
+    def build_meta(self, atlas_uuid):
+        return {
+            "ver": "1.0.8",
+            "importer": "auto-atlas",
+            "imported": True,
+            "uuid": atlas_uuid,
+            "files": [".json"],
+            "subMetas": {},
+            "userData": {
+                "maxWidth": AUTO_ATLAS_MAX_SIZE,
+                "maxHeight": AUTO_ATLAS_MAX_SIZE,
+                "padding": AUTO_ATLAS_PADDING,
+                "allowRotation": True,
+                "forceSquared": False,
+                "powerOfTwo": False,
+                "algorithm": "MaxRects",
+                "format": "png",
+                "quality": 80,
+                "contourBleed": True,
+                "paddingBleed": True,
+                "filterUnused": True,
+                "removeTextureInBundle": True,
+                "removeImageInBundle": True,
+                "removeSpriteAtlasRawData": True,
+                "compressSettings": {},
+                "textureSetting": {
+                    "wrapModeS": "repeat",
+                    "wrapModeT": "repeat",
+                    "minfilter": "linear",
+                    "magfilter": "linear",
+                    "mipfilter": "none",
+                    "anisotropy": 0,
+                },
+            },
         }
 
+    def write_atlases(self, atlas_plan, build_manifest, meta_writer=None):
+        """
+        Write AUTO_ATLAS_NAME (.pac + .meta) into every atlas folder.
+
+        Returns:
+            tuple: (written_count, reused_count)
+        """
+        written_count = 0
+        reused_count = 0
+        for folder, packed_images in atlas_plan.items():
+            folder_key = folder.relative_to(self.images_dir).as_posix()
+            pac_path = folder / AUTO_ATLAS_NAME
+            atlas_uuid = self.image_manager.uuid_manager.generate_deterministic_uuid(
+                f"auto_atlas#{folder_key}", "base"
+            )
+            meta_content = self.build_meta(atlas_uuid)
+            # The .pac only depends on its settings; the editor finds the sprites itself
+            signature = BuildManifest.fingerprint(meta_content)
+            if build_manifest.is_resource_up_to_date(folder_key, pac_path, signature):
+                reused_count += 1
+            else:
+                try:
+                    with open(pac_path, "w", encoding="utf-8") as f:
+                        json.dump({"__type__": "cc.SpriteAtlas"}, f, indent=2)
+                    write_meta_file(Path(f"{pac_path}.meta"), meta_content, meta_writer)
+                    written_count += 1
+                    print(f"Success Auto atlas: {build_manifest.output_key(pac_path)} ({len(packed_images)} sprites)")
+                except Exception as e:
+                    build_manifest.keep_previous_resource(pac_path)
+                    print(f"ERROR Failed to write auto atlas {pac_path}: {str(e)}")
+                    continue
+            build_manifest.record_resource(folder_key, pac_path, signature)
+        return written_count, reused_count
+
+    def print_report(self, atlas_plan, report_path):
+        """Print the atlas summary and write the per-atlas / per-prefab estimate to report_path."""
+        estimates = self.estimate_batches(atlas_plan)
+        packed_count = sum(len(packed_images) for packed_images in atlas_plan.values())
+        loose_total = sum(loose for loose, atlased in estimates.values())
+        atlas_total = sum(atlased for loose, atlased in estimates.values())
+
+        print(f"\nDEBUG Auto atlas plan ({len(self.sprite_sizes)} exported sprites)")
+        print("=" * 80)
+        print(f"  atlases: {len(atlas_plan)} packing {packed_count} sprites")
+        print(
+            f"  prefab texture binds: {loose_total} -> {atlas_total} "
+            f"(up to {loose_total - atlas_total} batches saved)"
+        )
+
+        try:
+            with open(report_path, "w", encoding="utf-8") as f:
+                f.write("# AutoAtlasReport - Auto atlases (.pac) planned from per-prefab sprite usage\n")
+                f.write(
+                    f"# maxSize {AUTO_ATLAS_MAX_SIZE}, padding {AUTO_ATLAS_PADDING}, "
+                    f"atlas when one prefab draws >= {AUTO_ATLAS_MIN_SHARED} sprites of a folder\n"
+                )
+                f.write(f"# Total atlases: {len(atlas_plan)}, packed sprites: {packed_count}\n\n")
+                f.write("[Atlases]\n")
+                for folder, packed_images in atlas_plan.items():
+                    folder_key = folder.relative_to(self.images_dir).as_posix()
+                    f.write(
+                        f"{folder_key}/{AUTO_ATLAS_NAME}: {len(packed_images)} sprites, "
+                        f">= {self.estimate_pages(packed_images)} pages\n"
+                    )
+                f.write("\n[Prefabs] textures without -> with atlases (batches saved)\n")
+                for prefab_name, (loose, atlased) in estimates.items():
+                    f.write(f"{prefab_name}: {loose} -> {atlased} ({loose - atlased})\n")
+            print(f"[EMOJI] AutoAtlasReport saved to: {report_path}")
+        except Exception as e:
+            print(f"ERROR Failed to save AutoAtlasReport: {str(e)}")
+
 
 class PrefabGenerator:
     """
@@ -2275,17 +4572,29 @@ class PrefabGenerator:
         input_folder=INPUT_FOLDER,
         shared_file_id_manager=None,
         shared_uuid_manager=None,
+        shared_image_manager=None,
+        shared_material_manager=None,
     ):
         self.objects = []  # All objects in the prefab
         self.current_id = 0  # Current ID counter
         self.root_name = "Prefab"
         self.prefab_uuid = None  # Will be set later when root_name is known
         # UUID 管理器 - 共用或建立新的
+        if shared_uuid_manager is None and shared_image_manager is not None:
+            shared_uuid_manager = shared_image_manager.uuid_manager
         self.uuid_manager = shared_uuid_manager or UUIDManager()
-        self.image_manager = ImageResourceManager(self.uuid_manager)
-        self.image_manager.scan_for_images(input_folder)
-        self.material_manager = MaterialManager()
-        self.material_manager.load_material_config()
+        # 資源索引 - 批次轉換時共用同一份，只有單檔轉換才自行掃描
+        if shared_image_manager is not None:
+            self.image_manager = shared_image_manager
+        else:
+            self.image_manager = ImageResourceManager(self.uuid_manager)
+            self.image_manager.scan_for_images(input_folder)
+        # 材質設定 - 共用或自行載入
+        if shared_material_manager is not None:
+            self.material_manager = shared_material_manager
+        else:
+            self.material_manager = MaterialManager()
+            self.material_manager.load_material_config()
         self.input_folder = input_folder
         # UUID mapping for prefabs to ensure consistent references
         self.prefab_uuid_mapping = {}
@@ -2308,10 +4617,20 @@ class PrefabGenerator:
         # {node_path: {"anchor": {...}, "size": {...}, "parent_path": ...}}
         self.node_info_map = {}
 
-    def generate_uuid(self):
-        """Generate a UUID in the format used by Cocos Creator."""
+    def generate_uuid(self, key=None):
+        """Generate a UUID in the format used by Cocos Creator.
+
+        When a key is given the UUID is derived from it, so the same asset gets
+        the same UUID on every run and in every worker process.
+        """
+        if key:
+            return self.uuid_manager.generate_deterministic_uuid(key, "base")
         return self.uuid_manager.generate_unique_uuid("base")
 
+    def get_animation_clip_key(self, clip_name):
+        """Build the stable UUID key for the next animation clip of this prefab."""
+        return f"animation#{self.current_relative_path}#{len(self.animation_clips)}#{clip_name}"
+
     def generate_file_id(self):
         """Generate a file ID for PrefabInfo objects using the managed pool."""
         return self.file_id_manager.get_next_file_id()
@@ -2816,13 +5135,16 @@ class PrefabGenerator:
         # Extract image reference from CSD node data
         if node_dict:
             image_path = None
+            plist_path = ""
 
             # For Button nodes, use NormalFileData as the sprite frame
             if "NormalFileData" in node_dict:
                 image_path = node_dict["NormalFileData"].get("@Path", "")
+                plist_path = node_dict["NormalFileData"].get("@Plist", "")
             # For regular Sprite/ImageView nodes, use FileData
             elif "FileData" in node_dict:
                 image_path = node_dict["FileData"].get("@Path", "")
+                plist_path = node_dict["FileData"].get("@Plist", "")
 
             if image_path:
                 # Check if path starts with "Default/" - these represent non-existent resources
@@ -2830,13 +5152,21 @@ class PrefabGenerator:
                     print(f"Skip Skipping Default resource for sprite: {image_path}")
                 else:
                     sprite_frame = self.image_manager.create_sprite_frame_reference(
-                        image_path
+                        image_path, plist_path
                     )
                     if sprite_frame:
                         sprite_component["_spriteFrame"] = sprite_frame
 
-                        # Check if this image has scale9 information
-                        actual_image = self.image_manager.find_image_file(image_path)
+                        # Check if this image (or atlas frame) has scale9 information
+                        atlas_file, frame_name = self.image_manager.resolve_atlas_frame(
+                            image_path, plist_path
+                        )
+                        if atlas_file is not None:
+                            actual_image = self.image_manager.get_atlas_frame_key(
+                                atlas_file, frame_name
+                            )
+                        else:
+                            actual_image = self.image_manager.find_image_file(image_path)
                         if actual_image and self.image_manager.has_scale9_info(
                             actual_image
                         ):
@@ -2920,7 +5250,10 @@ class PrefabGenerator:
         print(f"Image  Creating FileData background sprite for image: {image_path}")
 
         # Get the original image size instead of using panel size or trimmed size
-        image_width, image_height = self.image_manager.get_original_size(image_path)
+        plist_path = file_data.get("@Plist", "")
+        image_width, image_height = self.image_manager.get_atlas_frame_size(
+            image_path, plist_path
+        ) or self.image_manager.get_original_size(image_path)
         print(f"[EMOJI] Background image original size: {image_width}x{image_height}")
 
         # Calculate position based on panel anchor
@@ -2967,7 +5300,9 @@ class PrefabGenerator:
 
         # Create Sprite component for background with specific settings
         # _sizeMode = 2, _type = 0 as required
-        sprite_frame_ref = self.image_manager.create_sprite_frame_reference(image_path)
+        sprite_frame_ref = self.image_manager.create_sprite_frame_reference(
+            image_path, plist_path
+        )
 
         bg_sprite_component = {
             "__type__": "cc.Sprite",
@@ -3482,7 +5817,7 @@ class PrefabGenerator:
             animation_clip_objects.extend(total_objects)
 
             # Generate UUID for the animation clip file
-            anim_file_uuid = self.generate_uuid()
+            anim_file_uuid = self.generate_uuid(self.get_animation_clip_key(clip_name))
 
             # Store the complete animation structure for separate file export
             self.animation_clips.append(
@@ -3597,7 +5932,9 @@ class PrefabGenerator:
                             animation_clip_objects.extend(segment_total_objects)
 
                             # Generate UUID for the animation clip file
-                            anim_file_uuid = self.generate_uuid()
+                            anim_file_uuid = self.generate_uuid(
+                                self.get_animation_clip_key(clip_name)
+                            )
 
                             # Store the complete animation structure for separate file export
                             self.animation_clips.append(
@@ -4878,7 +7215,7 @@ class PrefabGenerator:
 
                         # Create sprite frame reference using image manager
                         sprite_frame_ref = (
-                            self.image_manager.create_sprite_frame_reference(path)
+                            self.image_manager.create_sprite_frame_reference(path, plist)
                         )
 
                         if sprite_frame_ref:
@@ -4980,10 +7317,12 @@ class PrefabGenerator:
 
     def create_animation_clip(self, name, duration, tracks_data, speed_str):
         """Create an AnimationClip asset with new track-based format."""
-        # Generate a random hash (in reality this should be computed from content)
-        import random
-
-        clip_hash = random.randint(100000000, 999999999)
+        # Compute the hash from the clip content so identical input gives identical output
+        content_key = json.dumps(
+            [name, duration, speed_str, tracks_data], sort_keys=True, ensure_ascii=False
+        )
+        content_hash = int(hashlib.md5(content_key.encode("utf-8")).hexdigest(), 16)
+        clip_hash = 100000000 + content_hash % 900000000
 
         speed = float(speed_str)
         if speed.is_integer():
@@ -5390,21 +7729,19 @@ class PrefabGenerator:
                 f"[EMOJI] Found Scale9 node {name}: L={scale9_data['LeftEage']}, R={scale9_data['RightEage']}, T={scale9_data['TopEage']}, B={scale9_data['BottomEage']}"
             )
 
-            # Apply scale9 to all images used by this node
+            # Apply scale9 to all images (and atlas frames) used by this node
             images_to_process = []
 
             # Collect all image paths from this node
-            if "NormalFileData" in node_dict:
-                images_to_process.append(node_dict["NormalFileData"].get("@Path", ""))
-            if "PressedFileData" in node_dict:
-                images_to_process.append(node_dict["PressedFileData"].get("@Path", ""))
-            if "DisabledFileData" in node_dict:
-                images_to_process.append(node_dict["DisabledFileData"].get("@Path", ""))
-            if "FileData" in node_dict:
-                images_to_process.append(node_dict["FileData"].get("@Path", ""))
+            for file_data_key in ("NormalFileData", "PressedFileData", "DisabledFileData", "FileData"):
+                if file_data_key in node_dict:
+                    file_data = node_dict[file_data_key]
+                    images_to_process.append(
+                        (file_data.get("@Path", ""), file_data.get("@Plist", ""))
+                    )
 
             # Apply scale9 info to all found images
-            for img_path in images_to_process:
+            for img_path, plist_path in images_to_process:
                 if img_path:
                     # Check if path starts with "Default/" - these represent non-existent resources
                     if img_path.startswith("Default/"):
@@ -5413,10 +7750,9 @@ class PrefabGenerator:
                         )
                         continue
 
-                    actual_image = self.image_manager.find_image_file(img_path)
-                    if actual_image:
-                        self.image_manager.add_scale9_info(actual_image, scale9_data)
-                        print(f"  Success Applied scale9 to: {Path(actual_image).name}")
+                    for scale9_key in self.image_manager.get_scale9_keys(img_path, plist_path):
+                        self.image_manager.add_scale9_info(scale9_key, scale9_data)
+                        print(f"  Success Applied scale9 to: {Path(scale9_key).name}")
 
         # Create components based on ctype
         ctype = node_dict.get("@ctype", "")
@@ -6376,6 +8712,14 @@ class PrefabGenerator:
             "userData": {"syncNodeName": prefab_name},
         }
 
+    def release_shared_managers(self):
+        """Drop references to batch-wide managers so the generator can be sent between processes."""
+        self.image_manager = None
+        self.material_manager = None
+        self.file_id_manager = None
+        self.uuid_manager = None
+        self.prefab_uuid_mapping = {}
+
     def print_image_mapping_report(self):
         """Print a report of image mappings for debugging."""
         print("\n=== Image Mapping Report ===")
@@ -6403,6 +8747,8 @@ def parse_csd_to_prefab(
     shared_uuid_manager=None,
     max_depth=4,
     input_folder=INPUT_FOLDER,
+    shared_material_manager=None,
+    csd_document=None,
 ):
     """
     Parses a Cocos Studio CSD XML file and converts it to a Cocos Creator 3.8.1 Prefab JSON.
@@ -6415,6 +8761,9 @@ def parse_csd_to_prefab(
         shared_prefab_uuid_mapping (dict): Shared UUID mapping for consistent prefab references.
         shared_file_id_manager (FileIdManager): Shared fileId manager for consistent ID allocation.
         max_depth (int): Maximum allowed node depth before flattening (default: 4).
+        input_folder (str): Input folder used for relative path calculation (and scanning when no image_manager is given).
+        shared_material_manager (MaterialManager): Shared material config, loaded once per batch.
+        csd_document (dict): Already parsed CSD from CSDDocumentCache; loaded from csd_path when omitted.
 
     Returns:
         PrefabGenerator: The generator instance for later processing.
@@ -6423,32 +8772,10 @@ def parse_csd_to_prefab(
     print(f"[EMOJI] Converting CSD to Prefab: {csd_path}")
     print("=" * 60)
 
-    # Step 1: Load and parse CSD XML (check for enhanced version first)
-    actual_csd_path = csd_path
-    
-    # Check if there's an enhanced version in temp_enhanced_csd
-    try:
-        csd_file_path = Path(csd_path).resolve()
-        input_path = Path(input_folder).resolve()
-        relative_path = csd_file_path.relative_to(input_path)
-        
-        # Construct potential enhanced CSD path
-        temp_enhanced_dir = input_path.parent / "temp_enhanced_csd"
-        enhanced_csd_path = temp_enhanced_dir / relative_path
-        
-        if enhanced_csd_path.exists():
-            actual_csd_path = str(enhanced_csd_path)
-            print(f"[EMOJI] Using enhanced CSD: {enhanced_csd_path.name}")
-        else:
-            print(f"[EMOJI] Using original CSD: {Path(csd_path).name}")
-            
-    except Exception as e:
-        print(f"WARNING  Could not check for enhanced CSD, using original: {e}")
-    
-    with open(actual_csd_path, "r", encoding="utf-8") as f:
-        xml_content = f.read()
-    
-    csd_dict = xmltodict.parse(xml_content)
+    # Step 1: Load the sanitized/enhanced CSD document (parsed once, shared with the Scale9 pre-scan)
+    if csd_document is None:
+        csd_document = CSDDocumentCache().get_document(csd_path)
+    csd_dict = csd_document
 
     # Step 1.5: Check if this is a Scene3D file that should be skipped
     try:
@@ -6467,15 +8794,14 @@ def parse_csd_to_prefab(
     # input_folder parameter is already provided to this function
 
     # Step 3: Generate prefab using shared image manager, UUID mapping, and fileId manager
-    if image_manager is None:
-        generator = PrefabGenerator(
-            str(input_folder), shared_file_id_manager, shared_uuid_manager
-        )
-    else:
-        generator = PrefabGenerator(
-            str(input_folder), shared_file_id_manager, shared_uuid_manager
-        )
-        generator.image_manager = image_manager  # Use shared image manager
+    # A shared image manager is the batch-wide resource index; passing it in skips the per-file rescan
+    generator = PrefabGenerator(
+        str(input_folder),
+        shared_file_id_manager,
+        shared_uuid_manager,
+        image_manager,
+        shared_material_manager,
+    )
 
     # Use shared UUID mapping for consistent prefab references
     if shared_prefab_uuid_mapping is not None:
@@ -6554,14 +8880,387 @@ def parse_csd_to_prefab(
         )
         shared_prefab_uuid_mapping[mapping_key] = generator.prefab_uuid
 
-    with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(meta_data, f, indent=2, ensure_ascii=False)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta_data, f, indent=2, ensure_ascii=False)
+
+    # Step 6: Return generator for later resource processing
+    return generator
+
+
+# Per-process state for batch conversion workers (filled by _init_batch_worker)
+_batch_worker_state = {}
+
+
+def _init_batch_worker(image_manager, material_manager, prefab_uuid_mapping, input_folder):
+    """Process pool initializer: keep a private snapshot of the shared batch state."""
+    _batch_worker_state["image_manager"] = image_manager
+    _batch_worker_state["material_manager"] = material_manager
+    _batch_worker_state["prefab_uuid_mapping"] = prefab_uuid_mapping
+    _batch_worker_state["file_id_manager"] = FileIdManager()
+    _batch_worker_state["input_folder"] = input_folder
+
+
+def _convert_csd_in_worker(csd_path, output_path, csd_document=None, prefab_uuids=None):
+    """
+    Convert one CSD inside a pool worker.
+
+    prefab_uuids carries the (csd_cache, prefab_uuid_mapping) entries merged since the
+    pool started, so a parent sees the UUIDs of nested prefabs converted in earlier levels.
+
+    Returns the detached generator together with every cache entry the conversion
+    added, so the parent process can merge them back in input order.
+    """
+    image_manager = _batch_worker_state["image_manager"]
+    prefab_uuid_mapping = _batch_worker_state["prefab_uuid_mapping"]
+    file_id_manager = _batch_worker_state["file_id_manager"]
+
+    if prefab_uuids is not None:
+        csd_cache, merged_mapping = prefab_uuids
+        for csd_key, prefab_uuid in csd_cache.items():
+            if csd_key not in image_manager.csd_cache:
+                image_manager.csd_cache[csd_key] = prefab_uuid
+                image_manager.uuid_manager.register_existing_uuid(prefab_uuid)
+        prefab_uuid_mapping.update(merged_mapping)
+
+    marker = image_manager.get_state_marker()
+    mapping_marker = len(prefab_uuid_mapping)
+    file_id_manager.reset_for_new_prefab()
+
+    generator = None
+    error = None
+    try:
+        generator = parse_csd_to_prefab(
+            csd_path,
+            output_path,
+            image_manager,
+            prefab_uuid_mapping,
+            file_id_manager,
+            image_manager.uuid_manager,
+            max_depth=4,
+            input_folder=_batch_worker_state["input_folder"],
+            shared_material_manager=_batch_worker_state["material_manager"],
+            csd_document=csd_document,
+        )
+        if generator is not None:
+            generator.release_shared_managers()
+    except Exception as e:
+        traceback.print_exc()
+        error = str(e)
+
+    return {
+        "generator": generator,
+        "error": error,
+        "changes": image_manager.collect_state_changes(marker),
+        "prefab_uuid_mapping": list(
+            itertools.islice(prefab_uuid_mapping.items(), mapping_marker, None)
+        ),
+        "file_id_index": file_id_manager.current_index,
+    }
+
+
+def convert_csd_files_in_pool(
+    conversion_tasks,
+    csd_documents,
+    shared_image_manager,
+    shared_material_manager,
+    shared_prefab_uuid_mapping,
+    input_folder,
+    jobs,
+    task_levels=None,
+):
+    """
+    Convert CSD files across a process pool.
+
+    Tasks are submitted one dependency level at a time: a level starts only after every
+    earlier result has been merged, so parents see the prefab UUIDs of their children.
+
+    Args:
+        conversion_tasks (list): (csd_file, output_file) pairs.
+        csd_documents (CSDDocumentCache): Parsed CSDs; each task ships its document so workers never re-parse.
+        shared_image_manager (ImageResourceManager): Fully scanned manager; each worker gets a read-only snapshot.
+        shared_material_manager (MaterialManager): Loaded material config for the workers.
+        shared_prefab_uuid_mapping (dict): Prefab UUID mapping snapshot for the workers.
+        input_folder (str): Input folder used for relative path calculation.
+        jobs (int): Number of worker processes.
+        task_levels (list): PrefabDependencyGraph level of each task, ascending (None = one level).
+
+    Yields:
+        dict: Worker result for each task, in the same order as conversion_tasks.
+    """
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_batch_worker,
+        initargs=(
+            shared_image_manager,
+            shared_material_manager,
+            shared_prefab_uuid_mapping,
+            str(input_folder),
+        ),
+    ) as executor:
+        if task_levels is None:
+            task_levels = [0] * len(conversion_tasks)
+
+        futures = []
+        for i in range(len(conversion_tasks)):
+            if i == len(futures):
+                # Submit the next level; the caller has merged every result yielded so far
+                prefab_uuids = None
+                if i > 0:
+                    prefab_uuids = (
+                        dict(shared_image_manager.csd_cache),
+                        dict(shared_prefab_uuid_mapping),
+                    )
+                level = task_levels[i]
+                for csd_file, output_file in conversion_tasks[i:]:
+                    if task_levels[len(futures)] != level:
+                        break
+                    try:
+                        csd_document = csd_documents.get_document(csd_file)
+                    except Exception:
+                        csd_document = None  # The worker retries the load and reports the error
+                    futures.append(
+                        executor.submit(
+                            _convert_csd_in_worker,
+                            str(csd_file),
+                            str(output_file),
+                            csd_document,
+                            prefab_uuids,
+                        )
+                    )
+            try:
+                result = futures[i].result()
+            except Exception as e:
+                result = {"generator": None, "error": f"Worker failed: {str(e)}", "changes": None}
+            # Drop the finished future so its generator is freed once the caller is done with it
+            futures[i] = None
+            yield result
+
+
+def merge_worker_conversion_result(
+    result, shared_image_manager, shared_prefab_uuid_mapping, shared_file_id_manager
+):
+    """
+    Merge one worker result into the shared batch state and return its generator.
+
+    result["changes"] and result["prefab_uuid_mapping"] are replaced by the entries that
+    were new to the shared state, which is what a serial run would have recorded for this CSD.
+    """
+    if result["changes"] is not None:
+        result["changes"] = shared_image_manager.apply_state_changes(result["changes"])
+        new_mapping_items = []
+        for mapping_key, prefab_uuid in result["prefab_uuid_mapping"]:
+            if mapping_key not in shared_prefab_uuid_mapping:
+                shared_prefab_uuid_mapping[mapping_key] = prefab_uuid
+                new_mapping_items.append((mapping_key, prefab_uuid))
+        result["prefab_uuid_mapping"] = new_mapping_items
+        shared_file_id_manager.current_index = result["file_id_index"]
+
+    if result["error"]:
+        raise RuntimeError(result["error"])
+
+    return result["generator"]
+
+
+def get_animation_output_dir(output_path, source_path):
+    """Return the Common/Animation directory mirroring the source CSD's directory."""
+    if source_path:
+        # Convert source path from .csd to animation directory structure
+        # e.g., "Lua/BattlePassRCResource/Csd/GuideRCBP/GuideRCBP_Role.csd"
+        # becomes "Common/Animation/Lua/BattlePassRCResource/Csd/GuideRCBP/"
+        return Path(output_path) / "Common" / "Animation" / Path(source_path).parent
+    # Fallback to original behavior if source_path is missing
+    return Path(output_path) / "Common" / "Animation"
+
+
+def write_animation_clip(anim_file, anim_name, anim_uuid, anim_data):
+    """Write one .anim file and its .meta."""
+    with open(anim_file, "w", encoding="utf-8") as f:
+        json.dump(anim_data, f, indent=2, ensure_ascii=False)
+
+    # Generate .meta file for animation
+    meta_data = {
+        "ver": "2.0.3",
+        "importer": "animation-clip",
+        "imported": True,
+        "uuid": anim_uuid,
+        "files": [".cconb"],
+        "subMetas": {},
+        "userData": {"name": anim_name},
+    }
+
+    with open(f"{anim_file}.meta", "w", encoding="utf-8") as f:
+        json.dump(meta_data, f, indent=2, ensure_ascii=False)
+
+
+def collect_animation_uuid_references(generator, output_path):
+    """Return the __uuid__ references of a prefab's animation clips (read back from disk once exported)."""
+    uuid_references = []
+    for anim_info in generator.animation_clips:
+        anim_data = anim_info["data"]
+        if anim_data is None:
+            with open(Path(output_path) / anim_info["file"], "r", encoding="utf-8") as f:
+                anim_data = json.load(f)
+        uuid_references.extend(ImageResourceManager.collect_uuid_references(anim_data))
+    return uuid_references
+
+
+def stream_prefab_result(generator, output_file, output_path, build_manifest):
+    """
+    Write a freshly generated prefab's .anim files and return a CachedPrefabResult in its place.
+
+    The final name of a clip depends on every clip name in the batch, so each clip is
+    written under its UUID-suffixed name for now; the animation export pass drops the
+    suffix (a rename) once the name turns out to be unique.
+    """
+    animation_clips = []
+    for anim_info in generator.animation_clips:
+        anim_name = anim_info["name"]
+        anim_uuid = anim_info["uuid"]
+        anim_dir = get_animation_output_dir(output_path, anim_info.get("source_path"))
+        anim_dir.mkdir(parents=True, exist_ok=True)
+
+        anim_file = anim_dir / f"{anim_name}_{anim_uuid[-4:]}.anim"
+        write_animation_clip(anim_file, anim_name, anim_uuid, anim_info["data"])
+        animation_clips.append(
+            {
+                "name": anim_name,
+                "uuid": anim_uuid,
+                "source_path": anim_info.get("source_path"),
+                "file": build_manifest.output_key(anim_file),
+            }
+        )
+
+    record = {
+        "root_name": generator.root_name,
+        "prefab_uuid": generator.prefab_uuid,
+        "current_relative_path": generator.current_relative_path,
+        "animation_clips": animation_clips,
+    }
+    return CachedPrefabResult(record, output_file)
+
+
+def write_meta_file(meta_path, meta_content, meta_writer=None):
+    """Write a .meta file as indented JSON, or queue it on meta_writer."""
+    if meta_writer is not None:
+        meta_writer.submit(meta_path, meta_content)
+        return
+    with open(meta_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(meta_content, indent=2, ensure_ascii=False))
+
+
+class MetaWriter:
+    """Writes finished .meta contents on a thread pool; errors are reported by wait()."""
+
+    def __init__(self, jobs=COPY_JOBS):
+        self.executor = ThreadPoolExecutor(max_workers=max(1, jobs))
+        self.pending = []  # (meta_path, future) in submission order
+
+    def submit(self, meta_path, meta_content):
+        self.pending.append((meta_path, self.executor.submit(write_meta_file, meta_path, meta_content)))
+
+    def wait(self):
+        """Block until every queued meta is written; return [(meta_path, error)] for the failures."""
+        pending, self.pending = self.pending, []
+        failures = []
+        for meta_path, future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                failures.append((meta_path, e))
+        return failures
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+
+def drain_meta_writes(meta_writer):
+    """Wait for the queued .meta files of one resource step and report failed writes."""
+    for meta_path, error in meta_writer.wait():
+        print(f"ERROR Error writing meta {Path(meta_path).name}: {str(error)}")
+
+
+def drain_resource_copies(resource_copier, output_path, build_manifest, batch_stats):
+    """Report the queued copies of one resource step and count them in batch_stats."""
+    for source_path, dest_path, status, error in resource_copier.wait():
+        relative_dest = Path(dest_path).relative_to(output_path)
+        if error is not None:
+            build_manifest.keep_previous_resource(dest_path)
+            batch_stats["total_image_errors"] += 1
+            print(f"ERROR Error copying {Path(source_path).name}: {str(error)}")
+        elif status == "identical":
+            batch_stats["total_resources_reused"] += 1
+            print(f"Skip Identical: {relative_dest}")
+        else:
+            batch_stats["total_images_copied"] += 1
+            print(f"Success {status.capitalize()}: {relative_dest}")
+
+
+def load_resource_index(input_path):
+    """
+    Create the batch's shared UUID and image managers.
+
+    The cached resource JSON is loaded first, then input_path is scanned for images,
+    particles, fonts and CSDs.
+
+    Returns:
+        tuple: (ImageResourceManager, fingerprint of the UUID cache state as loaded)
+    """
+    # Create shared UUID manager for global UUID uniqueness
+    print("ID Initializing shared UUID manager...")
+    shared_uuid_manager = UUIDManager()
+
+    # Create shared image manager for consistent UUIDs
+    print("Folder Initializing shared image resource manager...")
+    shared_image_manager = ImageResourceManager(shared_uuid_manager)
+    
+    # Try to load existing resources cache first to reuse path_mapping
+    if USE_INPUT_RESOURCES_JSON:
+        try:
+            shared_image_manager.load_resources_from_json(get_resource_cache_path(INPUT_RESOURCES_JSON))
+            print(f"Loaded Loaded cached path mappings: {len(shared_image_manager.path_mapping)} entries")
+        except Exception as e:
+            print(f"WARNING Failed to load input resources cache: {str(e)}")
+    else:
+        try:
+            shared_image_manager.load_resources_from_json(get_resource_cache_path(OUTPUT_RESOURCES_JSON))
+            print(f"Loaded Loaded cached path mappings: {len(shared_image_manager.path_mapping)} entries")
+        except Exception as e:
+            print("INFO No existing resources cache found, starting fresh")
+    
+    # UUID cache state as loaded; any change means every UUID may differ
+    uuid_cache_fingerprint = BuildManifest.fingerprint(
+        [
+            shared_image_manager.image_cache,
+            shared_image_manager.particle_cache,
+            shared_image_manager.font_cache,
+            shared_image_manager.csd_cache,
+            shared_image_manager.atlas_cache,
+            shared_image_manager.path_mapping,
+        ]
+    )
+
+    # Scan for available images/resources (this will update path_mapping with new discoveries)
+    # The cache was loaded above, so the scan must not reload it
+    shared_image_manager.scan_for_images(str(input_path), load_cached_resources=False)
+    print(
+        f"Success Found {len(shared_image_manager.available_images)} available images"
+    )
 
-    # Step 6: Return generator for later resource processing
-    return generator
+    return shared_image_manager, uuid_cache_fingerprint
 
 
-def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_FOLDER):
+def batch_convert_csd_to_prefab(
+    input_folder=INPUT_FOLDER,
+    output_folder=OUTPUT_FOLDER,
+    jobs=BATCH_JOBS,
+    incremental=BUILD_INCREMENTAL,
+    session=None,
+    copy_strategy=COPY_STRATEGY,
+    reachable=EXPORT_REACHABLE,
+    dedup_images=DEDUP_IMAGES,
+    auto_atlas=AUTO_ATLAS,
+    optimize_png=OPTIMIZE_PNG,
+):
     """
     Batch convert all CSD files from input folder to output folder while maintaining directory structure.
     Now includes comprehensive image resource management and validation.
@@ -6570,6 +9269,14 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
         input_folder (str): Path to the input folder containing CSD files.
         output_folder (str): Path to the output folder for generated Prefab files.
         resources_json (str): Path to the resources.json file for caching resource mappings.
+        jobs (int): Number of worker processes for CSD conversion (1 = serial).
+        incremental (bool): Reuse unchanged outputs recorded in the build manifest of output_folder.
+        session (WatchSession): Parsed CSDs and resource index kept in memory by --watch.
+        copy_strategy (str): How resources reach the output: "copy", "hardlink" or "reflink".
+        reachable (bool): Export only referenced resources (plus EXPORT_KEEP_LIST) instead of OUTPUT_ANYWAY.
+        dedup_images (bool): Export one canonical copy of identical images and point every reference at it.
+        auto_atlas (bool): Place auto-atlas (.pac) assets in Common/Img from per-prefab sprite usage.
+        optimize_png (str): PNG optimization for Common/Img: "off", "lossless" or "quantize".
 
     Returns:
         dict: Summary of batch conversion results.
@@ -6592,62 +9299,29 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
     print(f"Found {len(csd_files)} CSD files in '{input_folder}' folder")
     print("=" * 80)
 
-    # Step 0: Pre-process CSD files with CSDReader before conversion
+    # Step 0: Load every CSD once (CSDReader sanitize/enhance in memory, then parse)
+    # The Scale9 pre-scan and the conversion both reuse these documents
     print(f"Pre-processing CSD files with CSDReader...")
     print("=" * 80)
 
-    try:
-        csd_reader = CSDReader()
-
-        # Create temporary output directory for enhanced CSD files
-        temp_enhanced_dir = input_path.parent / "temp_enhanced_csd"
-        temp_enhanced_dir.mkdir(parents=True, exist_ok=True)
-
-        # Process each CSD file with CSDReader
-        enhanced_csd_files = []
-        for csd_file in csd_files:
-            try:
-                # Calculate relative path from input folder
-                relative_path = csd_file.relative_to(input_path)
-
-                # Create corresponding output path in temp directory
-                enhanced_file = temp_enhanced_dir / relative_path
-                enhanced_file.parent.mkdir(parents=True, exist_ok=True)
-
-                print(f"Processing Processing: {csd_file.name}")
-
-                # Use enhanced mode for better animation processing
-                result = csd_reader.process_file(
-                    str(csd_file), str(enhanced_file), enhanced_mode=True
-                )
-
-                if result and result.get("success", False):
-                    enhanced_csd_files.append(enhanced_file)
-                    print(f"Success Enhanced: {csd_file.name}")
-                else:
-                    # If enhancement fails, use original file
-                    enhanced_csd_files.append(csd_file)
-                    print(
-                        f"WARNING  Enhancement failed, using original: {csd_file.name}"
-                    )
-
-            except Exception as e:
-                print(f"ERROR Error processing {csd_file.name}: {str(e)}")
-                # If processing fails, use original file
-                enhanced_csd_files.append(csd_file)
-
-        print(
-            f"Success CSDReader preprocessing completed. {len(enhanced_csd_files)} files ready for conversion."
-        )
-        print("=" * 80)
-
-        # Keep csd_files and input_path unchanged
-        # Enhanced CSD files will be checked individually in parse_csd_to_prefab
+    if session is not None:
+        csd_documents = session.csd_documents
+    else:
+        csd_documents = CSDDocumentCache(enhanced_mode=True)
+    loaded_count = 0
+    for csd_file in csd_files:
+        try:
+            print(f"Processing Processing: {csd_file.name}")
+            csd_documents.get_document(csd_file)
+            loaded_count += 1
+            print(f"Success Enhanced: {csd_file.name}")
+        except Exception as e:
+            print(f"ERROR Error processing {csd_file.name}: {str(e)}")
 
-    except Exception as e:
-        print(f"ERROR Error during CSDReader preprocessing: {str(e)}")
-        print("WARNING  Continuing with original CSD files...")
-        print("=" * 80)
+    print(
+        f"Success CSDReader preprocessing completed. {loaded_count} files ready for conversion."
+    )
+    print("=" * 80)
 
     # Create unified output structure with Common folder
     prefabs_dir = output_path / "Common" / "Prefab"
@@ -6655,36 +9329,20 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
     prefabs_dir.mkdir(parents=True, exist_ok=True)
     images_dir.mkdir(parents=True, exist_ok=True)
 
-    # Create shared UUID manager for global UUID uniqueness
-    print("ID Initializing shared UUID manager...")
-    shared_uuid_manager = UUIDManager()
-
-    # Create shared image manager for consistent UUIDs
-    print("Folder Initializing shared image resource manager...")
-    shared_image_manager = ImageResourceManager(shared_uuid_manager)
-    
-    # Try to load existing resources cache first to reuse path_mapping
-    if USE_INPUT_RESOURCES_JSON:
-        try:
-            shared_image_manager.load_resources_from_json(INPUT_RESOURCES_JSON)
-            print(f"Loaded Loaded cached path mappings: {len(shared_image_manager.path_mapping)} entries")
-        except Exception as e:
-            print(f"WARNING Failed to load input resources cache: {str(e)}")
+    # Shared UUID/image managers (a --watch session keeps the scanned index between batches)
+    if session is not None:
+        shared_image_manager, uuid_cache_fingerprint = session.get_resource_index(input_path)
     else:
-        try:
-            shared_image_manager.load_resources_from_json(OUTPUT_RESOURCES_JSON)
-            print(f"Loaded Loaded cached path mappings: {len(shared_image_manager.path_mapping)} entries")
-        except Exception as e:
-            print(f"INFO No existing resources cache found, starting fresh")
-    
-    # Scan for available images/resources (this will update path_mapping with new discoveries)
-    shared_image_manager.scan_for_images(str(input_path))
-    print(
-        f"Success Found {len(shared_image_manager.available_images)} available images"
-    )
+        shared_image_manager, uuid_cache_fingerprint = load_resource_index(input_path)
+    shared_uuid_manager = shared_image_manager.uuid_manager
+    build_manifest = BuildManifest(output_path, input_path)
 
     print("=" * 80)
 
+    # Load material config once for every prefab in the batch
+    shared_material_manager = MaterialManager()
+    shared_material_manager.load_material_config()
+
     # Create shared UUID mapping for consistent prefab references
     shared_prefab_uuid_mapping = {}
 
@@ -6696,17 +9354,77 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
 
     # Pre-scan all CSD files for Scale9 information
     print("[EMOJI] Pre-scanning for Scale9 information...")
-    scan_scale9_info_from_csd_files(csd_files, shared_image_manager)
+    scan_scale9_info_from_csd_files(csd_files, shared_image_manager, csd_documents)
     total_scale9_images = len(shared_image_manager.scale9_info_cache)
     print(f"Success Found {total_scale9_images} images with Scale9 settings")
 
+    # Identical images collapse onto one canonical image before any UUID is handed out
+    duplicate_groups = {}
+    if dedup_images:
+        print("[EMOJI] Hashing images for duplicate content...")
+        # Font and atlas textures are referenced by file name from their .fnt/.plist, never merged
+        font_textures = [
+            Path(source_font).with_name(texture_filename)
+            for source_font in sorted(shared_image_manager.available_fonts)
+            for texture_filename in shared_image_manager.parse_fnt_texture_files(source_font)
+        ]
+        atlas_textures = [
+            shared_image_manager.get_atlas_texture_file(source_atlas)
+            for source_atlas in sorted(shared_image_manager.available_atlases)
+        ]
+        duplicate_groups = shared_image_manager.plan_image_dedup(
+            font_textures + [texture for texture in atlas_textures if texture]
+        )
+        shared_image_manager.print_duplicate_report(
+            duplicate_groups, output_path / "DuplicateList.txt"
+        )
+    else:
+        shared_image_manager.duplicate_images = {}
+
+    # Build manifest: always written, only read back in incremental mode
+    build_manifest.snapshot_scale9_info(shared_image_manager)
+    build_state = {
+        "tool": build_manifest.get_tool_fingerprint(),
+        "uuid_cache": uuid_cache_fingerprint,
+        "inventory": BuildManifest.fingerprint(
+            [
+                sorted(shared_image_manager.available_images),
+                sorted(shared_image_manager.available_particles),
+                sorted(shared_image_manager.available_fonts),
+                sorted(shared_image_manager.available_atlases),
+                sorted(csd_file.relative_to(input_path).as_posix() for csd_file in csd_files),
+            ]
+        ),
+    }
+    if dedup_images:
+        # Prefabs carry the canonical UUIDs, so a different grouping rebuilds them
+        build_state["image_dedup"] = BuildManifest.fingerprint(sorted(duplicate_groups.items()))
+    if incremental:
+        print("Processing Incremental mode: checking build manifest...")
+        build_manifest.load(build_state)
+    else:
+        build_manifest.state = build_state
+
+    # Nested prefab graph: children are converted before the prefabs that embed them
+    print("[EMOJI] Building nested prefab dependency graph...")
+    prefab_graph = PrefabDependencyGraph(csd_files)
+    prefab_graph.build(csd_documents, shared_image_manager, input_path)
+    prefab_graph.print_report(input_path)
+
     # Batch conversion statistics
     batch_stats = {
         "total_files": len(csd_files),
         "success_count": 0,
         "error_count": 0,
         "skipped_count": 0,
+        "reused_count": 0,
         "total_images_copied": 0,
+        "total_resources_reused": 0,
+        "total_resources_pruned": 0,
+        "total_images_deduplicated": 0,
+        "total_auto_atlases": 0,
+        "total_atlases_exported": 0,
+        "total_png_bytes_saved": 0,
         "total_image_errors": 0,
         "total_animations_exported": 0,
         "total_valid_references": 0,
@@ -6715,32 +9433,115 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
         "all_generators": [],
     }
 
-    # First pass: convert all CSD files with shared image manager
-    for i, csd_file in enumerate(csd_files, 1):
+    # First pass: convert all CSD files with shared image manager, children first
+    # Create corresponding output paths in Common/Prefab directory
+    conversion_tasks = [
+        (csd_file, prefabs_dir / csd_file.relative_to(input_path).with_suffix(".prefab"))
+        for csd_file in prefab_graph.get_conversion_order()
+    ]
+
+    # Unchanged CSDs (same content, same dependencies, outputs still present) are not reconverted
+    reused_records = {}
+    for csd_file, output_file in conversion_tasks:
+        relative_key = csd_file.relative_to(input_path).as_posix()
+        record = build_manifest.get_reusable_csd_record(
+            relative_key, csd_file, shared_image_manager
+        )
+        if record is not None:
+            reused_records[relative_key] = record
+    # A parent is rebuilt whenever one of its nested prefabs is
+    changed_csd_files = [
+        csd_file
+        for csd_file, output_file in conversion_tasks
+        if csd_file.relative_to(input_path).as_posix() not in reused_records
+    ]
+    for dependent in prefab_graph.get_dependents(changed_csd_files):
+        reused_records.pop(dependent.relative_to(input_path).as_posix(), None)
+    pending_tasks = [
+        (csd_file, output_file)
+        for csd_file, output_file in conversion_tasks
+        if csd_file.relative_to(input_path).as_posix() not in reused_records
+    ]
+    if incremental:
+        print(
+            f"Processing {len(reused_records)} unchanged CSD files reused, {len(pending_tasks)} to convert"
+        )
+
+    worker_results = None
+    if jobs > 1 and len(pending_tasks) > 1:
+        print(f"Processing Converting {len(pending_tasks)} CSD files with {jobs} worker processes")
+        worker_results = convert_csd_files_in_pool(
+            pending_tasks,
+            csd_documents,
+            shared_image_manager,
+            shared_material_manager,
+            shared_prefab_uuid_mapping,
+            str(input_path),
+            jobs,
+            [prefab_graph.levels[csd_file] for csd_file, output_file in pending_tasks],
+        )
+
+    for i, (csd_file, output_file) in enumerate(conversion_tasks, 1):
         try:
             print(f"\n[EMOJI] Processing file {i}/{len(csd_files)}: {csd_file.name}")
             print("-" * 60)
 
             # Calculate relative path from input folder
             relative_path = csd_file.relative_to(input_path)
+            relative_key = relative_path.as_posix()
+            reused = relative_key in reused_records
+
+            if reused:
+                # Replay the recorded cache additions so the shared state matches a full run
+                record = reused_records[relative_key]
+                changes = dict(record["changes"])
+                for set_name in ImageResourceManager.TRACKED_SETS:
+                    changes[set_name] = set(changes[set_name])
+                prefab_uuid_items = record["prefab_uuid_mapping"]
+                shared_image_manager.apply_state_changes(changes)
+                for mapping_key, prefab_uuid in prefab_uuid_items:
+                    shared_prefab_uuid_mapping[mapping_key] = prefab_uuid
+                generator = CachedPrefabResult(record, output_file)
+            elif worker_results is not None:
+                # Merge worker output in input order so the shared state matches a serial run
+                result = next(worker_results)
+                try:
+                    generator = merge_worker_conversion_result(
+                        result,
+                        shared_image_manager,
+                        shared_prefab_uuid_mapping,
+                        shared_file_id_manager,
+                    )
+                finally:
+                    changes = result["changes"]
+                    prefab_uuid_items = result.get("prefab_uuid_mapping", [])
+            else:
+                # Reset fileId manager for new prefab
+                shared_file_id_manager.reset_for_new_prefab()
+                marker = shared_image_manager.get_state_marker()
+                mapping_marker = len(shared_prefab_uuid_mapping)
 
-            # Create corresponding output path in Common/Prefab directory
-            output_file = prefabs_dir / relative_path.with_suffix(".prefab")
-
-            # Reset fileId manager for new prefab
-            shared_file_id_manager.reset_for_new_prefab()
-
-            # Convert the CSD file with shared image manager, UUID mapping, and fileId manager
-            generator = parse_csd_to_prefab(
-                str(csd_file),
-                str(output_file),
-                shared_image_manager,
-                shared_prefab_uuid_mapping,
-                shared_file_id_manager,
-                shared_uuid_manager,
-                max_depth=4,
-                input_folder=str(input_path),
-            )
+                # Convert the CSD file with shared image manager, UUID mapping, and fileId manager
+                try:
+                    generator = parse_csd_to_prefab(
+                        str(csd_file),
+                        str(output_file),
+                        shared_image_manager,
+                        shared_prefab_uuid_mapping,
+                        shared_file_id_manager,
+                        shared_uuid_manager,
+                        max_depth=4,
+                        input_folder=str(input_path),
+                        shared_material_manager=shared_material_manager,
+                        csd_document=csd_documents.get_document(csd_file),
+                    )
+                finally:
+                    changes = shared_image_manager.collect_state_changes(marker)
+                prefab_uuid_items = list(
+                    itertools.islice(
+                        shared_prefab_uuid_mapping.items(), mapping_marker, None
+                    )
+                )
 
             # Check if file was skipped (returns None)
             if generator is None:
@@ -6754,6 +9555,21 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
                 )
                 print(f"SKIP  SKIPPED: {relative_path}")
             else:
+                # Outgoing references are all the later passes need from the prefab objects
+                prefab_references = ImageResourceManager.collect_uuid_references(
+                    generator.objects
+                )
+                sprite_frame_uuids = ImageResourceManager.collect_sprite_frame_uuids(
+                    prefab_references
+                )
+                uuid_references = set(prefab_references)
+                uuid_references.update(
+                    collect_animation_uuid_references(generator, output_path)
+                )
+                if STREAM_BATCH_OUTPUT and not reused:
+                    generator = stream_prefab_result(
+                        generator, output_file, output_path, build_manifest
+                    )
                 batch_stats["all_generators"].append(generator)
                 batch_stats["success_count"] += 1
                 batch_stats["processed_files"].append(
@@ -6761,12 +9577,23 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
                         "file": str(relative_path),
                         "status": "success",
                         "generator": generator,
+                        "csd_file": csd_file,
+                        "output_file": output_file,
+                        "changes": changes,
+                        "prefab_uuid_mapping": prefab_uuid_items,
+                        "sprite_frame_uuids": sprite_frame_uuids,
+                        "uuid_references": uuid_references,
                     }
                 )
-                print(f"Success SUCCESS: {relative_path}")
+                if reused:
+                    batch_stats["reused_count"] += 1
+                    print(f"Skip UNCHANGED, reused: {relative_path}")
+                else:
+                    print(f"Success SUCCESS: {relative_path}")
 
         except Exception as e:
             traceback.print_exc()
+            build_manifest.keep_previous_csd(csd_file.relative_to(input_path).as_posix())
             batch_stats["error_count"] += 1
             batch_stats["processed_files"].append(
                 {
@@ -6779,18 +9606,44 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
                 f"ERROR ERROR converting {csd_file.relative_to(input_path)}: {str(e)}"
             )
 
+        if STREAM_BATCH_OUTPUT and session is None:
+            # Nothing reads the parsed CSD after its conversion (--watch keeps it for the next batch)
+            csd_documents.release(csd_file)
+
     # Second pass: process fonts and particles FIRST to mark moved images
-    if OUTPUT_ANYWAY:
+    if reachable:
+        # Export only what the prefabs and animation clips reference, plus the keep-list
+        reachability = AssetReachability(shared_image_manager, input_path)
+        for processed_file in batch_stats["processed_files"]:
+            if processed_file["status"] == "success":
+                reachability.add_references(processed_file["uuid_references"])
+        export_plan = reachability.plan()
+        reachability.print_report(export_plan, output_path / "PrunedList.txt")
+        all_used_images = export_plan["images"][0] | export_plan["images"][1]
+        all_used_particles = export_plan["particles"][0] | export_plan["particles"][1]
+        all_used_fonts = export_plan["fonts"][0] | export_plan["fonts"][1]
+        all_used_atlases = export_plan["atlases"][0] | export_plan["atlases"][1]
+        batch_stats["total_resources_pruned"] = sum(
+            len(pruned) for reachable_files, kept, pruned in export_plan.values()
+        )
+    elif OUTPUT_ANYWAY:
         # When OUTPUT_ANYWAY is True, copy all available resources
         all_used_images = shared_image_manager.available_images
         all_used_particles = shared_image_manager.available_particles
         all_used_fonts = shared_image_manager.available_fonts
+        all_used_atlases = shared_image_manager.available_atlases
         print(f"Processing OUTPUT_ANYWAY enabled: copying ALL available resources")
     else:
         # When OUTPUT_ANYWAY is False, copy only used resources
         all_used_images = shared_image_manager.used_images
         all_used_particles = shared_image_manager.used_particles
         all_used_fonts = shared_image_manager.used_fonts
+        all_used_atlases = shared_image_manager.used_atlases
+
+    # Copies run on a thread pool; each step drains its queue before anything reads the copies
+    resource_copier = ResourceCopier(copy_strategy, COPY_JOBS)
+    # .meta contents (and their UUIDs) are built here in sorted order; only the writes are threaded
+    meta_writer = MetaWriter(COPY_JOBS)
 
     # STEP 1: Copy fonts to Common/Font directory and their referenced images
     if all_used_fonts:
@@ -6801,8 +9654,9 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
         print("=" * 80)
 
         font_texture_count = 0
+        reused_fonts = set()  # Destination paths kept from the last batch
 
-        for source_font in all_used_fonts:
+        for source_font in sorted(all_used_fonts):
             try:
                 source_path = Path(source_font)
 
@@ -6818,12 +9672,17 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
                     fonts_dir / relative_font_path.name
                 )  # Use just filename for fonts
 
-                # Copy font file
-                shutil.copy2(source_path, dest_path)
-                print(f"Success Copied: {relative_font_path.name}")
-                batch_stats[
-                    "total_images_copied"
-                ] += 1  # Count fonts as part of resources
+                # Copy font file (unless the last batch already produced it from the same content)
+                signature = build_manifest.get_dependency_signature(
+                    source_font, shared_image_manager
+                )
+                if build_manifest.is_resource_up_to_date(source_font, dest_path, signature):
+                    reused_fonts.add(str(dest_path))
+                    batch_stats["total_resources_reused"] += 1
+                    print(f"Skip Unchanged: {relative_font_path.name}")
+                else:
+                    resource_copier.submit(source_path, dest_path)
+                build_manifest.record_resource(source_font, dest_path, signature)
 
                 # Parse FNT file to find referenced texture files
                 texture_files = shared_image_manager.parse_fnt_texture_files(
@@ -6838,7 +9697,14 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
 
                         # Copy texture file to fonts directory
                         texture_dest = fonts_dir / texture_filename
-                        shutil.copy2(texture_file, texture_dest)
+                        texture_signature = build_manifest.get_dependency_signature(
+                            texture_file, shared_image_manager
+                        )
+                        texture_reused = build_manifest.is_resource_up_to_date(
+                            texture_file, texture_dest, texture_signature
+                        )
+                        if not texture_reused:
+                            resource_copier.submit(texture_file, texture_dest)
 
                         # Mark texture as used and copied
                         shared_image_manager.used_images.add(str(texture_file))
@@ -6852,22 +9718,33 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
                         print(f"MOVED: {texture_file.name} to Font directory")
                         print(f"DEBUG: Added to moved_images: {moved_path}")
 
-                        # Generate .meta file for the texture
-                        shared_image_manager.generate_image_meta_file(
-                            str(texture_file), texture_dest
+                        if texture_reused:
+                            # Keep the UUID cache identical to a full run
+                            shared_image_manager.get_sprite_frame_uuid(str(texture_file))
+                            batch_stats["total_resources_reused"] += 1
+                            print(f"  Skip Unchanged texture: {texture_file}")
+                        else:
+                            # Generate .meta file for the texture (only reads the source)
+                            shared_image_manager.generate_image_meta_file(
+                                str(texture_file), texture_dest, meta_writer
+                            )
+                            print(f"  Texture Queued texture: {texture_file}")
+                        build_manifest.record_resource(
+                            texture_file, texture_dest, texture_signature
                         )
 
                         font_texture_count += 1
-                        print(f"  Texture Copied texture: {texture_file}")
-                        batch_stats["total_images_copied"] += 1
 
                     except Exception as e:
+                        build_manifest.keep_previous_resource(fonts_dir / texture_filename)
                         print(f"  ERROR Error copying texture {texture_file}: {str(e)}")
 
             except Exception as e:
+                build_manifest.keep_previous_resource(fonts_dir / source_path.name)
                 batch_stats["total_image_errors"] += 1
                 print(f"ERROR Error copying {source_path.name}: {str(e)}")
 
+        drain_resource_copies(resource_copier, output_path, build_manifest, batch_stats)
         print(
             f"Texture Total font texture files copied to Common/Font: {font_texture_count}"
         )
@@ -6876,13 +9753,18 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
         print(f"\nFont Generating .meta files for {len(all_used_fonts)} fonts")
         print("=" * 80)
 
-        for source_font in all_used_fonts:
+        for source_font in sorted(all_used_fonts):
             try:
                 source_path = Path(source_font)
                 dest_path = fonts_dir / source_path.name
 
+                if str(dest_path) in reused_fonts:
+                    # Keep the UUID cache identical to a full run
+                    shared_image_manager.get_font_uuid(source_font)
+                    continue
+
                 # Generate meta file using shared image manager
-                shared_image_manager.generate_font_meta_file(source_font, dest_path)
+                shared_image_manager.generate_font_meta_file(source_font, dest_path, meta_writer)
                 print(f"Success Meta: {source_path.name}.meta")
 
             except Exception as e:
@@ -6898,7 +9780,9 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
         )
         print("=" * 80)
 
-        for source_particle in all_used_particles:
+        reused_particles = set()  # Destination paths kept from the last batch
+
+        for source_particle in sorted(all_used_particles):
             try:
                 source_path = Path(source_particle)
 
@@ -6914,29 +9798,43 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
                     particles_dir / relative_particle_path.name
                 )  # Use just filename for particles
 
-                # Copy particle file
-                shutil.copy2(source_path, dest_path)
-                print(f"Success Copied: {relative_particle_path.name}")
-                batch_stats[
-                    "total_images_copied"
-                ] += 1  # Count particles as part of resources
+                # Copy particle file (unless the last batch already produced it from the same content)
+                signature = build_manifest.get_dependency_signature(
+                    source_particle, shared_image_manager
+                )
+                if build_manifest.is_resource_up_to_date(source_particle, dest_path, signature):
+                    reused_particles.add(str(dest_path))
+                    batch_stats["total_resources_reused"] += 1
+                    print(f"Skip Unchanged: {relative_particle_path.name}")
+                else:
+                    # Always a real copy: post-processing rewrites the plist in place
+                    resource_copier.submit(source_path, dest_path, strategy="copy")
+                build_manifest.record_resource(source_particle, dest_path, signature)
 
             except Exception as e:
+                build_manifest.keep_previous_resource(particles_dir / Path(source_particle).name)
                 batch_stats["total_image_errors"] += 1
                 print(f"ERROR Error copying {source_path.name}: {str(e)}")
 
+        drain_resource_copies(resource_copier, output_path, build_manifest, batch_stats)
+
         # Generate .meta files for all copied particles using shared image manager
         print(f"\nFont Generating .meta files for {len(all_used_particles)} particles")
         print("=" * 80)
 
-        for source_particle in all_used_particles:
+        for source_particle in sorted(all_used_particles):
             try:
                 source_path = Path(source_particle)
                 dest_path = particles_dir / source_path.name
 
+                if str(dest_path) in reused_particles:
+                    # Keep the UUID cache identical to a full run
+                    shared_image_manager.get_particle_uuid(source_particle)
+                    continue
+
                 # Generate meta file using shared image manager
                 shared_image_manager.generate_particle_meta_file(
-                    source_particle, dest_path
+                    source_particle, dest_path, meta_writer
                 )
                 print(f"Success Meta: {source_path.name}.meta")
 
@@ -6952,17 +9850,35 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
 
         for plist_file in particles_dir.glob("*.plist"):
             try:
+                if str(plist_file) in reused_particles:
+                    # The plist was already post-processed by the last batch; reuse its texture
+                    previous_record = build_manifest.get_previous_resource(plist_file) or {}
+                    previous_texture = previous_record.get("texture")
+                    if previous_texture:
+                        texture_path = output_path / previous_texture
+                        particle_texture_count += 1
+                        processed_particles.append(
+                            (str(plist_file), str(texture_path), True)
+                        )
+                        build_manifest.update_resource_record(
+                            plist_file, texture=previous_texture
+                        )
+                    print(f"Skip Unchanged: {plist_file.name}")
+                    continue
+
                 print(f"DEBUG Processing: {plist_file.name}")
 
                 # First, try to extract embedded texture
-                texture_path, was_embedded = (
-                    shared_image_manager.extract_texture_from_plist(
-                        str(plist_file), particles_dir
-                    )
+                _, texture_path = shared_image_manager.extract_texture_from_plist(
+                    str(plist_file), particles_dir
                 )
-                if texture_path and was_embedded:
+                if texture_path:
+                    texture_path = Path(texture_path)
                     particle_texture_count += 1
-                    processed_particles.append((str(plist_file), str(texture_path)))
+                    processed_particles.append((str(plist_file), str(texture_path), False))
+                    build_manifest.update_resource_record(
+                        plist_file, texture=build_manifest.output_key(texture_path)
+                    )
                     print(f"  Texture Extracted embedded texture: {texture_path.name}")
                 else:
                     # No embedded texture, check for external texture reference
@@ -6973,12 +9889,16 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
                     )
                     if texture_path and was_copied:
                         particle_texture_count += 1
-                        processed_particles.append((str(plist_file), str(texture_path)))
-                        print(f"  Texture Copied external texture: {texture_path.name}")
+                        processed_particles.append((str(plist_file), str(texture_path), False))
+                        build_manifest.update_resource_record(
+                            plist_file, texture=build_manifest.output_key(texture_path)
+                        )
+                        print(f"  Texture Copied external texture: {Path(texture_path).name}")
 
             except Exception as e:
                 print(f"ERROR Error processing {plist_file.name}: {str(e)}")
 
+        shared_image_manager.plist_info.save()
         print(
             f"Texture Total particle texture files processed: {particle_texture_count}"
         )
@@ -6990,7 +9910,7 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
             )
             print("=" * 80)
 
-            for plist_path, texture_path in processed_particles:
+            for plist_path, texture_path, texture_reused in processed_particles:
                 try:
                     texture_path_obj = Path(texture_path)
                     # Mark this texture as moved to avoid duplicating in Img directory
@@ -6999,9 +9919,14 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
                         f"MOVED Marked {texture_path_obj.name} as moved to Particle directory"
                     )
 
+                    if texture_reused:
+                        # Keep the UUID cache identical to a full run
+                        shared_image_manager.get_sprite_frame_uuid(str(texture_path))
+                        continue
+
                     # Generate meta file for the texture
                     shared_image_manager.generate_image_meta_file(
-                        str(texture_path), texture_path_obj
+                        str(texture_path), texture_path_obj, meta_writer
                     )
                     print(f"Success Meta: {texture_path_obj.name}.meta")
 
@@ -7010,12 +9935,17 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
                         f"ERROR Error generating meta for texture {Path(texture_path).name}: {str(e)}"
                     )
 
+        # The plist .metas are read back below
+        drain_meta_writes(meta_writer)
+
         # Update plist .meta files with spriteFrameUuid
         if particle_texture_count > 0:
             print(f"\nProcessing Updating plist .meta files with spriteFrameUuid")
             print("=" * 80)
 
-            for plist_path, texture_path in processed_particles:
+            for plist_path, texture_path, texture_reused in processed_particles:
+                if texture_reused:
+                    continue  # The .meta from the last batch already has its spriteFrameUuid
                 try:
                     plist_path_obj = Path(plist_path)
 
@@ -7054,31 +9984,119 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
                         f"ERROR Error updating meta for {Path(plist_path).name}: {str(e)}"
                     )
 
+    # STEP 2b: Copy texture atlases (SpriteAtlas plists) to Common/Img next to their textures
+    if all_used_atlases:
+        print(f"\nTexture Copying {len(all_used_atlases)} texture atlases to Common/Img")
+        print("=" * 80)
+
+        atlas_textures = set()
+        for source_atlas in sorted(all_used_atlases):
+            try:
+                source_path = Path(source_atlas)
+
+                # Calculate relative path from input_path
+                if source_path.is_relative_to(input_path):
+                    relative_atlas_path = source_path.relative_to(input_path)
+                else:
+                    relative_atlas_path = Path(
+                        source_path.name
+                    )  # Fallback to filename if not relative
+
+                dest_path = images_dir / relative_atlas_path
+                dest_path.parent.mkdir(parents=True, exist_ok=True)
+
+                # STEP 3 exports the texture into the same folder, where the importer looks for it
+                texture_file = shared_image_manager.get_atlas_texture_file(source_atlas)
+                if texture_file and Path(texture_file).exists():
+                    atlas_textures.add(texture_file)
+
+                signature = build_manifest.get_atlas_signature(
+                    source_atlas, shared_image_manager
+                )
+                if build_manifest.is_resource_up_to_date(source_atlas, dest_path, signature):
+                    # Keep the UUID cache identical to a full run
+                    shared_image_manager.get_atlas_uuid(source_atlas)
+                    batch_stats["total_resources_reused"] += 1
+                    print(f"Skip Unchanged: {relative_atlas_path}")
+                else:
+                    resource_copier.submit(source_path, dest_path)
+                    shared_image_manager.generate_atlas_meta_file(
+                        source_atlas, dest_path, meta_writer
+                    )
+                    frame_count = len(shared_image_manager.get_plist_info(source_atlas)["frames"])
+                    print(f"Success Atlas: {relative_atlas_path}.meta ({frame_count} frames)")
+                build_manifest.record_resource(source_atlas, dest_path, signature)
+                batch_stats["total_atlases_exported"] += 1
+
+            except Exception as e:
+                if source_path.is_relative_to(input_path):
+                    build_manifest.keep_previous_resource(
+                        images_dir / source_path.relative_to(input_path)
+                    )
+                batch_stats["total_image_errors"] += 1
+                print(f"ERROR Error copying {source_path.name}: {str(e)}")
+
+        drain_resource_copies(resource_copier, output_path, build_manifest, batch_stats)
+        all_used_images = set(all_used_images) | atlas_textures
+
     # STEP 3: Now copy remaining images to Common/Img (excluding those moved to Font/Particle)
 
+    if duplicate_groups:
+        # A used duplicate is exported as its canonical image, which carries the shared UUID
+        canonical_images = {
+            shared_image_manager.get_canonical_image(source_image)
+            for source_image in all_used_images
+        }
+        canonical_images.discard(None)
+        all_used_images = set(all_used_images) | canonical_images
+
     if all_used_images:
         print(
             f"\nFolder Copying {len(all_used_images)} used images to Common/Img, preserving relative paths"
         )
         print("=" * 80)
 
-        for source_image in all_used_images:
+        reused_images = set()  # Destination paths kept from the last batch
+        # Font/Particle steps are done, so the moved set is final for both loops below
+        moved_resolved = {
+            shared_image_manager.get_resolved_path(p) for p in shared_image_manager.moved_images
+        }
+
+        png_optimizer = None
+        if optimize_png != "off":
+            # Optimize before copying: the copier exports the cached result instead of the source
+            png_optimizer = PngOptimizer(shared_image_manager.image_analysis, optimize_png)
+            optimized_count = png_optimizer.optimize_all(
+                [
+                    source_image
+                    for source_image in sorted(all_used_images)
+                    if shared_image_manager.get_resolved_path(source_image) not in moved_resolved
+                    and shared_image_manager.get_canonical_image(source_image) is None
+                ],
+                jobs,
+            )
+            png_optimizer.save()
+            if optimized_count:
+                print(f"Processing Optimized {optimized_count} PNGs ({png_optimizer.settings})")
+
+        for source_image in sorted(all_used_images):
             try:
                 source_path = Path(source_image)
 
                 # Skip images that have been moved to font/particle directories
-                # Use Path.resolve() to normalize paths for comparison
-                source_resolved = str(source_path.resolve())
-                moved_resolved = {
-                    str(Path(p).resolve()) for p in shared_image_manager.moved_images
-                }
-
-                if source_resolved in moved_resolved:
+                # Resolved paths are compared so different spellings of a file still match
+                if shared_image_manager.get_resolved_path(source_path) in moved_resolved:
                     print(
                         f"SKIP: {source_path.name} (already moved to Font/Particle directory)"
                     )
                     continue
 
+                canonical_image = shared_image_manager.get_canonical_image(source_image)
+                if canonical_image is not None:
+                    batch_stats["total_images_deduplicated"] += 1
+                    print(f"SKIP: {source_path.name} (duplicate of {canonical_image})")
+                    continue
+
                 # Calculate relative path from input_path
                 if source_path.is_relative_to(input_path):
                     relative_image_path = source_path.relative_to(input_path)
@@ -7090,12 +10108,27 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
                 dest_path = images_dir / relative_image_path
                 dest_path.parent.mkdir(parents=True, exist_ok=True)
 
-                # Copy image file
-                shutil.copy2(source_path, dest_path)
-                print(f"Success Copied: {relative_image_path}")
-                batch_stats["total_images_copied"] += 1
+                # Copy image file (unless the last batch already produced it from the same content)
+                signature = build_manifest.get_dependency_signature(
+                    source_image, shared_image_manager
+                )
+                export_path = source_path
+                if png_optimizer is not None and png_optimizer.is_candidate(source_image):
+                    export_path, _ = png_optimizer.get_export_source(source_image)
+                    signature = f"{signature}#png-{png_optimizer.settings}"
+                if build_manifest.is_resource_up_to_date(source_image, dest_path, signature):
+                    reused_images.add(str(dest_path))
+                    batch_stats["total_resources_reused"] += 1
+                    print(f"Skip Unchanged: {relative_image_path}")
+                else:
+                    resource_copier.submit(export_path, dest_path)
+                build_manifest.record_resource(source_image, dest_path, signature)
 
             except Exception as e:
+                if source_path.is_relative_to(input_path):
+                    build_manifest.keep_previous_resource(
+                        images_dir / source_path.relative_to(input_path)
+                    )
                 batch_stats["total_image_errors"] += 1
                 print(f"ERROR Error copying {source_path.name}: {str(e)}")
 
@@ -7103,23 +10136,23 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
         print(f"\nFont Generating .meta files for {len(all_used_images)} images")
         print("=" * 80)
 
-        for source_image in all_used_images:
+        meta_images = []  # (source_image, relative_image_path, dest_path) in sorted order
+        exported_images = []  # (source_image, dest_path) of every image left in Common/Img
+        for source_image in sorted(all_used_images):
             try:
                 source_path = Path(source_image)
 
                 # Skip images that have been moved to font/particle directories
-                # Use Path.resolve() to normalize paths for comparison
-                source_resolved = str(source_path.resolve())
-                moved_resolved = {
-                    str(Path(p).resolve()) for p in shared_image_manager.moved_images
-                }
-
-                if source_resolved in moved_resolved:
+                # Resolved paths are compared so different spellings of a file still match
+                if shared_image_manager.get_resolved_path(source_path) in moved_resolved:
                     print(
                         f"SKIP  Skipping meta for {source_path.name} (already moved to Font/Particle directory)"
                     )
                     continue
 
+                if shared_image_manager.get_canonical_image(source_image) is not None:
+                    continue  # Shares the canonical image's .meta
+
                 # Calculate same relative path
                 if source_path.is_relative_to(input_path):
                     relative_image_path = source_path.relative_to(input_path)
@@ -7127,13 +10160,65 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
                     relative_image_path = source_path.name
 
                 dest_path = images_dir / relative_image_path
+                exported_images.append((source_image, dest_path))
+
+                if str(dest_path) in reused_images:
+                    # Keep the UUID cache identical to a full run
+                    shared_image_manager.get_sprite_frame_uuid(source_image)
+                    continue
+
+                meta_images.append((source_image, relative_image_path, dest_path))
+
+            except Exception as e:
+                print(f"ERROR Error generating meta for {source_path.name}: {str(e)}")
 
+        # Decode the images without a cached analysis on the batch's worker processes
+        analyzed_count = shared_image_manager.precompute_image_analysis(
+            [source_image for source_image, _, _ in meta_images], jobs
+        )
+        if analyzed_count:
+            print(f"Processing Analyzed {analyzed_count} images with {jobs} processes")
+
+        for source_image, relative_image_path, dest_path in meta_images:
+            try:
                 # Generate meta file using shared image manager
-                shared_image_manager.generate_image_meta_file(source_image, dest_path)
+                shared_image_manager.generate_image_meta_file(
+                    source_image, dest_path, meta_writer
+                )
                 print(f"Success Meta: {relative_image_path}.meta")
 
             except Exception as e:
-                print(f"ERROR Error generating meta for {source_path.name}: {str(e)}")
+                print(f"ERROR Error generating meta for {Path(source_image).name}: {str(e)}")
+
+        # The metas only read the sources, so the copies ran alongside them
+        drain_resource_copies(resource_copier, output_path, build_manifest, batch_stats)
+
+        if png_optimizer is not None:
+            batch_stats["total_png_bytes_saved"] = png_optimizer.print_report(
+                exported_images, images_dir, output_path / "ImageBudgetReport.txt"
+            )
+
+        if auto_atlas:
+            # Group the exported sprites into folder atlases by what each prefab draws
+            atlas_planner = AutoAtlasPlanner(shared_image_manager, images_dir)
+            for source_image, dest_path in exported_images:
+                atlas_planner.add_sprite(source_image, dest_path)
+            for processed_file in batch_stats["processed_files"]:
+                if processed_file["status"] == "success":
+                    atlas_planner.add_prefab(
+                        processed_file["file"], processed_file["sprite_frame_uuids"]
+                    )
+            atlas_plan = atlas_planner.plan()
+            written_count, reused_count = atlas_planner.write_atlases(
+                atlas_plan, build_manifest, meta_writer
+            )
+            batch_stats["total_auto_atlases"] = len(atlas_plan)
+            batch_stats["total_resources_reused"] += reused_count
+            atlas_planner.print_report(atlas_plan, output_path / "AutoAtlasReport.txt")
+
+    drain_meta_writes(meta_writer)
+    meta_writer.shutdown()
+    resource_copier.shutdown()
 
     # Third pass: export all animation clips from all generators
     print(f"\n[EMOJI] Exporting animation clips from all prefabs")
@@ -7176,21 +10261,10 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
                 anim_name = anim_info["name"]
                 anim_data = anim_info["data"]
                 anim_uuid = anim_info["uuid"]
-                source_path = anim_info.get("source_path")
 
                 # Determine the output directory based on source path
-                if source_path:
-                    # Convert source path from .csd to animation directory structure
-                    # e.g., "Lua/BattlePassRCResource/Csd/GuideRCBP/GuideRCBP_Role.csd"
-                    # becomes "Common/Animation/Lua/BattlePassRCResource/Csd/GuideRCBP/"
-                    source_path_obj = Path(source_path)
-                    # Get directory without the filename
-                    relative_dir = source_path_obj.parent
-                    anim_dir = output_path / "Common" / "Animation" / relative_dir
-                else:
-                    # Fallback to original behavior if source_path is missing
-                    anim_dir = output_path / "Common" / "Animation"
-                
+                anim_dir = get_animation_output_dir(output_path, anim_info.get("source_path"))
+
                 # Create directory if it doesn't exist
                 anim_dir.mkdir(parents=True, exist_ok=True)
 
@@ -7201,26 +10275,25 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
                 else:
                     final_filename = anim_name
 
-                # Export .anim file
                 anim_file = anim_dir / f"{final_filename}.anim"
-                with open(anim_file, "w", encoding="utf-8") as f:
-                    json.dump(anim_data, f, indent=2, ensure_ascii=False)
+                meta_file = anim_dir / f"{final_filename}.anim.meta"
 
-                # Generate .meta file for animation
-                meta_data = {
-                    "ver": "2.0.3",
-                    "importer": "animation-clip",
-                    "imported": True,
-                    "uuid": anim_uuid,
-                    "files": [".cconb"],
-                    "subMetas": {},
-                    "userData": {"name": anim_name},
-                }
+                if anim_data is None:
+                    # Streamed or reused prefab: keep the .anim already on disk, renaming it
+                    # if the duplicate-name suffix does not apply
+                    previous_file = output_path / anim_info["file"]
+                    if previous_file != anim_file:
+                        os.replace(previous_file, anim_file)
+                        os.replace(f"{previous_file}.meta", meta_file)
+                        print(f"MOVED {anim_info['file']} -> {anim_file.relative_to(output_path)}")
+                    anim_info["file"] = build_manifest.output_key(anim_file)
+                    anim_exported_count += 1
+                    continue
 
-                meta_file = anim_dir / f"{final_filename}.anim.meta"
-                with open(meta_file, "w", encoding="utf-8") as f:
-                    json.dump(meta_data, f, indent=2, ensure_ascii=False)
+                # Export .anim file and its .meta
+                write_animation_clip(anim_file, anim_name, anim_uuid, anim_data)
 
+                anim_info["file"] = build_manifest.output_key(anim_file)
                 anim_exported_count += 1
                 
                 # Show relative path for better clarity
@@ -7242,16 +10315,15 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
     print(f"\nDEBUG Validating image references across all prefabs")
     print("=" * 80)
 
-    # Create a combined list of all prefab objects for validation
-    all_prefab_objects = []
+    # Combine the SpriteFrame references collected from each prefab as it was converted
+    all_sprite_frame_uuids = []
     for processed_file in batch_stats["processed_files"]:
         if processed_file["status"] == "success":
-            generator = processed_file["generator"]
-            all_prefab_objects.extend(generator.objects)
+            all_sprite_frame_uuids.extend(processed_file["sprite_frame_uuids"])
 
     # Validate all references using shared image manager
     validation_results = shared_image_manager.validate_image_references(
-        all_prefab_objects
+        sprite_frame_uuids=all_sprite_frame_uuids
     )
 
     batch_stats["total_valid_references"] = validation_results.get(
@@ -7272,8 +10344,20 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
     print(f"  Folder Total files processed: {batch_stats['total_files']}")
     print(f"  Success Successfully converted: {batch_stats['success_count']}")
     print(f"  SKIP  Skipped files (Scene3D): {batch_stats['skipped_count']}")
+    print(f"  Skip Unchanged prefabs reused: {batch_stats['reused_count']}")
     print(f"  ERROR Conversion errors: {batch_stats['error_count']}")
     print(f"  Image Total images copied: {batch_stats['total_images_copied']}")
+    print(f"  Skip Unchanged resources reused: {batch_stats['total_resources_reused']}")
+    if reachable:
+        print(f"  Skip Unreferenced resources pruned: {batch_stats['total_resources_pruned']}")
+    if dedup_images:
+        print(f"  Skip Duplicate images not exported: {batch_stats['total_images_deduplicated']}")
+    if auto_atlas:
+        print(f"  Image Auto atlases (.pac) planned: {batch_stats['total_auto_atlases']}")
+    if optimize_png != "off":
+        print(f"  Image PNG bytes saved by --optimize-png: {batch_stats['total_png_bytes_saved']:,}")
+    if batch_stats["total_atlases_exported"]:
+        print(f"  Texture Texture atlases exported: {batch_stats['total_atlases_exported']}")
     print(f"  WARNING Image copy errors: {batch_stats['total_image_errors']}")
     print(
         f"  [EMOJI] Total animations exported: {batch_stats['total_animations_exported']}"
@@ -7294,6 +10378,15 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
     print(f"\nFolder Unified directory structure:")
     print(f"  {output_folder}/")
     print(f"  ├── NotFoundList.txt   # List of missing resource files")
+    if reachable:
+        print("  ├── PrunedList.txt     # Resources left out by --reachable")
+    if dedup_images:
+        print("  ├── DuplicateList.txt  # Images merged by --dedup-images")
+    if auto_atlas:
+        print("  ├── AutoAtlasReport.txt # Atlases and batches saved by --auto-atlas")
+    if optimize_png != "off":
+        print("  ├── ImageBudgetReport.txt # Per-folder PNG bytes before/after --optimize-png")
+    print(f"  ├── {BUILD_MANIFEST_JSON}  # Incremental build record (--incremental)")
     print(f"  └── Common/")
     print(f"      ├── Prefab/        # All prefab files (.prefab + .meta)")
     print(f"      ├── Img/           # All image resources (.png + .meta)")
@@ -7315,6 +10408,9 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
         ) * 100
         print(f"  [EMOJI] Usage rate: {usage_percentage:.1f}%")
 
+    # 圖片分析結果留給下次建置使用
+    shared_image_manager.image_analysis.save()
+
     # Save UUID cache after all processing is complete
     print(f"\nSave Saving UUID cache...")
     shared_image_manager.save_uuid_cache_to_json()
@@ -7324,20 +10420,200 @@ def batch_convert_csd_to_prefab(input_folder=INPUT_FOLDER, output_folder=OUTPUT_
     output_not_found_path = Path(output_folder) / "NotFoundList.txt"
     shared_image_manager.save_not_found_list(output_not_found_path)
 
-    # Cleanup: Remove temporary enhanced CSD directory if it was created
-    temp_enhanced_dir = Path(input_folder).parent / "temp_enhanced_csd"
-    if temp_enhanced_dir.exists():
-        try:
-            # shutil.rmtree(temp_enhanced_dir)
-            print(f"[EMOJI] Cleaned up temporary enhanced CSD directory")
-        except Exception as e:
-            print(
-                f"WARNING  Warning: Could not clean up temporary directory {temp_enhanced_dir}: {str(e)}"
+    # Record this batch for the next incremental run and drop outputs nobody produces anymore
+    print("\nSave Updating build manifest...")
+    for processed_file in batch_stats["processed_files"]:
+        if processed_file["status"] == "success":
+            build_manifest.record_csd(
+                processed_file["csd_file"].relative_to(input_path).as_posix(),
+                processed_file["csd_file"],
+                processed_file["output_file"],
+                processed_file["generator"],
+                processed_file["changes"],
+                processed_file["prefab_uuid_mapping"],
+                shared_image_manager,
             )
+    removed_count = build_manifest.remove_stale_outputs()
+    if removed_count:
+        print(f"Skip Removed {removed_count} stale output files")
+    build_manifest.save()
 
     return batch_stats
 
 
+class WatchSession:
+    """
+    State a --watch daemon keeps in memory between batches.
+
+    Parsed CSDs are reused until their file changes. The scanned resource index (with
+    the loaded UUID caches) is reused as long as no input file was added or removed
+    and no .plist changed; plist contents decide particle vs. texture atlas.
+    """
+
+    def __init__(self):
+        self.csd_documents = CSDDocumentCache(enhanced_mode=True)
+        # (scanned ImageResourceManager, its snapshot_state(), UUID cache fingerprint)
+        self.resource_index = None
+
+    def get_resource_index(self, input_path):
+        """Return the scanned resource index reset to its post-scan state, scanning on first use."""
+        if self.resource_index is None:
+            image_manager, uuid_cache_fingerprint = load_resource_index(input_path)
+            self.resource_index = (
+                image_manager,
+                image_manager.snapshot_state(),
+                uuid_cache_fingerprint,
+            )
+        else:
+            print("Loaded Reusing in-memory resource index")
+            image_manager, snapshot, uuid_cache_fingerprint = self.resource_index
+            image_manager.restore_state(snapshot)
+        return image_manager, uuid_cache_fingerprint
+
+    def apply_changes(self, changed_files, added_files, removed_files):
+        """Drop the cached state that the given input changes invalidate."""
+        for file_path in changed_files | added_files | removed_files:
+            if file_path.lower().endswith(".csd"):
+                self.csd_documents.release(file_path)
+
+        if added_files or removed_files or any(
+            file_path.lower().endswith(".plist") for file_path in changed_files
+        ):
+            self.resource_index = None
+
+
+class InputWatcher:
+    """Polls a folder for changes using (size, mtime) stat signatures."""
+
+    def __init__(self, input_folder):
+        self.input_folder = str(input_folder)
+        self.signatures = self.scan()
+
+    def scan(self):
+        signatures = {}
+        for dir_path, dir_names, file_names in os.walk(self.input_folder):
+            for file_name in file_names:
+                file_path = os.path.join(dir_path, file_name)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue  # Removed while scanning
+                signatures[str(Path(file_path))] = (stat.st_size, stat.st_mtime_ns)
+        return signatures
+
+    def poll(self):
+        """Return (changed, added, removed) file sets since the last poll."""
+        previous = self.signatures
+        self.signatures = self.scan()
+        return self.diff(previous, self.signatures)
+
+    @staticmethod
+    def diff(previous, signatures):
+        """Compare two scan() results."""
+        added_files = signatures.keys() - previous.keys()
+        removed_files = previous.keys() - signatures.keys()
+        changed_files = {
+            file_path
+            for file_path in signatures.keys() & previous.keys()
+            if signatures[file_path] != previous[file_path]
+        }
+        return changed_files, added_files, removed_files
+
+
+def watch_csd_to_prefab(
+    input_folder=INPUT_FOLDER,
+    output_folder=OUTPUT_FOLDER,
+    jobs=BATCH_JOBS,
+    interval=WATCH_INTERVAL,
+    copy_strategy=COPY_STRATEGY,
+    reachable=EXPORT_REACHABLE,
+    dedup_images=DEDUP_IMAGES,
+    auto_atlas=AUTO_ATLAS,
+    optimize_png=OPTIMIZE_PNG,
+):
+    """
+    Keep converting: run an incremental batch, then re-run it whenever input changes.
+
+    Parsed CSDs and the resource index stay in memory (WatchSession); each batch only
+    rebuilds the CSDs, nested-prefab parents and resources the build manifest marks as changed.
+
+    Args:
+        input_folder (str): Path to the input folder to watch.
+        output_folder (str): Path to the output folder.
+        jobs (int): Number of worker processes for CSD conversion (1 = serial).
+        interval (float): Seconds between polls.
+        copy_strategy (str): How resources reach the output: "copy", "hardlink" or "reflink".
+        reachable (bool): Export only referenced resources (plus EXPORT_KEEP_LIST) instead of OUTPUT_ANYWAY.
+        dedup_images (bool): Export one canonical copy of identical images and point every reference at it.
+        auto_atlas (bool): Place auto-atlas (.pac) assets in Common/Img from per-prefab sprite usage.
+        optimize_png (str): PNG optimization for Common/Img: "off", "lossless" or "quantize".
+    """
+    session = WatchSession()
+    watcher = InputWatcher(input_folder)
+
+    print(f"[EMOJI] Watching '{input_folder}' for changes (Ctrl+C to stop)")
+    batch_convert_csd_to_prefab(
+        input_folder,
+        output_folder,
+        jobs,
+        True,
+        session,
+        copy_strategy,
+        reachable,
+        dedup_images,
+        auto_atlas,
+        optimize_png,
+    )
+
+    try:
+        while True:
+            time.sleep(interval)
+            last_signatures = watcher.signatures
+            if not any(watcher.poll()):
+                continue
+
+            # Wait until editors/exporters finish writing before converting
+            while True:
+                time.sleep(interval)
+                if not any(watcher.poll()):
+                    break
+            changed_files, added_files, removed_files = InputWatcher.diff(
+                last_signatures, watcher.signatures
+            )
+            if not (changed_files or added_files or removed_files):
+                continue  # Changed and reverted while waiting
+
+            print("\n" + "=" * 80)
+            print(
+                f"Processing Input changed: {len(changed_files)} modified, {len(added_files)} added, {len(removed_files)} removed"
+            )
+            for file_path in sorted(changed_files | added_files | removed_files)[:20]:
+                print(f"  - {file_path}")
+            print("=" * 80)
+
+            session.apply_changes(changed_files, added_files, removed_files)
+            try:
+                batch_convert_csd_to_prefab(
+                    input_folder,
+                    output_folder,
+                    jobs,
+                    True,
+                    session,
+                    copy_strategy,
+                    reachable,
+                    dedup_images,
+                    auto_atlas,
+                    optimize_png,
+                )
+            except Exception as e:
+                traceback.print_exc()
+                print(f"ERROR Batch failed, waiting for the next change: {str(e)}")
+
+            print(f"\n[EMOJI] Watching '{input_folder}' for changes (Ctrl+C to stop)")
+    except KeyboardInterrupt:
+        print("\nWatch stopped")
+
+
 class MaterialManager:
     """
     Manages material resources for BlendFunc support.
@@ -7407,11 +10683,14 @@ class MaterialManager:
         return {"__uuid__": material_uuid, "__expectedType__": "cc.Material"}
 
 
-def scan_scale9_info_from_csd_files(csd_files, shared_image_manager):
+def scan_scale9_info_from_csd_files(csd_files, shared_image_manager, csd_documents=None):
     """
     Pre-scan all CSD files to collect Scale9 information and apply it to images.
     This must be done before conversion to ensure proper meta file generation.
+    Pass the batch's CSDDocumentCache so the files are not parsed again.
     """
+    if csd_documents is None:
+        csd_documents = CSDDocumentCache()
 
     def scan_node_for_scale9(node_dict, image_manager):
         """Recursively scan a node for Scale9 settings."""
@@ -7428,19 +10707,17 @@ def scan_scale9_info_from_csd_files(csd_files, shared_image_manager):
                 "BottomEage": node_dict.get("@BottomEage", "0"),
             }
 
-            # Collect all image paths from this node
+            # Collect all image paths (and atlas plists) from this node
             images_to_process = []
-            if "NormalFileData" in node_dict:
-                images_to_process.append(node_dict["NormalFileData"].get("@Path", ""))
-            if "PressedFileData" in node_dict:
-                images_to_process.append(node_dict["PressedFileData"].get("@Path", ""))
-            if "DisabledFileData" in node_dict:
-                images_to_process.append(node_dict["DisabledFileData"].get("@Path", ""))
-            if "FileData" in node_dict:
-                images_to_process.append(node_dict["FileData"].get("@Path", ""))
+            for file_data_key in ("NormalFileData", "PressedFileData", "DisabledFileData", "FileData"):
+                if file_data_key in node_dict:
+                    file_data = node_dict[file_data_key]
+                    images_to_process.append(
+                        (file_data.get("@Path", ""), file_data.get("@Plist", ""))
+                    )
 
             # Apply scale9 info to all found images
-            for img_path in images_to_process:
+            for img_path, plist_path in images_to_process:
                 if img_path:
                     # Check if path starts with "Default/" - these represent non-existent resources
                     if img_path.startswith("Default/"):
@@ -7449,9 +10726,8 @@ def scan_scale9_info_from_csd_files(csd_files, shared_image_manager):
                         )
                         continue
 
-                    actual_image = image_manager.find_image_file(img_path)
-                    if actual_image:
-                        image_manager.add_scale9_info(actual_image, scale9_data)
+                    for scale9_key in image_manager.get_scale9_keys(img_path, plist_path):
+                        image_manager.add_scale9_info(scale9_key, scale9_data)
 
         # Recursively process children
         if "Children" in node_dict and node_dict["Children"]:
@@ -7465,10 +10741,8 @@ def scan_scale9_info_from_csd_files(csd_files, shared_image_manager):
     # Scan each CSD file
     for csd_file in csd_files:
         try:
-            # Parse CSD file
-            with open(csd_file, "r", encoding="utf-8") as f:
-                xml_content = f.read()
-            csd_dict = xmltodict.parse(xml_content)
+            # Get the parsed CSD document
+            csd_dict = csd_documents.get_document(csd_file)
 
             # Check if this is a Scene3D file that should be skipped
             try:
@@ -7516,12 +10790,28 @@ def print_help():
     print("  --help, -h     Show this help message")
     print("  --version, -v  Show version information")
     print("  --batch        Batch convert mode")
+    print("  --jobs N, -j N Convert CSD files with N worker processes (0 = all CPU cores)")
+    print("  --incremental  Keep output/ and only rebuild what changed since the last batch")
+    print("  --watch        Stay running and reconvert whenever input/ changes")
+    print("  --copy-strategy copy|hardlink|reflink  How images/fonts/particles reach output/")
+    print(f"  --reachable    Export only resources the prefabs reference (plus {EXPORT_KEEP_LIST})")
+    print("  --dedup-images Export identical images once and reference the canonical copy")
+    print("  --auto-atlas   Add auto-atlas (.pac) assets to Common/Img folders whose sprites prefabs share")
+    print("  --optimize-png lossless|quantize  Recompress Common/Img PNGs (quantize: palette for images without smooth alpha)")
     print("")
     print("Examples:")
     print("  doit.exe                                      # Convert all CSD files in input/ to output/")
     print("  doit.exe MainScene.csd                        # Convert MainScene.csd to MainScene.prefab")
     print("  doit.exe UI/Dialog.csd output/Dialog.prefab   # Convert with custom output path")
     print("  doit.exe --batch ./input ./output             # Convert custom directories")
+    print("  doit.exe --jobs 8                             # Batch convert with 8 processes")
+    print("  doit.exe --incremental                        # Reuse unchanged outputs in output/")
+    print("  doit.exe --watch                              # Reconvert changes as they are saved")
+    print("  doit.exe --copy-strategy hardlink             # Link resources instead of copying")
+    print("  doit.exe --reachable                          # Skip unreferenced resources")
+    print("  doit.exe --dedup-images                       # Merge images with identical content")
+    print("  doit.exe --auto-atlas                         # Batch co-used sprites into atlases")
+    print("  doit.exe --optimize-png lossless              # Shrink exported PNGs, see ImageBudgetReport.txt")
 
 
 def print_version():
@@ -7545,19 +10835,187 @@ def print_help():
     print("  --help, -h     Show this help message")
     print("  --version, -v  Show version information")
     print("  --batch        Batch convert mode")
+    print("  --jobs N, -j N Convert CSD files with N worker processes (0 = all CPU cores)")
+    print("  --incremental  Keep output/ and only rebuild what changed since the last batch")
+    print("  --watch        Stay running and reconvert whenever input/ changes")
+    print("  --copy-strategy copy|hardlink|reflink  How images/fonts/particles reach output/")
+    print(f"  --reachable    Export only resources the prefabs reference (plus {EXPORT_KEEP_LIST})")
+    print("  --dedup-images Export identical images once and reference the canonical copy")
+    print("  --auto-atlas   Add auto-atlas (.pac) assets to Common/Img folders whose sprites prefabs share")
+    print("  --optimize-png lossless|quantize  Recompress Common/Img PNGs (quantize: palette for images without smooth alpha)")
     print("")
     print("Examples:")
     print("  doit.exe                                      # Convert all CSD files in input/ to output/")
     print("  doit.exe MainScene.csd                        # Convert MainScene.csd to MainScene.prefab")
     print("  doit.exe UI/Dialog.csd output/Dialog.prefab   # Convert with custom output path")
     print("  doit.exe --batch ./input ./output             # Convert custom directories")
+    print("  doit.exe --jobs 8                             # Batch convert with 8 processes")
+    print("  doit.exe --incremental                        # Reuse unchanged outputs in output/")
+    print("  doit.exe --watch                              # Reconvert changes as they are saved")
+    print("  doit.exe --copy-strategy hardlink             # Link resources instead of copying")
+    print("  doit.exe --reachable                          # Skip unreferenced resources")
+    print("  doit.exe --dedup-images                       # Merge images with identical content")
+    print("  doit.exe --auto-atlas                         # Batch co-used sprites into atlases")
+    print("  doit.exe --optimize-png lossless              # Shrink exported PNGs, see ImageBudgetReport.txt")
+
+def parse_jobs_option(argv):
+    """Remove --jobs/-j N from argv and return (remaining_argv, jobs)."""
+    remaining = []
+    jobs = BATCH_JOBS
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ["--jobs", "-j"] or arg.startswith("--jobs="):
+            if "=" in arg:
+                value = arg.split("=", 1)[1]
+            elif i + 1 < len(argv):
+                i += 1
+                value = argv[i]
+            else:
+                raise ValueError(f"{arg} requires a number")
+            jobs = int(value)
+            if jobs <= 0:
+                jobs = os.cpu_count() or 1
+        else:
+            remaining.append(arg)
+        i += 1
+    return remaining, jobs
+
+
+def parse_incremental_option(argv):
+    """Remove --incremental from argv and return (remaining_argv, incremental)."""
+    remaining = [arg for arg in argv if arg != "--incremental"]
+    return remaining, BUILD_INCREMENTAL or len(remaining) != len(argv)
+
+
+def parse_watch_option(argv):
+    """Remove --watch from argv and return (remaining_argv, watch)."""
+    remaining = [arg for arg in argv if arg != "--watch"]
+    return remaining, len(remaining) != len(argv)
+
+
+def parse_copy_strategy_option(argv):
+    """Remove --copy-strategy NAME from argv and return (remaining_argv, copy_strategy)."""
+    remaining = []
+    copy_strategy = COPY_STRATEGY
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "--copy-strategy" or arg.startswith("--copy-strategy="):
+            if "=" in arg:
+                copy_strategy = arg.split("=", 1)[1]
+            elif i + 1 < len(argv):
+                i += 1
+                copy_strategy = argv[i]
+            else:
+                raise ValueError(f"{arg} requires one of {', '.join(ResourceCopier.STRATEGIES)}")
+            if copy_strategy not in ResourceCopier.STRATEGIES:
+                raise ValueError(
+                    f"Unknown copy strategy '{copy_strategy}' (expected one of {', '.join(ResourceCopier.STRATEGIES)})"
+                )
+        else:
+            remaining.append(arg)
+        i += 1
+    return remaining, copy_strategy
+
+
+def parse_reachable_option(argv):
+    """Remove --reachable from argv and return (remaining_argv, reachable)."""
+    remaining = [arg for arg in argv if arg != "--reachable"]
+    return remaining, EXPORT_REACHABLE or len(remaining) != len(argv)
+
+
+def parse_dedup_images_option(argv):
+    """Remove --dedup-images from argv and return (remaining_argv, dedup_images)."""
+    remaining = [arg for arg in argv if arg != "--dedup-images"]
+    return remaining, DEDUP_IMAGES or len(remaining) != len(argv)
+
+
+def parse_auto_atlas_option(argv):
+    """Remove --auto-atlas from argv and return (remaining_argv, auto_atlas)."""
+    remaining = [arg for arg in argv if arg != "--auto-atlas"]
+    return remaining, AUTO_ATLAS or len(remaining) != len(argv)
+
+
+def parse_optimize_png_option(argv):
+    """Remove --optimize-png MODE from argv and return (remaining_argv, optimize_png)."""
+    remaining = []
+    optimize_png = OPTIMIZE_PNG
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "--optimize-png" or arg.startswith("--optimize-png="):
+            if "=" in arg:
+                optimize_png = arg.split("=", 1)[1]
+            elif i + 1 < len(argv):
+                i += 1
+                optimize_png = argv[i]
+            else:
+                raise ValueError(f"{arg} requires one of {', '.join(PngOptimizer.MODES)}")
+            if optimize_png not in PngOptimizer.MODES:
+                raise ValueError(
+                    f"Unknown PNG optimization '{optimize_png}' (expected one of {', '.join(PngOptimizer.MODES)})"
+                )
+        else:
+            remaining.append(arg)
+        i += 1
+    return remaining, optimize_png
+
+
+def run_batch_command(
+    input_folder,
+    output_folder,
+    jobs,
+    incremental,
+    watch,
+    copy_strategy,
+    reachable,
+    dedup_images,
+    auto_atlas,
+    optimize_png,
+):
+    """Run one batch conversion, or keep converting changes with --watch."""
+    if watch:
+        watch_csd_to_prefab(
+            input_folder,
+            output_folder,
+            jobs,
+            copy_strategy=copy_strategy,
+            reachable=reachable,
+            dedup_images=dedup_images,
+            auto_atlas=auto_atlas,
+            optimize_png=optimize_png,
+        )
+    else:
+        batch_convert_csd_to_prefab(
+            input_folder,
+            output_folder,
+            jobs,
+            incremental,
+            copy_strategy=copy_strategy,
+            reachable=reachable,
+            dedup_images=dedup_images,
+            auto_atlas=auto_atlas,
+            optimize_png=optimize_png,
+        )
+
 
 if __name__ == "__main__":
+    # Required for process pool workers in the PyInstaller executable
+    multiprocessing.freeze_support()
     try:
+        sys.argv, jobs = parse_jobs_option(sys.argv)
+        sys.argv, incremental = parse_incremental_option(sys.argv)
+        sys.argv, watch = parse_watch_option(sys.argv)
+        sys.argv, copy_strategy = parse_copy_strategy_option(sys.argv)
+        sys.argv, reachable = parse_reachable_option(sys.argv)
+        sys.argv, dedup_images = parse_dedup_images_option(sys.argv)
+        sys.argv, auto_atlas = parse_auto_atlas_option(sys.argv)
+        sys.argv, optimize_png = parse_optimize_png_option(sys.argv)
         if len(sys.argv) == 1:
             # No arguments - batch convert from input to output folder
             print("Starting batch conversion (input/ -> output/)")
-            batch_convert_csd_to_prefab()
+            run_batch_command(INPUT_FOLDER, OUTPUT_FOLDER, jobs, incremental, watch, copy_strategy, reachable, dedup_images, auto_atlas, optimize_png)
         elif len(sys.argv) == 2:
             arg = sys.argv[1]
             if arg in ["--help", "-h"]:
@@ -7567,7 +11025,7 @@ if __name__ == "__main__":
             elif arg == "--batch":
                 # Batch convert with explicit --batch flag
                 print("Starting batch conversion (input/ -> output/)")
-                batch_convert_csd_to_prefab()
+                run_batch_command(INPUT_FOLDER, OUTPUT_FOLDER, jobs, incremental, watch, copy_strategy, reachable, dedup_images, auto_atlas, optimize_png)
             else:
                 # Single file conversion with auto-generated output name
                 csd_path = sys.argv[1]
@@ -7641,7 +11099,7 @@ if __name__ == "__main__":
                 print(f"ERROR: Input directory '{input_dir}' not found")
                 sys.exit(1)
             print(f"Starting batch conversion: {input_dir} -> {output_dir}")
-            batch_convert_csd_to_prefab(input_dir, output_dir)
+            run_batch_command(input_dir, output_dir, jobs, incremental, watch, copy_strategy, reachable, dedup_images, auto_atlas, optimize_png)
         else:
             print("ERROR: Invalid arguments")
             print("")
@@ -2,12 +2,15 @@
 # -*- coding: utf-8 -*-
 """
 資源合併工具 - 將 output_resources.json 與 input_resources.json 合併成新的 input_resources.json
+
+任一路徑可以是 SQLite 資源快取（.db），依副檔名讀寫（見 resource_store.py）
 """
 
-import json
 import time
 from pathlib import Path
 
+from resource_store import load_resource_data, save_resource_data
+
 
 def merge_resources(output_resources_path="output_resources.json", input_resources_path="input_resources_backup.json", merged_output_path="input_merged.json"):
     """
@@ -28,8 +31,7 @@ def merge_resources(output_resources_path="output_resources.json", input_resourc
     output_data = {}
     if Path(output_resources_path).exists():
         print(f"✅ 載入新資源文件: {output_resources_path}")
-        with open(output_resources_path, "r", encoding="utf-8") as f:
-            output_data = json.load(f)
+        output_data = load_resource_data(output_resources_path)
     else:
         print(f"⚠️  新資源文件不存在: {output_resources_path}")
     
@@ -37,8 +39,7 @@ def merge_resources(output_resources_path="output_resources.json", input_resourc
     input_data = {}
     if Path(input_resources_path).exists():
         print(f"✅ 載入舊資源文件: {input_resources_path}")
-        with open(input_resources_path, "r", encoding="utf-8") as f:
-            input_data = json.load(f)
+        input_data = load_resource_data(input_resources_path)
     else:
         print(f"⚠️  舊資源文件不存在: {input_resources_path}")
     
@@ -50,11 +51,12 @@ def merge_resources(output_resources_path="output_resources.json", input_resourc
         "particle_cache": {},
         "font_cache": {},
         "csd_cache": {},
+        "atlas_cache": {},
         "path_mapping": {}
     }
     
     # 合併各種緩存 - 新資源優先
-    cache_types = ["image_cache", "particle_cache", "font_cache", "csd_cache", "path_mapping"]
+    cache_types = ["image_cache", "particle_cache", "font_cache", "csd_cache", "atlas_cache", "path_mapping"]
     
     for cache_type in cache_types:
         print(f"📝 合併 {cache_type}...")
@@ -78,8 +80,7 @@ def merge_resources(output_resources_path="output_resources.json", input_resourc
     
     # 保存合併結果
     print(f"💾 保存合併結果到: {merged_output_path}")
-    with open(merged_output_path, "w", encoding="utf-8") as f:
-        json.dump(merged_data, f, indent=2, ensure_ascii=False)
+    save_resource_data(merged_output_path, merged_data)
     
     # 統計報告
     total_old = sum(len(input_data.get(cache_type, {})) for cache_type in cache_types)
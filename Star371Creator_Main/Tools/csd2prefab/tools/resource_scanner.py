@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+資源掃描 - 單次走訪 input 資料夾，依副檔名分類所有檔案
+
+scan_files() replaces one Path.rglob() pass per extension with a single os.scandir()
+walk. Given a DirectoryScanCache it reuses the file list of every directory whose
+mtime has not changed since the previous scan, so only changed directories are listed
+again (subdirectories are still visited, since a deeper change does not touch the
+parent's mtime).
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+# 目錄 mtime 與掃描開始時間太接近時不沿用（檔案系統 mtime 精度可能只有 2 秒）
+MTIME_GRANULARITY_NS = 2_000_000_000
+
+
+def get_extension(file_name):
+    """Extension as Path.rglob("*.ext") would match it (case-insensitive only on Windows)."""
+    dot = file_name.rfind(".")
+    if dot < 0:
+        return ""
+    return os.path.normcase(file_name[dot:])
+
+
+class DirectoryScanCache:
+    """
+    Per-directory listings from the previous scan, stored as JSON.
+
+    Args:
+        cache_path (str): JSON file; missing or unreadable files start an empty cache.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_path):
+        self.cache_path = Path(cache_path)
+        self.previous = {}  # (root, extensions) -> {"started": ns, "dirs": {...}}
+        self.current = {}
+        self.reused_count = 0
+        self.listed_count = 0
+        self.load()
+
+    @staticmethod
+    def make_key(root, extensions):
+        return f"{os.path.abspath(root)}|{','.join(sorted(extensions))}"
+
+    def load(self):
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.previous = data.get("scans", {})
+        except Exception as e:
+            print(f"WARNING Failed to load scan cache {self.cache_path}: {str(e)}")
+
+    def save(self):
+        try:
+            with open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "scans": self.current}, f)
+        except Exception as e:
+            print(f"WARNING Failed to save scan cache {self.cache_path}: {str(e)}")
+
+    def begin(self, root, extensions):
+        """Return (previous directory listings, trusted-before ns) and start recording a scan."""
+        key = self.make_key(root, extensions)
+        previous = self.previous.get(key, {})
+        scan = {"started": time.time_ns(), "dirs": {}}
+        self.current[key] = scan
+        trusted_before = previous.get("started", 0) - MTIME_GRANULARITY_NS
+        return previous.get("dirs", {}), trusted_before, scan["dirs"]
+
+
+def scan_files(root, extensions, cache=None):
+    """
+    Walk root once and collect the files whose extension is in extensions.
+
+    Symlinked directories are not followed, like Path.rglob().
+
+    Args:
+        root (str): Folder to walk; returned paths start with it (os.path.join style).
+        extensions (iterable): Extensions including the dot, e.g. {".png", ".csd"}.
+        cache (DirectoryScanCache): Optional listings from the previous scan.
+
+    Returns:
+        dict: extension -> list of file paths
+    """
+    extensions = {os.path.normcase(ext) for ext in extensions}
+    found = {ext: [] for ext in extensions}
+    if cache is not None:
+        previous_dirs, trusted_before, current_dirs = cache.begin(root, extensions)
+    else:
+        previous_dirs, trusted_before, current_dirs = {}, 0, None
+
+    pending = [str(root)]
+    while pending:
+        dir_path = pending.pop()
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            continue  # Removed while scanning
+
+        cached = previous_dirs.get(dir_path)
+        if cached is not None and cached[0] == mtime_ns and mtime_ns < trusted_before:
+            sub_dirs, file_names = cached[1], cached[2]
+            if cache is not None:
+                cache.reused_count += 1
+        else:
+            sub_dirs = []
+            file_names = []
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            sub_dirs.append(entry.name)
+                        elif get_extension(entry.name) in extensions and entry.is_file():
+                            file_names.append(entry.name)
+            except OSError:
+                continue
+            if cache is not None:
+                cache.listed_count += 1
+
+        if current_dirs is not None:
+            current_dirs[dir_path] = [mtime_ns, sub_dirs, file_names]
+        for file_name in file_names:
+            found[get_extension(file_name)].append(os.path.join(dir_path, file_name))
+        pending.extend(os.path.join(dir_path, name) for name in reversed(sub_dirs))
+
+    return found
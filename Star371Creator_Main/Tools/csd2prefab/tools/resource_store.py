@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+資源快取 SQLite 儲存 - input_resources.json / output_resources.json 的索引化版本
+
+The store keeps the same sections as the JSON file (image_cache, particle_cache,
+font_cache, csd_cache, atlas_cache and path_mapping) in one table keyed by section and key, so
+a save only writes the entries that changed.
+Entry order is kept, so a JSON -> store -> JSON round trip is lossless.
+
+load_resource_data() / save_resource_data() pick JSON or SQLite by file extension;
+the helper scripts use them to work on either format.
+
+Usage:
+    python resource_store.py <source> <destination>   # Convert between .json and .db
+
+Example:
+    python resource_store.py input_resources.json input_resources.db
+    python resource_store.py output_resources.db output_resources.json
+"""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+CACHE_SECTIONS = ["image_cache", "particle_cache", "font_cache", "csd_cache", "atlas_cache"]
+SECTIONS = CACHE_SECTIONS + ["path_mapping"]
+STORE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+
+
+def is_resource_store(path):
+    """True if path names a SQLite resource store rather than a JSON file."""
+    return Path(path).suffix.lower() in STORE_SUFFIXES
+
+
+class ResourceStore:
+    """
+    SQLite table of (section, key) -> value with the original entry order.
+
+    Args:
+        path (str): Database file; created on first use.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                section TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                PRIMARY KEY (section, key)
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def get_meta(self, key, default=None):
+        row = self.connection.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else default
+
+    def load_section(self, section):
+        """Return a whole section as a dict in entry order."""
+        rows = self.connection.execute(
+            "SELECT key, value FROM entries WHERE section = ? ORDER BY seq", (section,)
+        )
+        return dict(rows)
+
+    def load(self):
+        """Return everything in the same shape as the JSON file."""
+        data = {
+            "version": self.get_meta("version", "1.0"),
+            "timestamp": self.get_meta("timestamp", ""),
+        }
+        for section in SECTIONS:
+            data[section] = self.load_section(section)
+        return data
+
+    def save_section(self, section, entries):
+        """
+        Make a section equal to entries (a dict, in the order to keep).
+
+        Only new or changed entries are written and only vanished keys are deleted.
+
+        Returns:
+            tuple: (written_count, deleted_count)
+        """
+        stored = {
+            key: (value, seq)
+            for key, value, seq in self.connection.execute(
+                "SELECT key, value, seq FROM entries WHERE section = ?", (section,)
+            )
+        }
+        upserts = []
+        for seq, (key, value) in enumerate(entries.items()):
+            if stored.pop(key, None) != (value, seq):
+                upserts.append((section, key, value, seq))
+        self.connection.executemany(
+            "INSERT INTO entries (section, key, value, seq) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (section, key) DO UPDATE SET value = excluded.value, seq = excluded.seq",
+            upserts,
+        )
+        self.connection.executemany(
+            "DELETE FROM entries WHERE section = ? AND key = ?",
+            [(section, key) for key in stored],
+        )
+        return len(upserts), len(stored)
+
+    def save(self, data, **meta):
+        """
+        Store the sections of data (same shape as the JSON file) in one transaction.
+
+        Extra keyword arguments are written to the meta table. "prepared" (the entries
+        are already filtered and normalized for doit.py) is reset to "0" unless passed,
+        so raw data saved over a prepared store is not trusted as prepared.
+
+        Returns:
+            tuple: (written_count, deleted_count) over all sections
+        """
+        written_count = 0
+        deleted_count = 0
+        with self.connection:
+            meta_values = {
+                "schema": str(self.SCHEMA_VERSION),
+                "version": str(data.get("version", "1.0")),
+                "timestamp": str(data.get("timestamp", "")),
+                "prepared": "0",
+            }
+            meta_values.update({key: str(value) for key, value in meta.items()})
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                meta_values.items(),
+            )
+            for section in SECTIONS:
+                written, deleted = self.save_section(section, data.get(section, {}))
+                written_count += written
+                deleted_count += deleted
+        return written_count, deleted_count
+
+
+def load_resource_data(path):
+    """Read a resource cache (.json or SQLite store) into the JSON dict shape."""
+    if is_resource_store(path):
+        if not Path(path).exists():
+            raise FileNotFoundError(path)
+        with ResourceStore(path) as store:
+            return store.load()
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_resource_data(path, data):
+    """Write a resource cache; a SQLite store only receives the entries that changed."""
+    if is_resource_store(path):
+        with ResourceStore(path) as store:
+            store.save(data)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python resource_store.py <source> <destination>")
+        print("\nExample:")
+        print("    python resource_store.py input_resources.json input_resources.db")
+        print("    python resource_store.py output_resources.db output_resources.json")
+        sys.exit(1)
+
+    source, destination = sys.argv[1], sys.argv[2]
+    if not Path(source).exists():
+        print(f"Error: Source file '{source}' does not exist!")
+        sys.exit(1)
+
+    data = load_resource_data(source)
+    save_resource_data(destination, data)
+    print(f"Converted {source} -> {destination}")
+    for section in SECTIONS:
+        print(f"  - {section}: {len(data.get(section, {}))} items")
+
+
+if __name__ == "__main__":
+    main()
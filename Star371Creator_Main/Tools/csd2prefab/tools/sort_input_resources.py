@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 """
-Sort input_resources.json cache sections (image_cache, font_cache, particle_cache, csd_cache).
+Sort input_resources.json cache sections (image_cache, font_cache, particle_cache, csd_cache, atlas_cache).
 
 This script reads an input_resources.json file and sorts all cache sections alphabetically
 while preserving other sections like version, timestamp, and path mappings.
+Either file can be a SQLite resource store (.db, see resource_store.py); sorting a
+store rewrites its entry order.
 
 Usage:
     python sort_input_resources.py <input_file> [output_file]
@@ -11,6 +13,7 @@ Usage:
 Example:
     python sort_input_resources.py input_resources.json sorted_input_resources.json
     python sort_input_resources.py generated_input_resources.json
+    python sort_input_resources.py input_resources.db input_resources.db
 """
 
 import os
@@ -18,6 +21,8 @@ import json
 import sys
 from collections import OrderedDict
 
+from resource_store import load_resource_data, save_resource_data
+
 
 def sort_cache_sections(data):
     """
@@ -30,7 +35,7 @@ def sort_cache_sections(data):
         dict: Data with sorted cache sections
     """
     # Cache section names that should be sorted
-    cache_sections = ['image_cache', 'font_cache', 'particle_cache', 'csd_cache']
+    cache_sections = ['image_cache', 'font_cache', 'particle_cache', 'csd_cache', 'atlas_cache']
     
     # Create a new ordered dictionary to maintain structure
     sorted_data = OrderedDict()
@@ -80,8 +85,7 @@ def sort_input_resources_file(input_file, output_file=None):
     # Read the input file
     print(f"Reading: {input_file}")
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_resource_data(input_file)
     except FileNotFoundError:
         print(f"Error: File '{input_file}' not found!")
         return False
@@ -95,13 +99,12 @@ def sort_input_resources_file(input_file, output_file=None):
     
     # Write the sorted data
     print(f"Writing: {output_file}")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(sorted_data, f, ensure_ascii=False, indent=2)
+    save_resource_data(output_file, sorted_data)
     
     print(f"Successfully sorted {input_file} → {output_file}")
     
     # Show statistics
-    cache_sections = ['image_cache', 'font_cache', 'particle_cache', 'csd_cache']
+    cache_sections = ['image_cache', 'font_cache', 'particle_cache', 'csd_cache', 'atlas_cache']
     for section in cache_sections:
         if section in sorted_data:
             print(f"  - {section}: {len(sorted_data[section])} items")
@@ -116,7 +119,7 @@ def main():
         print("\nExample:")
         print("    python sort_input_resources.py input_resources.json sorted_input_resources.json")
         print("    python sort_input_resources.py generated_input_resources.json")
-        print("\nThis will sort image_cache, font_cache, particle_cache, and csd_cache sections alphabetically.")
+        print("\nThis will sort image_cache, font_cache, particle_cache, csd_cache and atlas_cache sections alphabetically.")
         sys.exit(1)
     
     input_file = sys.argv[1]
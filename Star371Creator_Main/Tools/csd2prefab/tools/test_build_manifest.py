@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Build manifest 一致性測試 - 同一份 input 用 --jobs 1 與 --jobs N 轉換，manifest 必須相同
+
+Each CSD record stores the cache entries (UUIDs, derived UUIDs, prefab mappings) its
+conversion added; an incremental batch replays them. If a parallel run attributed them
+to other CSDs than a serial run, switching job counts would reuse the wrong units.
+
+Usage:
+    python -m pytest test_build_manifest.py
+    python test_build_manifest.py
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent
+INPUT_DIR = TOOLS_DIR.parent / "input"
+TOOL_FILES = ["*.py", "material_config.json", "file_id_pool.json", "input_resources.json"]
+
+
+def run_batch(work_dir, *args):
+    """Convert input/ in a private copy of the tools and return the build manifest."""
+    tools_dir = work_dir / "tools"
+    tools_dir.mkdir(parents=True)
+    for pattern in TOOL_FILES:
+        for tool_file in TOOLS_DIR.glob(pattern):
+            shutil.copy2(tool_file, tools_dir / tool_file.name)
+    shutil.copytree(INPUT_DIR, work_dir / "input")
+
+    subprocess.run(
+        [sys.executable, "doit.py", *args],
+        cwd=tools_dir,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    with open(work_dir / "output" / "build_manifest.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@unittest.skipUnless(INPUT_DIR.is_dir(), "input/ folder not found")
+class ParallelManifestTest(unittest.TestCase):
+    def test_parallel_manifest_matches_serial(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            serial = run_batch(Path(temp_dir) / "serial", "--jobs", "1")
+            parallel = run_batch(Path(temp_dir) / "parallel", "--jobs", "4")
+
+        # file_hashes holds mtimes of the copied files, which differ between the two copies
+        for section in ["state", "csd", "resources"]:
+            self.assertEqual(serial[section], parallel[section], section)
+        # Input keys are relative to the input folder, so the copies share them
+        self.assertEqual(
+            sorted(key for key in serial["file_hashes"] if not Path(key).is_absolute()),
+            sorted(key for key in parallel["file_hashes"] if not Path(key).is_absolute()),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
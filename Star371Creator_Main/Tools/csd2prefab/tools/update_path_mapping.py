@@ -2,12 +2,16 @@
 # -*- coding: utf-8 -*-
 """
 路徑映射更新工具 - 更新 input_resources.json 中的路徑映射，使其適配當前的文件結構
+
+資源文件可以是 SQLite 資源快取（.db），依副檔名讀寫（見 resource_store.py）
 """
 
-import json
 import time
 from pathlib import Path
 
+from resource_scanner import scan_files
+from resource_store import load_resource_data, save_resource_data
+
 
 def normalize_path_for_uuid_key(file_path):
     """
@@ -89,23 +93,22 @@ def scan_for_available_files(input_folder="../input"):
     
     print(f"🔍 掃描文件夾: {input_folder}")
     
-    # 找所有圖像文件
+    # 單次走訪，依副檔名分類
     image_extensions = {".png", ".jpg", ".jpeg", ".bmp", ".tga"}
+    found_files = scan_files(str(input_path), image_extensions | {".plist", ".fnt", ".csd"})
+    
+    # 找所有圖像文件
     for ext in image_extensions:
-        for img_file in input_path.rglob(f"*{ext}"):
-            available_images.add(str(img_file))
+        available_images.update(found_files[ext])
     
     # 找所有粒子文件
-    for plist_file in input_path.rglob("*.plist"):
-        available_particles.add(str(plist_file))
+    available_particles.update(found_files[".plist"])
     
     # 找所有字體文件  
-    for fnt_file in input_path.rglob("*.fnt"):
-        available_fonts.add(str(fnt_file))
+    available_fonts.update(found_files[".fnt"])
     
     # 找所有 CSD 文件
-    for csd_file in input_path.rglob("*.csd"):
-        available_csds.add(str(csd_file))
+    available_csds.update(found_files[".csd"])
     
     print(f"  📷 圖像: {len(available_images)}")
     print(f"  ✨ 粒子: {len(available_particles)}")  
@@ -136,8 +139,7 @@ def update_path_mapping(resources_path="input_resources.json", input_folder="../
         return
     
     print(f"✅ 載入資源文件: {resources_path}")
-    with open(resources_path, "r", encoding="utf-8") as f:
-        resources_data = json.load(f)
+    resources_data = load_resource_data(resources_path)
     
     # 掃描當前可用文件
     available_images, available_particles, available_fonts, available_csds = scan_for_available_files(input_folder)
@@ -208,8 +210,7 @@ def update_path_mapping(resources_path="input_resources.json", input_folder="../
     
     # 保存更新後的文件
     print(f"💾 保存更新後的資源文件: {updated_path}")
-    with open(updated_path, "w", encoding="utf-8") as f:
-        json.dump(resources_data, f, indent=2, ensure_ascii=False)
+    save_resource_data(updated_path, resources_data)
     
     # 統計報告
     print(f"")